@@ -0,0 +1,85 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures the cost of attaching a buffer to a store as the number of live
+attachments grows. Every attachment is checked against the live ones for
+aliasing, so this cost should stay flat rather than grow with the number
+of attachments. Run with ``legate benchmarks/attachments.py``.
+"""
+
+import argparse
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from legate.core import Store, get_legate_runtime, types as ty
+
+
+def attach(size: int, count: int) -> tuple[float, list[Any]]:
+    runtime = get_legate_runtime()
+    arrays = [np.zeros(size, dtype=np.int64) for _ in range(count)]
+    stores: list[Store] = []
+    start = perf_counter()
+    for array in arrays:
+        store = runtime.create_store(ty.int64, shape=(size,))
+        store.attach_external_allocation(array.data, share=False)
+        stores.append(store)
+    elapsed = perf_counter() - start
+    # Keep the buffers alive as long as the stores
+    return elapsed, [arrays, stores]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--max-attachments",
+        type=int,
+        default=4096,
+        dest="max_attachments",
+        help="Largest number of live attachments",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        type=int,
+        default=64,
+        dest="batch",
+        help="Number of attachments timed at each step",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        default=16,
+        dest="size",
+        help="Number of elements in each buffer",
+    )
+    args, _ = parser.parse_known_args()
+
+    live: list[Any] = []
+    num_live = 0
+    print(f"{'live':>8} {'per attach (us)':>16}")
+    while num_live < args.max_attachments:
+        # Grow the number of live attachments geometrically, then time a
+        # fixed-size batch on top of them
+        live.append(attach(args.size, max(num_live, args.batch))[1])
+        num_live += max(num_live, args.batch)
+        elapsed, alive = attach(args.size, args.batch)
+        live.append(alive)
+        num_live += args.batch
+        print(f"{num_live:>8} {elapsed / args.batch * 1e6:>16.2f}")
@@ -0,0 +1,141 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compares partitioning the operations of a scheduling window one by one
+against partitioning them jointly. Each iteration issues a chain of copies,
+each consuming the store the previous one produced, where every other
+store is a slice of a larger store. The benchmark reports the time spent
+in the solver and the bytes of stores that a copy reads with a different
+partition than the one they were written with, which Legion has to move
+between the two copies. Run with ``legate benchmarks/batch_partitioning.py``.
+"""
+
+import argparse
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from legate.core import Store, get_legate_runtime, types as ty
+from legate.core.runtime import SchedulingWindow
+from legate.core.solver import Partitioner, Strategy
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.solver_time = 0.0
+        self.repartitioned_bytes = 0
+        self._writers: dict[int, Any] = {}
+        self._partition_batch = Partitioner.partition_batch
+
+    def __call__(self, partitioner: Partitioner) -> list[Strategy]:
+        start = perf_counter()
+        strategies = self._partition_batch(partitioner)
+        self.solver_time += perf_counter() - start
+        for op, strategy in zip(partitioner._ops, strategies):
+            for sym in op.all_unknowns:
+                store = sym.store
+                partition = strategy.get_partition(sym)
+                if any(store is input for input in op.inputs):
+                    written = self._writers.get(id(store))
+                    if written is not None and written != partition:
+                        self.repartitioned_bytes += (
+                            store.shape.volume() * store.type.size
+                        )
+                if any(store is output for output in op.outputs):
+                    self._writers[id(store)] = partition
+        return strategies
+
+
+def run(batch: bool, length: int, size: int, iterations: int) -> Recorder:
+    runtime = get_legate_runtime()
+    recorder = Recorder()
+
+    def partition_batch(partitioner: Partitioner) -> list[Strategy]:
+        return recorder(partitioner)
+
+    Partitioner.partition_batch = partition_batch  # type: ignore
+    # Keep a whole chain in the scheduling window
+    runtime._batch_partitioning = batch
+    runtime._window = SchedulingWindow(length, length, False)
+
+    big = runtime.create_store(ty.float64, shape=(2 * size,))
+    view = big.slice(0, slice(size // 2, size // 2 + size))
+    stores: list[Store] = [
+        runtime.create_store(ty.float64, shape=(size,))
+        for _ in range(length // 2 + 1)
+    ]
+    data = np.zeros(1, dtype=np.float64).tobytes()
+    value = runtime.create_store(
+        ty.float64, shape=(1,), data=runtime.create_future(data, len(data))
+    )
+    runtime.issue_fill(stores[0], value)
+    runtime.issue_execution_fence(block=True)
+
+    start = perf_counter()
+    for _ in range(iterations):
+        src = stores[0]
+        for idx in range(length):
+            dst = view if idx % 2 == 0 else stores[idx // 2 + 1]
+            copy = runtime.create_copy()
+            copy.add_input(src)
+            copy.add_output(dst)
+            copy.execute()
+            src = dst
+        runtime.flush_scheduling_window()
+    runtime.issue_execution_fence(block=True)
+    elapsed = perf_counter() - start
+
+    Partitioner.partition_batch = recorder._partition_batch  # type: ignore
+    print(
+        f"{'batched' if batch else 'per-op':>8}: "
+        f"solver {recorder.solver_time * 1e3:.1f} ms, "
+        f"repartitioned {recorder.repartitioned_bytes} bytes, "
+        f"total {elapsed * 1e3:.1f} ms"
+    )
+    return recorder
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-l",
+        "--length",
+        type=int,
+        default=8,
+        dest="length",
+        help="Number of copies in each chain",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        default=1 << 20,
+        dest="size",
+        help="Number of elements of each store",
+    )
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=100,
+        dest="iterations",
+        help="Number of chains to issue",
+    )
+    args, _ = parser.parse_known_args()
+
+    for batch in (False, True):
+        run(batch, args.length, args.size, args.iterations)
@@ -0,0 +1,84 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures how fast BufferBuilder serializes the arguments of a task launch,
+and how many fills per second the runtime launches, which includes the
+serialization. Run with ``legate benchmarks/buffer_builder.py``.
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+import legate.core as lg
+from legate.core import BufferBuilder, Point, types as ty
+
+
+def pack_launch(buf: BufferBuilder, shape: Point) -> None:
+    # Roughly the arguments of a task with three two-dimensional stores
+    buf.pack_string("benchmark")
+    for field_id in range(3):
+        buf.pack_32bit_int(2)
+        buf.pack_point(shape)
+        buf.pack_ndarray(np.eye(2, dtype=np.int64))
+        buf.pack_ndarray(np.zeros(2, dtype=np.int64))
+        buf.pack_32bit_uint(field_id)
+        buf.pack_bool(True)
+    buf.pack_64bit_float(1.5)
+
+
+def bench_packing(iterations: int) -> float:
+    pool = lg.BufferBuilderPool()
+    shape = Point((1024, 1024))
+    start = perf_counter()
+    for _ in range(iterations):
+        buf = pool.acquire()
+        pack_launch(buf, shape)
+        buf.get_string()
+        pool.release(buf)
+    return iterations / (perf_counter() - start)
+
+
+def bench_launches(iterations: int) -> float:
+    runtime = lg.get_legate_runtime()
+    store = runtime.create_store(ty.int64, shape=(1024,))
+    data = np.array([1], dtype=np.int64).tobytes()
+    value = runtime.create_store(
+        ty.int64, shape=(1,), data=runtime.create_future(data, len(data))
+    )
+    runtime.issue_execution_fence(block=True)
+    start = perf_counter()
+    for _ in range(iterations):
+        runtime.issue_fill(store, value)
+    runtime.issue_execution_fence(block=True)
+    return iterations / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=10000,
+        dest="iterations",
+        help="Number of launches to serialize or issue",
+    )
+    args, _ = parser.parse_known_args()
+
+    print(f"Serialized launches/s: {bench_packing(args.iterations):.0f}")
+    print(f"Fills/s: {bench_launches(args.iterations):.0f}")
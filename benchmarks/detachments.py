@@ -0,0 +1,92 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures the cost of issuing operations while many detachments are
+pending. The runtime checks pending detachments on every dispatch, so this
+cost should not grow with their number. How many detachments are still in
+flight at each step depends on the machine, so it is reported along with
+the timing. Run with ``legate benchmarks/detachments.py``.
+"""
+
+import argparse
+import gc
+from time import perf_counter
+
+import numpy as np
+
+from legate.core import get_legate_runtime, types as ty
+
+
+def detach(count: int, size: int) -> None:
+    runtime = get_legate_runtime()
+    arrays = [np.zeros(size, dtype=np.int64) for _ in range(count)]
+    stores = [
+        runtime.create_store(ty.int64, shape=(size,)) for _ in range(count)
+    ]
+    for store, array in zip(stores, arrays):
+        store.attach_external_allocation(array.data, share=False)
+    # Collecting the stores issues their detachments
+    del stores
+    gc.collect()
+
+
+def issue_fills(count: int) -> float:
+    runtime = get_legate_runtime()
+    store = runtime.create_store(ty.int64, shape=(16,))
+    data = np.array([0], dtype=np.int64).tobytes()
+    value = runtime.create_store(
+        ty.int64,
+        shape=(1,),
+        data=runtime.create_future(data, len(data)),
+    )
+    start = perf_counter()
+    for _ in range(count):
+        runtime.issue_fill(store, value)
+    runtime.flush_scheduling_window()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--max-detachments",
+        type=int,
+        default=4096,
+        dest="max_detachments",
+        help="Largest number of detachments issued at once",
+    )
+    parser.add_argument(
+        "-f",
+        "--fills",
+        type=int,
+        default=256,
+        dest="fills",
+        help="Number of operations timed at each step",
+    )
+    args, _ = parser.parse_known_args()
+
+    runtime = get_legate_runtime()
+    print(f"{'detached':>8} {'pending':>8} {'per dispatch (us)':>18}")
+    count = 16
+    while count <= args.max_detachments:
+        detach(count, 1024)
+        pending = runtime.num_pending_detachments
+        elapsed = issue_fills(args.fills)
+        print(
+            f"{count:>8} {pending:>8} " f"{elapsed / args.fills * 1e6:>18.2f}"
+        )
+        count *= 2
@@ -0,0 +1,107 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Reports how often stores of slowly varying shapes reuse fields of larger
+regions, how many regions get created, and how many bytes of the borrowed
+fields go unused. Compare runs with different values of
+``LEGATE_FIELD_POOL_SLACK``, where 0 disables the pool. Run with
+``legate benchmarks/field_pool.py``.
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+import numpy as np
+
+from legate.core import Store, get_legate_runtime, types as ty
+
+
+def run(steps: int, size: int, jitter: int, live: int, seed: int) -> float:
+    runtime = get_legate_runtime()
+    rng = random.Random(seed)
+    data = np.array([0], dtype=np.float64).tobytes()
+    value = runtime.create_store(
+        ty.float64,
+        shape=(1,),
+        data=runtime.create_future(data, len(data)),
+    )
+    stores: list[Store] = []
+    start = perf_counter()
+    for _ in range(steps):
+        # The size drifts around its mean, as in adaptive algorithms
+        size = max(size + rng.randint(-jitter, jitter), 1)
+        store = runtime.create_store(ty.float64, shape=(size,))
+        runtime.issue_fill(store, value)
+        stores.append(store)
+        if len(stores) > live:
+            stores.pop(0)
+    runtime.flush_scheduling_window()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--steps",
+        type=int,
+        default=1000,
+        dest="steps",
+        help="Number of stores to create",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        default=1 << 16,
+        dest="size",
+        help="Initial number of elements of each store",
+    )
+    parser.add_argument(
+        "-j",
+        "--jitter",
+        type=int,
+        default=256,
+        dest="jitter",
+        help="Largest change of the size from one store to the next",
+    )
+    parser.add_argument(
+        "-l",
+        "--live",
+        type=int,
+        default=4,
+        dest="live",
+        help="Number of stores kept alive at a time",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        dest="seed",
+        help="Seed of the random size changes",
+    )
+    args, _ = parser.parse_known_args()
+
+    runtime = get_legate_runtime()
+    elapsed = run(args.steps, args.size, args.jitter, args.live, args.seed)
+    stats = runtime.get_field_pool_stats()
+    print(f"time:          {elapsed * 1e3:.2f} ms")
+    print(f"live regions:  {len(runtime.region_managers_by_region)}")
+    print(f"hits:          {stats.hits}")
+    print(f"misses:        {stats.misses}")
+    print(f"borrowed:      {stats.borrowed_fields}")
+    print(f"fragmentation: {stats.fragmentation:.2%}")
@@ -0,0 +1,131 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures the time to coalesce the region requirements of a task that reads
+several regions through many partitions each, as stencil tasks do. The
+coalescing outcome of each pattern of accesses to a field is cached, so
+the benchmark reports the time with the cache in use and with the cache
+cleared before every analysis. Run with
+``legate benchmarks/requirement_analysis.py``.
+"""
+
+import argparse
+from time import perf_counter
+from typing import Any
+
+from legate.core import get_legate_runtime, launcher, types as ty
+from legate.core.launcher import (
+    Partition,
+    Permission,
+    RegionReq,
+    RequirementAnalyzer,
+)
+from legate.core.partition import Tiling
+from legate.core.shape import Shape
+from legate.core.store import RegionField
+
+
+def make_inserts(
+    num_regions: int, num_partitions: int, size: int
+) -> list[tuple[RegionReq, int]]:
+    runtime = get_legate_runtime()
+    inserts: list[tuple[RegionReq, int]] = []
+    for idx in range(num_regions):
+        store = runtime.create_store(ty.float64, shape=(size,))
+        storage = store.storage
+        assert isinstance(storage, RegionField)
+        region = storage.region
+        field_id = storage.field.field_id
+        parts: list[Any] = [
+            Tiling(Shape((size // (1 << n),)), Shape((1 << n,))).construct(
+                region
+            )
+            for n in range(num_partitions)
+        ]
+        # The first region is written and the others are read through all
+        # of the partitions, each of them twice
+        if idx == 0:
+            req = RegionReq(
+                region, Permission.WRITE, Partition(parts[0], 0), 0, 0
+            )
+            inserts.append((req, field_id))
+            continue
+        for _ in range(2):
+            for part in parts:
+                req = RegionReq(
+                    region, Permission.READ, Partition(part, 0), 0, 0
+                )
+                inserts.append((req, field_id))
+    return inserts
+
+
+def run(cold: bool, inserts: list[tuple[RegionReq, int]], repeat: int) -> None:
+    elapsed = 0.0
+    for _ in range(repeat):
+        if cold:
+            launcher._coalescing_plans.clear()
+        analyzer = RequirementAnalyzer()
+        start = perf_counter()
+        for req, field_id in inserts:
+            analyzer.insert(req, field_id)
+        analyzer.analyze_requirements()
+        elapsed += perf_counter() - start
+    print(
+        f"{'cold' if cold else 'cached':>6}: "
+        f"{len(inserts)} requests coalesced in "
+        f"{elapsed / repeat * 1e6:.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-r",
+        "--regions",
+        type=int,
+        default=4,
+        dest="regions",
+        help="Number of regions accessed by the task",
+    )
+    parser.add_argument(
+        "-p",
+        "--partitions",
+        type=int,
+        default=5,
+        dest="partitions",
+        help="Number of partitions through which each region is read",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        default=1 << 16,
+        dest="size",
+        help="Number of elements of each region",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=1000,
+        dest="repeat",
+        help="Number of analyses to time",
+    )
+    args, _ = parser.parse_known_args()
+
+    inserts = make_inserts(args.regions, args.partitions, args.size)
+    for cold in (True, False):
+        run(cold, inserts, args.repeat)
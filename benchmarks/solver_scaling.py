@@ -0,0 +1,91 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures how the time to solve partitioning constraints grows with the
+number of aligned stores of a task, and how the equivalence classes of
+partition symbols scale on their own. The task is partitioned but never
+launched. Run with ``legate benchmarks/solver_scaling.py``.
+"""
+
+import argparse
+from time import perf_counter
+
+from legate.core import get_legate_runtime, types as ty
+from legate.core.solver import EqClass, Partitioner
+
+
+def bench_eq_class(num_vars: int, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        eq_class: EqClass[int] = EqClass()
+        # Interleave two chains and merge them at the end, which is the
+        # worst case for classes that are rebuilt on every merge
+        for var in range(2, num_vars):
+            eq_class.record(var - 2, var)
+        eq_class.record(0, 1)
+        for var in range(num_vars):
+            eq_class.find(var)
+    return (perf_counter() - start) / repeat
+
+
+def bench_solver(num_stores: int, repeat: int) -> float:
+    runtime = get_legate_runtime()
+    context = runtime.core_context
+    stores = [
+        runtime.create_store(ty.float32, shape=(1024, 1024))
+        for _ in range(num_stores)
+    ]
+    elapsed = 0.0
+    for _ in range(repeat):
+        task = runtime.create_auto_task(context, 0)
+        for store in stores:
+            task.add_input(store)
+        for store in stores[1:]:
+            task.add_alignment(stores[0], store)
+        # Skip the strategy cache, which would return the first strategy
+        start = perf_counter()
+        Partitioner([task])._partition_stores()
+        elapsed += perf_counter() - start
+    return elapsed / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--max-stores",
+        type=int,
+        default=256,
+        dest="max_stores",
+        help="Largest number of aligned stores",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=10,
+        dest="repeat",
+        help="Number of measurements to average",
+    )
+    args, _ = parser.parse_known_args()
+
+    print(f"{'stores':>8} {'solver (ms)':>12} {'eq class (ms)':>14}")
+    num_stores = 2
+    while num_stores <= args.max_stores:
+        solver = bench_solver(num_stores, args.repeat)
+        eq_class = bench_eq_class(num_stores, args.repeat)
+        print(f"{num_stores:>8} {solver * 1e3:>12.3f} {eq_class * 1e3:>14.3f}")
+        num_stores *= 2
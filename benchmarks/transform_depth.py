@@ -0,0 +1,105 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures the cost of issuing an operation on a view as the number of
+transformations applied to the store grows. Chains of slices and
+transposes are collapsed into a bounded number of transforms, whereas
+chains of promotions and projections keep growing, so the two are reported
+side by side. Run with ``legate benchmarks/transform_depth.py``.
+"""
+
+import argparse
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+from legate.core import Store, get_legate_runtime, types as ty
+
+
+def slice_transpose(store: Store, step: int) -> Store:
+    if step % 2 == 0:
+        return store.slice(0, slice(1, store.shape[0]))
+    return store.transpose((1, 0))
+
+
+def promote_project(store: Store, step: int) -> Store:
+    if step % 2 == 0:
+        return store.promote(0, 1)
+    return store.project(0, 0)
+
+
+def bench(
+    make_view: Callable[[Store, int], Store],
+    depth: int,
+    size: int,
+    repeat: int,
+) -> float:
+    runtime = get_legate_runtime()
+    view = runtime.create_store(ty.float64, shape=(size, size))
+    for step in range(depth):
+        view = make_view(view, step)
+    data = np.zeros(1, dtype=np.float64).tobytes()
+    value = runtime.create_store(
+        ty.float64, shape=(1,), data=runtime.create_future(data, len(data))
+    )
+    runtime.issue_execution_fence(block=True)
+
+    start = perf_counter()
+    for _ in range(repeat):
+        runtime.issue_fill(view, value)
+    runtime.flush_scheduling_window()
+    return (perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-d",
+        "--max-depth",
+        type=int,
+        default=64,
+        dest="max_depth",
+        help="Largest number of transformations",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        default=256,
+        dest="size",
+        help="Number of elements in each dimension of the store",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=100,
+        dest="repeat",
+        help="Number of operations timed for each depth",
+    )
+    args, _ = parser.parse_known_args()
+
+    print(
+        f"{'depth':>6} {'slice/transpose (us)':>21} "
+        f"{'promote/project (us)':>21}"
+    )
+    depth = 0
+    while depth <= args.max_depth:
+        sliced = bench(slice_transpose, depth, args.size, args.repeat)
+        promoted = bench(promote_project, depth, args.size, args.repeat)
+        print(f"{depth:>6} {sliced * 1e6:>21.2f} {promoted * 1e6:>21.2f}")
+        depth = 2 * depth if depth > 0 else 2
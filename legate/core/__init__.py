@@ -68,6 +68,7 @@ from ._legion import (
     Acquire,
     Release,
     Future,
+    gather,
     OutputRegion,
     PhysicalRegion,
     InlineMapping,
@@ -75,8 +76,11 @@ from ._legion import (
     FutureMap,
     IndexTask,
     Fence,
+    BeginTrace,
+    EndTrace,
     ArgumentMap,
     BufferBuilder,
+    BufferBuilderPool,
     legate_task_preamble,
     legate_task_progress,
     legate_task_postamble,
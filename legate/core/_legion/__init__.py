@@ -16,7 +16,7 @@ from __future__ import annotations
 
 from .env import LEGATE_MAX_DIM, LEGATE_MAX_FIELDS
 from .field import FieldID
-from .future import Future, FutureMap
+from .future import Future, FutureMap, gather
 from .geometry import Point, Rect, Domain
 from .operation import (
     Acquire,
@@ -44,11 +44,19 @@ from .partition_functor import (
 )
 from .region import Region, OutputRegion, PhysicalRegion
 from .space import IndexSpace, FieldSpace
-from .task import ArgumentMap, Fence, Task, IndexTask
+from .task import (
+    ArgumentMap,
+    BeginTrace,
+    EndTrace,
+    Fence,
+    Task,
+    IndexTask,
+)
 from .transform import Transform, AffineTransform
 from .util import (
     dispatch,
     BufferBuilder,
+    BufferBuilderPool,
     ExternalResources,
     FieldListLike,
     legate_task_preamble,
@@ -61,11 +69,14 @@ __all__ = (
     "AffineTransform",
     "ArgumentMap",
     "Attach",
+    "BeginTrace",
     "BufferBuilder",
+    "BufferBuilderPool",
     "Copy",
     "Detach",
     "dispatch",
     "Domain",
+    "EndTrace",
     "EqualPartition",
     "ExternalResources",
     "Fence",
@@ -75,6 +86,7 @@ __all__ = (
     "Fill",
     "Future",
     "FutureMap",
+    "gather",
     "IndexAttach",
     "IndexCopy",
     "IndexDetach",
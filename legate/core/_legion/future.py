@@ -14,12 +14,50 @@
 #
 from __future__ import annotations
 
-from typing import Any, Optional
+import asyncio
+from typing import Any, Generator, Iterable, Optional
 
 from .. import ffi, legion
 from .geometry import Point, Rect
 from .pending import _pending_deletions
 
+# Bounds of the interval (in seconds) between polls of pending futures.
+# The interval doubles after every poll that finds pending futures.
+_MIN_POLL_INTERVAL = 1e-4
+_MAX_POLL_INTERVAL = 1e-2
+
+
+async def _wait_until_ready(futures: Iterable[Future]) -> None:
+    # Subscribing makes Legion bring the data of the futures to this node
+    # while we poll, so reading them afterwards doesn't block
+    pending = [f for f in futures if not f.is_ready(subscribe=True)]
+    interval = _MIN_POLL_INTERVAL
+    while len(pending) > 0:
+        await asyncio.sleep(interval)
+        pending = [f for f in pending if not f.is_ready(subscribe=True)]
+        interval = min(interval * 2, _MAX_POLL_INTERVAL)
+
+
+async def gather(*futures: Future) -> list[Any]:
+    """
+    Wait for multiple futures to complete without blocking the event loop.
+    All futures are polled together, which is cheaper than awaiting each
+    of them separately.
+
+    Parameters
+    ----------
+    *futures : Future
+        Futures to wait for
+
+    Returns
+    -------
+    list
+        Buffers storing the data of the futures, in the order the futures
+        were given
+    """
+    await _wait_until_ready(futures)
+    return [future.get_buffer() for future in futures]
+
 
 class Future:
     def __init__(
@@ -220,6 +258,33 @@ class Future:
         """
         legion.legion_future_get_void_result(self.handle)
 
+    async def wait_async(self) -> None:
+        """
+        Wait for the future to complete without blocking the event loop
+        """
+        await _wait_until_ready((self,))
+
+    async def get_buffer_async(self, size: Optional[int] = None) -> Any:
+        """
+        Return a buffer storing the data for this Future. Unlike
+        ``get_buffer``, this doesn't block the event loop while the future
+        is pending.
+
+        Parameters
+        ----------
+        size : int
+            Optional expected size of the future
+        Returns
+        -------
+        An object that implements the Python buffer protocol
+        that contains the data
+        """
+        await self.wait_async()
+        return self.get_buffer(size)
+
+    def __await__(self) -> Generator[Any, None, None]:
+        return self.wait_async().__await__()
+
     @property
     def type(self) -> Any:
         return self._type
@@ -269,6 +334,19 @@ class FutureMap:
         """
         legion.legion_future_map_wait_all_results(self.handle)
 
+    async def wait_async(self, domain: Rect) -> None:
+        """
+        Wait for all the futures in the future map to complete without
+        blocking the event loop. As Legion can't test a whole future map
+        for completion, the futures of the points are polled individually.
+
+        Parameters
+        ----------
+        domain : Rect
+            The domain of the future map
+        """
+        await _wait_until_ready([self.get_future(point) for point in domain])
+
     def get_future(self, point: Point) -> Future:
         """
         Extract a specific future from the future map
@@ -40,6 +40,7 @@ class InlineMapping(Dispatchable[PhysicalRegion]):
         parent: Optional[Region] = None,
         coherence: int = legion.LEGION_EXCLUSIVE,
         provenance: Optional[str] = None,
+        write_discard: bool = False,
     ) -> None:
         """
         An InlineMapping object provides a mechanism for creating a mapped
@@ -65,29 +66,23 @@ class InlineMapping(Dispatchable[PhysicalRegion]):
             Parent logical region from which privileges are derived
         coherence : int
             The coherence mode for the inline mapping
-        """
-        if read_only:
-            self.launcher = legion.legion_inline_launcher_create_logical_region(  # noqa: E501
-                region.handle,
-                legion.LEGION_READ_ONLY,
-                coherence,
-                region.get_root().handle if parent is None else parent.handle,
-                0,
-                False,
-                mapper,
-                tag,
-            )
-        else:
-            self.launcher = legion.legion_inline_launcher_create_logical_region(  # noqa: E501
-                region.handle,
-                legion.LEGION_READ_WRITE,
-                coherence,
-                region.get_root().handle if parent is None else parent.handle,
-                0,
-                False,
-                mapper,
-                tag,
-            )
+        provenance : str
+            Provenance of the inline mapping
+        write_discard : bool
+            Whether the inline mapping will overwrite the data without
+            reading it first
+        """
+        privilege = self.get_privilege(read_only, write_discard)
+        self.launcher = legion.legion_inline_launcher_create_logical_region(
+            region.handle,
+            privilege,
+            coherence,
+            region.get_root().handle if parent is None else parent.handle,
+            0,
+            False,
+            mapper,
+            tag,
+        )
         if provenance is not None:
             legion.legion_inline_launcher_set_provenance(
                 self.launcher, provenance.encode()
@@ -107,6 +102,40 @@ class InlineMapping(Dispatchable[PhysicalRegion]):
                 True,
             )
 
+    @staticmethod
+    def get_privilege(read_only: bool, write_discard: bool) -> int:
+        """
+        Returns the privilege of an inline mapping with the given flags
+
+        Parameters
+        ----------
+        read_only : bool
+            Whether the inline mapping will only be reading the data
+        write_discard : bool
+            Whether the inline mapping will overwrite the data without
+            reading it first
+
+        Returns
+        -------
+        int
+            Legion privilege of the inline mapping
+
+        Raises
+        ------
+        ValueError
+            If both ``read_only`` and ``write_discard`` are ``True``
+        """
+        if read_only and write_discard:
+            raise ValueError(
+                "An inline mapping cannot be both read-only and write-discard"
+            )
+        if read_only:
+            return legion.LEGION_READ_ONLY
+        elif write_discard:
+            return legion.LEGION_WRITE_DISCARD
+        else:
+            return legion.LEGION_READ_WRITE
+
     @dispatch
     def launch(
         self,
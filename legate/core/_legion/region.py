@@ -494,6 +494,16 @@ class PhysicalRegion(Dispatchable[None]):
             return False
         return legion.legion_physical_region_is_mapped(self.handle)
 
+    def is_valid(self) -> bool:
+        """
+        Returns
+        -------
+        bool indicating if the data in this PhysicalRegion is ready to access
+        """
+        if self.handle is None:
+            return False
+        return legion.legion_physical_region_is_valid(self.handle)
+
     def wait_until_valid(self) -> None:
         """
         Block waiting until the data in this physical region
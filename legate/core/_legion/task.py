@@ -1174,6 +1174,67 @@ class Fence(Dispatchable[Future]):
             )
 
 
+class BeginTrace(Dispatchable[None]):
+    def __init__(self, trace_id: int, logical_only: bool = False) -> None:
+        """
+        A BeginTrace operation marks the beginning of a trace. Legion
+        records the dependence analysis of the operations issued in a
+        trace the first time it runs, and replays it on later runs with
+        the same trace id, which requires the later runs to issue the same
+        sequence of operations.
+
+        Parameters
+        ----------
+        trace_id : int
+            The id of the trace
+        logical_only : bool
+            Whether to only memoize the logical dependence analysis and
+            not the physical analysis
+        """
+        self.trace_id = trace_id
+        self.logical_only = logical_only
+
+    @dispatch
+    def launch(
+        self,
+        runtime: legion.legion_runtime_t,
+        context: legion.legion_context_t,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Dispatch this operation to the runtime
+        """
+        legion.legion_runtime_begin_trace(
+            runtime, context, self.trace_id, self.logical_only
+        )
+
+
+class EndTrace(Dispatchable[None]):
+    def __init__(self, trace_id: int) -> None:
+        """
+        An EndTrace operation marks the end of a trace started by a
+        BeginTrace operation with the same trace id.
+
+        Parameters
+        ----------
+        trace_id : int
+            The id of the trace
+        """
+        self.trace_id = trace_id
+
+    @dispatch
+    def launch(
+        self,
+        runtime: legion.legion_runtime_t,
+        context: legion.legion_context_t,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Dispatch this operation to the runtime
+        """
+        legion.legion_runtime_end_trace(runtime, context, self.trace_id)
+
+
 class ArgumentMap:
     def __init__(
         self,
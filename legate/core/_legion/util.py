@@ -20,6 +20,7 @@ from functools import cached_property
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Generic,
     List,
     Optional,
@@ -37,6 +38,8 @@ from .partition import IndexPartition
 from .pending import _pending_deletions, _pending_unordered
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
+
     from . import AffineTransform
 
 
@@ -221,126 +224,158 @@ class ExternalResources:
         self.handle = None
 
 
+# Precompiled packers for the values BufferBuilder serializes
+_INT8 = struct.Struct("=b")
+_INT16 = struct.Struct("=h")
+_INT32 = struct.Struct("=i")
+_INT64 = struct.Struct("=q")
+_UINT8 = struct.Struct("=B")
+_UINT16 = struct.Struct("=H")
+_UINT32 = struct.Struct("=I")
+_UINT64 = struct.Struct("=Q")
+_FLOAT32 = struct.Struct("=f")
+_FLOAT64 = struct.Struct("=d")
+_BOOL = struct.Struct("=?")
+_CHAR = struct.Struct("=c")
+_COMPLEX64 = struct.Struct("=ff")
+_COMPLEX128 = struct.Struct("=dd")
+_POINTS: dict[int, struct.Struct] = {}
+
+
 class BufferBuilder:
     def __init__(self, type_safe: bool = False) -> None:
         """
         A BufferBuilder object is a helpful utility for constructing
         buffers of bytes to pass through to tasks in other languages.
         """
-
-        self.fmt: list[str] = []  # struct format string
-        self.fmt.append("=")
+        # Values are packed in place into a buffer that grows geometrically
+        # and is kept across resets, so that a reused builder doesn't
+        # reallocate it
+        self.buffer = bytearray(64)
         self.size = 0
-        self.args: list[Union[int, float, bytes]] = []
         self.string: Optional[bytes] = None
-        self.arglen: Optional[int] = None
         self.type_safe = type_safe
 
-    def add_arg(self, arg: Union[int, float, bytes], type_val: int) -> None:
+    def reset(self, type_safe: bool = False) -> None:
+        """
+        Discards all packed values so that the builder can be reused
+        """
+        self.size = 0
+        self.string = None
+        self.type_safe = type_safe
+
+    def _reserve(self, size: int) -> int:
+        offset = self.size
+        end = offset + size
+        capacity = len(self.buffer)
+        if end > capacity:
+            self.buffer.extend(bytes(max(end, 2 * capacity) - capacity))
+        self.size = end
+        return offset
+
+    def _pack(self, packer: struct.Struct, *values: Any) -> None:
+        packer.pack_into(self.buffer, self._reserve(packer.size), *values)
+
+    def add_type(self, type_val: int) -> None:
         # Save the type of the object as integer right before it
         # The integer must be matched in the C++ code in the unpack functions
-        if self.type_safe:
-            self.fmt.append("i")
-            self.size += 4
-            self.args.append(type_val)
-        self.args.append(arg)
+        self._pack(_INT32, type_val)
 
     def pack_8bit_int(self, arg: int) -> None:
-        self.fmt.append("b")
-        self.size += 1
-        self.add_arg(arg, legion.LEGION_TYPE_INT8)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_INT8)
+        self._pack(_INT8, arg)
 
     def pack_16bit_int(self, arg: int) -> None:
-        self.fmt.append("h")
-        self.size += 2
-        self.add_arg(arg, legion.LEGION_TYPE_INT16)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_INT16)
+        self._pack(_INT16, arg)
 
     def pack_32bit_int(self, arg: int) -> None:
-        self.fmt.append("i")
-        self.size += 4
-        self.add_arg(arg, legion.LEGION_TYPE_INT32)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_INT32)
+        self._pack(_INT32, arg)
 
     def pack_64bit_int(self, arg: int) -> None:
-        self.fmt.append("q")
-        self.size += 8
-        self.add_arg(arg, legion.LEGION_TYPE_INT64)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_INT64)
+        self._pack(_INT64, arg)
 
     def pack_8bit_uint(self, arg: int) -> None:
-        self.fmt.append("B")
-        self.size += 1
-        self.add_arg(arg, legion.LEGION_TYPE_UINT8)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_UINT8)
+        self._pack(_UINT8, arg)
 
     def pack_16bit_uint(self, arg: int) -> None:
-        self.fmt.append("H")
-        self.size += 2
-        self.add_arg(arg, legion.LEGION_TYPE_UINT16)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_UINT16)
+        self._pack(_UINT16, arg)
 
     def pack_32bit_uint(self, arg: int) -> None:
-        self.fmt.append("I")
-        self.size += 4
-        self.add_arg(arg, legion.LEGION_TYPE_UINT32)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_UINT32)
+        self._pack(_UINT32, arg)
 
     def pack_64bit_uint(self, arg: int) -> None:
-        self.fmt.append("Q")
-        self.size += 8
-        self.add_arg(arg, legion.LEGION_TYPE_UINT64)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_UINT64)
+        self._pack(_UINT64, arg)
 
     def pack_32bit_float(self, arg: float) -> None:
-        self.fmt.append("f")
-        self.size += 4
-        self.add_arg(arg, legion.LEGION_TYPE_FLOAT32)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_FLOAT32)
+        self._pack(_FLOAT32, arg)
 
     def pack_64bit_float(self, arg: float) -> None:
-        self.fmt.append("d")
-        self.size += 8
-        self.add_arg(arg, legion.LEGION_TYPE_FLOAT64)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_FLOAT64)
+        self._pack(_FLOAT64, arg)
 
     def pack_bool(self, arg: bool) -> None:
-        self.fmt.append("?")
-        self.size += 1
-        self.add_arg(arg, legion.LEGION_TYPE_BOOL)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_BOOL)
+        self._pack(_BOOL, arg)
 
     def pack_16bit_float(self, arg: int) -> None:
-        self.fmt.append("h")
-        self.size += 2
-        self.add_arg(arg, legion.LEGION_TYPE_FLOAT16)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_FLOAT16)
+        self._pack(_INT16, arg)
 
     def pack_char(self, arg: str) -> None:
-        self.fmt.append("c")
-        self.size += 1
-        self.add_arg(bytes(arg.encode("utf-8")), legion.LEGION_TYPE_TOTAL + 1)
+        if self.type_safe:
+            self.add_type(legion.LEGION_TYPE_TOTAL + 1)
+        self._pack(_CHAR, arg.encode("utf-8"))
 
     def pack_64bit_complex(self, arg: complex) -> None:
         if self.type_safe:
-            self.fmt.append("i")
-            self.size += 4
-            self.args.append(legion.LEGION_TYPE_COMPLEX64)
-        self.fmt.append("ff")  # encode complex as two floats
-        self.args.append(arg.real)
-        self.args.append(arg.imag)
+            self.add_type(legion.LEGION_TYPE_COMPLEX64)
+        # encode complex as two floats
+        self._pack(_COMPLEX64, arg.real, arg.imag)
 
     def pack_128bit_complex(self, arg: complex) -> None:
         if self.type_safe:
-            self.fmt.append("i")
-            self.size += 4
-            self.args.append(legion.LEGION_TYPE_COMPLEX128)
-        self.fmt.append("dd")  # encode complex as two floats
-        self.args.append(arg.real)
-        self.args.append(arg.imag)
+            self.add_type(legion.LEGION_TYPE_COMPLEX128)
+        # encode complex as two doubles
+        self._pack(_COMPLEX128, arg.real, arg.imag)
 
     def pack_dimension(self, dim: int) -> None:
         self.pack_32bit_int(dim)
 
     def pack_point(self, point: Point) -> None:
-        if not isinstance(point, tuple):
-            raise ValueError("'point' must be a tuple")
+        if not isinstance(point, (tuple, Point)):
+            raise ValueError("'point' must be a tuple or a Point")
         dim = len(point)
         if dim <= 0:
             raise ValueError("'dim' must be positive")
         if self.type_safe:
             self.pack_32bit_int(dim)
-        for p in point:
-            self.pack_64bit_int(p)
+            for p in point:
+                self.pack_64bit_int(p)
+        else:
+            packer = _POINTS.get(dim)
+            if packer is None:
+                packer = _POINTS[dim] = struct.Struct(f"={dim}q")
+            self._pack(packer, *point)
 
     def pack_accessor(
         self,
@@ -366,22 +401,48 @@ class BufferBuilder:
                 self.pack_transform(point_transform)
 
     def pack_transform(self, transform: AffineTransform) -> None:
-        for x in range(0, transform.M):
-            for y in range(0, transform.N):
-                self.pack_64bit_int(transform.trans[x, y])
-        for x in range(0, transform.M):
-            self.pack_64bit_int(transform.offset[x])
+        self.pack_ndarray(transform.trans.astype(np.int64))
+        self.pack_ndarray(transform.offset.astype(np.int64))
 
     def pack_string(self, string: str) -> None:
-        self.pack_32bit_uint(len(string))
-        for char in string:
-            self.pack_char(char)
+        if self.type_safe:
+            self.pack_32bit_uint(len(string))
+            for char in string:
+                self.pack_char(char)
+        else:
+            encoded = string.encode("utf-8")
+            self._pack(_UINT32, len(encoded))
+            self.pack_bytes(encoded)
+
+    def pack_ndarray(self, array: npt.NDArray[Any]) -> None:
+        """
+        Packs the elements of a NumPy array in row-major order. The result
+        is the same as packing each element with the method for its type.
+        """
+        if self.type_safe:
+            packer = self._ndarray_packers.get(array.dtype.type)
+            if packer is None:
+                raise ValueError(
+                    f"{array.dtype} is not a valid data type for "
+                    "BufferBuilder"
+                )
+            for value in array.flat:
+                packer(self, value)
+        else:
+            data = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+            self.pack_bytes(data.data)
 
-    def pack_buffer(self, buf: Any) -> None:
+    def pack_buffer(self, buf: BufferBuilder) -> None:
         self.pack_32bit_uint(buf.get_size())
-        self.fmt.append(buf.fmt[1:])
-        self.size += buf.size
-        self.args.append(*(buf.args))
+        self.pack_bytes(memoryview(buf.buffer)[: buf.size])
+
+    def pack_bytes(self, data: Union[bytes, memoryview]) -> None:
+        """
+        Appends bytes serialized by another builder as they are
+        """
+        size = len(data)
+        offset = self._reserve(size)
+        self.buffer[offset : offset + size] = data
 
     # Static member of this class for encoding dtypes
     _dtype_codes = {
@@ -404,6 +465,22 @@ class BufferBuilder:
         np.complex128: legion.LEGION_TYPE_COMPLEX128,
     }
 
+    _ndarray_packers: dict[type, Callable[[BufferBuilder, Any], None]] = {
+        np.bool_: pack_bool,
+        np.int8: pack_8bit_int,
+        np.int16: pack_16bit_int,
+        np.int32: pack_32bit_int,
+        np.int64: pack_64bit_int,
+        np.uint8: pack_8bit_uint,
+        np.uint16: pack_16bit_uint,
+        np.uint32: pack_32bit_uint,
+        np.uint64: pack_64bit_uint,
+        np.float32: pack_32bit_float,
+        np.float64: pack_64bit_float,
+        np.complex64: pack_64bit_complex,
+        np.complex128: pack_128bit_complex,
+    }
+
     @classmethod
     def encode_dtype(cls, dtype: Any) -> int:
         if dtype in cls._dtype_codes:
@@ -417,18 +494,41 @@ class BufferBuilder:
     def pack_dtype(self, dtype: Any) -> None:
         self.pack_32bit_int(self.encode_dtype(dtype))
 
-    def get_string(self) -> Optional[bytes]:
-        if self.string is None or self.arglen != len(self.args):
-            fmtstr = "".join(self.fmt)
-            assert len(fmtstr) == len(self.args) + 1
-            self.string = struct.pack(fmtstr, *self.args)
-            self.arglen = len(self.args)
+    def get_string(self) -> bytes:
+        # Values are only ever appended, so the cached string is stale
+        # exactly when the size has changed
+        if self.string is None or len(self.string) != self.size:
+            with memoryview(self.buffer) as view:
+                self.string = view[: self.size].tobytes()
         return self.string
 
     def get_size(self) -> int:
         return self.size
 
 
+class BufferBuilderPool:
+    def __init__(self, max_size: int = 16) -> None:
+        """
+        A pool of BufferBuilder objects that can be reused across launches
+        to avoid reallocating their buffers.
+        """
+        self._max_size = max_size
+        self._free: list[BufferBuilder] = []
+
+    def acquire(self, type_safe: bool = False) -> BufferBuilder:
+        if len(self._free) == 0:
+            return BufferBuilder(type_safe=type_safe)
+        buf = self._free.pop()
+        buf.reset(type_safe=type_safe)
+        return buf
+
+    def release(self, buf: BufferBuilder) -> None:
+        # The bytes returned by get_string are immutable, so it is safe to
+        # reuse the builder once the caller is done packing values
+        if len(self._free) < self._max_size:
+            self._free.append(buf)
+
+
 class Logger:
     def __init__(self, name: str) -> None:
         self.handle = legion.legion_logger_create(name.encode("utf-8"))
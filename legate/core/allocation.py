@@ -17,8 +17,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Callable, Union
 
 if TYPE_CHECKING:
-    from . import Partition as LegionPartition, Point
-    from .store import RegionField
+    from . import Partition as LegionPartition, PhysicalRegion, Point
+    from .store import RegionField, Store
 
 
 class InlineMappedAllocation:
@@ -74,6 +74,77 @@ class InlineMappedAllocation:
         return result
 
 
+class PrefetchedMapping:
+    """
+    A handle to an inline mapping of a store issued ahead of time, which
+    keeps the mapping alive until the handle is released or collected
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        region_field: RegionField,
+        physical_region: PhysicalRegion,
+        read_only: bool,
+        write_discard: bool,
+    ) -> None:
+        self._store = store
+        self._region_field = region_field
+        self._physical_region = physical_region
+        self._read_only = read_only
+        self._write_discard = write_discard
+        self._released = False
+
+    def __del__(self) -> None:
+        self.release(unordered=True)
+
+    @property
+    def ready(self) -> bool:
+        """
+        Indicates whether the data of the mapping is ready to access
+
+        Returns
+        -------
+        bool
+            If ``True``, ``get_inline_allocation`` won't block
+        """
+        return self._physical_region.is_valid()
+
+    def get_inline_allocation(self) -> InlineMappedAllocation:
+        """
+        Creates an inline allocation of the store from the prefetched
+        mapping, waiting for the mapping only if its data isn't ready yet
+
+        Returns
+        -------
+        InlineMappedAllocation
+            A helper object wrapping the allocation
+        """
+        if self._released:
+            raise RuntimeError("The prefetched mapping is already released")
+        return self._store.get_inline_allocation(
+            read_only=self._read_only, write_discard=self._write_discard
+        )
+
+    def release(self, unordered: bool = False) -> None:
+        """
+        Drops the reference to the mapping held by this handle. The store
+        is unmapped once all allocations created from it are collected.
+
+        Parameters
+        ----------
+        unordered : bool
+            Whether the store should be unmapped with an unordered
+            operation, which is required when releasing from a destructor
+        """
+        if self._released:
+            return
+        self._released = True
+        self._region_field.decrement_inline_mapped_ref_count(
+            unordered=unordered
+        )
+
+
 class DistributedAllocation:
     def __init__(
         self,
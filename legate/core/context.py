@@ -14,7 +14,7 @@
 #
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union
+from typing import TYPE_CHECKING, Any, ContextManager, Optional, TypeVar, Union
 
 import numpy as np
 
@@ -340,6 +340,35 @@ class Context:
             ndim=ndim,
         )
 
+    def create_stores(
+        self,
+        dtype: Dtype,
+        shape: Union[Shape, tuple[int, ...]],
+        count: int,
+    ) -> list[Store]:
+        """
+        Creates stores of the same shape and type, allocating the fields of
+        all of them in one pass. This is the batched version of
+        ``create_store``.
+
+        Parameters
+        ----------
+        dtype : Dtype
+            Type of the elements
+
+        shape : Shape or tuple[int]
+            Shape of the stores
+
+        count : int
+            Number of stores to create
+
+        Returns
+        -------
+        list[Store]
+            New stores, each backed by its own field
+        """
+        return self._runtime.create_stores(dtype, shape, count)
+
     def get_nccl_communicator(self) -> Communicator:
         return self._runtime.get_nccl_communicator()
 
@@ -368,7 +397,27 @@ class Context:
         """
         self._runtime.issue_execution_fence(block=block)
 
-    def tree_reduce(self, task_id: int, store: Store, radix: int = 4) -> Store:
+    def trace(self, trace_id: int) -> ContextManager[None]:
+        """
+        Returns a context manager that traces the operations issued in its
+        scope, so that Legion can replay their dependence analysis when the
+        same sequence of operations is issued again with the same trace id.
+        See ``Runtime.trace`` for details.
+
+        Parameters
+        ----------
+        trace_id : int
+            Id of the trace
+        """
+        return self._runtime.trace(trace_id)
+
+    def tree_reduce(
+        self,
+        task_id: int,
+        store: Store,
+        radix: Optional[int] = None,
+        axis: Optional[int] = None,
+    ) -> Store:
         """
         Performs a user-defined reduction by building a tree of reduction
         tasks. At each step, the reducer task gets up to ``radix`` input stores
@@ -386,15 +435,20 @@ class Context:
         store : Store
             Store to perform reductions on
 
-        radix : int
+        radix : int, optional
             Fan-in of each reducer task. If the store is partitioned into
             :math:`N` sub-stores by the runtime, then the first level of
             reduction tree has :math:`\\ceil{N / \\mathtt{radix}}` reducer
-            tasks.
+            tasks. If not given, the runtime picks one.
+
+        axis : int, optional
+            Dimension of the store along which sub-stores are reduced. If not
+            given, all sub-stores are reduced into one.
 
         Returns
         -------
         Store
-            Store that contains reduction results
+            Store that contains reduction results, with the same number of
+            dimensions as the input store
         """
-        return self._runtime.tree_reduce(self, task_id, store, radix)
+        return self._runtime.tree_reduce(self, task_id, store, radix, axis)
@@ -0,0 +1,259 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterator, Optional
+
+
+@lru_cache
+def prime_factors(n: int) -> tuple[int, ...]:
+    """
+    Returns the prime factors of a positive integer in descending order,
+    with multiplicity
+    """
+    if n < 1:
+        raise ValueError(f"Expected a positive integer, but got {n}")
+    factors: list[int] = []
+    remaining = n
+    factor = 2
+    while factor * factor <= remaining:
+        while remaining % factor == 0:
+            factors.append(factor)
+            remaining //= factor
+        factor += 1
+    if remaining > 1:
+        factors.append(remaining)
+    return tuple(reversed(factors))
+
+
+@lru_cache
+def divisors(n: int) -> tuple[int, ...]:
+    """
+    Returns the divisors of a positive integer in ascending order
+    """
+    result = {1}
+    for factor in prime_factors(n):
+        result |= {d * factor for d in result}
+    return tuple(sorted(result))
+
+
+class LaunchShapePlanner(ABC):
+    """
+    Base class of launch shape planners. A planner decides how many pieces
+    an array of a given shape is partitioned into and how the pieces are
+    laid out along the dimensions.
+    """
+
+    @abstractmethod
+    def plan(
+        self,
+        shape: tuple[int, ...],
+        num_pieces: int,
+        min_volume: int,
+        itemsize: int,
+    ) -> Optional[tuple[int, ...]]:
+        """
+        Computes a launch shape for an array
+
+        Parameters
+        ----------
+        shape : tuple[int, ...]
+            Extents of the array in the dimensions to partition. All extents
+            are greater than 1.
+        num_pieces : int
+            Number of processors available for the launch
+        min_volume : int
+            Minimum number of elements that each piece should have
+        itemsize : int
+            Size of each element in bytes
+
+        Returns
+        -------
+        tuple[int, ...] or None
+            Number of pieces in each dimension, or ``None`` if the array
+            should not be partitioned
+        """
+        ...
+
+
+class UniformLaunchShapePlanner(LaunchShapePlanner):
+    """
+    Partitions every array that can make at least two pieces into as many
+    pieces as there are processors. Two dimensional arrays get pieces as
+    square as possible, and for higher dimensions the prime factors of the
+    number of pieces are assigned to the largest remaining dimensions.
+    """
+
+    def plan(
+        self,
+        shape: tuple[int, ...],
+        num_pieces: int,
+        min_volume: int,
+        itemsize: int,
+    ) -> Optional[tuple[int, ...]]:
+        volume = math.prod(shape)
+        # Figure out how many shards we can make with this array
+        max_pieces = (volume + min_volume - 1) // min_volume
+        assert max_pieces > 0
+        # If we can only make one piece return that now
+        if max_pieces == 1:
+            return None
+        # If we can make at least two pieces then we will make N pieces
+        max_pieces = num_pieces
+
+        dims = len(shape)
+        if dims == 1:
+            # Easy case for one dimensional things
+            return (min(shape[0], max_pieces),)
+        elif dims == 2:
+            if volume < max_pieces:
+                return shape
+            # Two dimensional so we can use square root to try and generate
+            # as square a pieces as possible since most often we will be
+            # doing matrix operations with these
+            nx, ny = shape
+            swap = nx > ny
+            if swap:
+                nx, ny = ny, nx
+            n = math.sqrt(float(max_pieces * nx) / float(ny))
+            # Need to constraint n to be an integer with numpcs % n == 0
+            # try rounding n both up and down
+            n1 = max(int(math.floor(n + 1e-12)), 1)
+            while max_pieces % n1 != 0:
+                n1 -= 1
+            n2 = int(math.ceil(n - 1e-12))
+            while max_pieces % n2 != 0:
+                n2 += 1
+            # pick whichever of n1 and n2 gives blocks closest to square
+            # i.e. gives the shortest long side
+            side1 = max(nx // n1, ny // (max_pieces // n1))
+            side2 = max(nx // n2, ny // (max_pieces // n2))
+            px = n1 if side1 <= side2 else n2
+            py = max_pieces // px
+            # we need to trim launch space if it is larger than the
+            # original shape in one of the dimensions (can happen in
+            # testing)
+            if swap:
+                return (min(py, shape[0]), min(px, shape[1]))
+            else:
+                return (min(px, shape[0]), min(py, shape[1]))
+
+        # For higher dimensions we care less about "square"-ness and more
+        # about evenly dividing things, so we round-robin the prime factors
+        # of the number of pieces onto the shape, with the goal being to
+        # keep the last dimension >= 32 for good memory performance on the
+        # GPU
+        result = [1] * dims
+        for factor in prime_factors(max_pieces):
+            remaining = tuple((s + r - 1) // r for s, r in zip(shape, result))
+            big_dim = remaining.index(max(remaining))
+            if big_dim < dims - 1 or remaining[big_dim] // factor >= 32:
+                result[big_dim] *= factor
+            else:
+                # See if we can do it with one of the other dimensions
+                big_dim = remaining.index(max(remaining[:-1]))
+                if remaining[big_dim] // factor > 0:
+                    result[big_dim] *= factor
+                else:
+                    # Fine just do it on the last dimension
+                    result[-1] *= factor
+        return tuple(result)
+
+
+class CostModelLaunchShapePlanner(LaunchShapePlanner):
+    """
+    Picks the launch shape that minimizes the estimated cost of a task
+    operating on the array. The cost of a launch shape is the number of
+    bytes in the largest piece, which approximates the computation time,
+    plus the number of bytes on the boundaries of the piece, which
+    approximates the communication volume of halo exchanges.
+
+    Only launch shapes whose pieces have at least ``min_volume`` elements
+    are considered, so small arrays are partitioned into fewer pieces than
+    there are processors. The number of pieces is either a divisor of the
+    number of processors or the largest number of pieces that satisfy the
+    minimum volume, so prime processor counts still get partitioned.
+    """
+
+    # Pieces whose innermost dimension is shorter than this (in bytes)
+    # are avoided, as they lead to poor memory access patterns
+    MIN_CONTIGUOUS_BYTES = 256
+
+    @staticmethod
+    def _factorizations(n: int, dims: int) -> Iterator[tuple[int, ...]]:
+        if dims == 1:
+            yield (n,)
+            return
+        for d in divisors(n):
+            for rest in CostModelLaunchShapePlanner._factorizations(
+                n // d, dims - 1
+            ):
+                yield (d,) + rest
+
+    def _cost(
+        self,
+        shape: tuple[int, ...],
+        launch_shape: tuple[int, ...],
+        itemsize: int,
+    ) -> tuple[bool, int, int]:
+        tile = tuple((s + p - 1) // p for s, p in zip(shape, launch_shape))
+        volume = math.prod(tile)
+        surface = sum(
+            2 * (volume // extent)
+            for extent, pieces in zip(tile, launch_shape)
+            if pieces > 1
+        )
+        fragmented = (
+            launch_shape[-1] > 1
+            and tile[-1] * itemsize < self.MIN_CONTIGUOUS_BYTES
+        )
+        return fragmented, (volume + surface) * itemsize, max(tile)
+
+    def plan(
+        self,
+        shape: tuple[int, ...],
+        num_pieces: int,
+        min_volume: int,
+        itemsize: int,
+    ) -> Optional[tuple[int, ...]]:
+        volume = math.prod(shape)
+        # Pieces smaller than the minimum volume aren't worth a task
+        max_pieces = min(num_pieces, volume // max(min_volume, 1))
+        if max_pieces < 2:
+            return None
+        candidates = set(d for d in divisors(num_pieces) if d <= max_pieces)
+        candidates.add(max_pieces)
+        candidates.discard(1)
+
+        best: Optional[tuple[int, ...]] = None
+        best_cost: Optional[tuple[bool, int, int, int, tuple[int, ...]]] = None
+        for pieces in sorted(candidates):
+            for launch_shape in self._factorizations(pieces, len(shape)):
+                if any(p > s for p, s in zip(launch_shape, shape)):
+                    continue
+                fragmented, cost, side = self._cost(
+                    shape, launch_shape, itemsize
+                )
+                # Among launch shapes of the same cost, we prefer those
+                # with more pieces, then those with squarer pieces, and then
+                # those that split outer dimensions, as they keep pieces
+                # contiguous in memory
+                key = (fragmented, cost, -pieces, side, launch_shape[::-1])
+                if best_cost is None or key < best_cost:
+                    best, best_cost = launch_shape, key
+        return best
@@ -22,6 +22,7 @@ from typing import (
     Any,
     Callable,
     Generator,
+    Hashable,
     Optional,
     Protocol,
     Sequence,
@@ -45,7 +46,7 @@ from . import (
     types as ty,
 )
 from .runtime import runtime
-from .utils import OrderedSet
+from .utils import LRUCache, OrderedSet
 
 if TYPE_CHECKING:
     from . import FieldSpace, IndexSpace, OutputRegion, Point, Rect, Region
@@ -100,6 +101,17 @@ _SERIALIZERS: dict[int, Serializer] = {
 
 EntryType = Tuple[Union["Broadcast", "Partition"], int, int]
 
+# A coalesced requirement whose region, projection, and fields are
+# replaced by the order in which they first appear in a launch
+RequirementSlots = Tuple[int, "Permission", int, Tuple[int, ...]]
+
+# Permissions and projections requested for a field, where projections are
+# replaced by the order in which they first appear in the requests
+FieldAccesses = Tuple[Tuple["Permission", int], ...]
+
+# Maximum number of coalescing outcomes cached for field accesses
+_MAX_COALESCING_PLANS = 1024
+
 
 class RequirementIndexer(Protocol):
     def get_requirement_index(
@@ -113,6 +125,11 @@ class LauncherArg(Protocol):
         ...
 
 
+class StoreArg(LauncherArg, Protocol):
+    def signature(self) -> Hashable:
+        ...
+
+
 class ScalarArg:
     def __init__(
         self,
@@ -155,6 +172,19 @@ class FutureStoreArg:
         for extent in extents:
             buf.pack_64bit_int(extent)
 
+    def signature(self) -> Hashable:
+        # Everything that goes into the serialized argument
+        return (
+            FutureStoreArg,
+            self._store._unique_id,
+            self._read_only,
+            self._future_index,
+            self._redop,
+            self._store.extents,
+            self._store.type.uid,
+            self._store.transform,
+        )
+
     def __str__(self) -> str:
         return f"FutureStoreArg({self._store})"
 
@@ -186,6 +216,21 @@ class RegionFieldArg:
         )
         buf.pack_32bit_uint(self._field_id)
 
+    def signature(self) -> Hashable:
+        # Everything that goes into the serialized argument. An unbound
+        # store becomes bound after its first launch.
+        return (
+            RegionFieldArg,
+            self._store._unique_id,
+            self._store.unbound,
+            self._store.type.uid,
+            self._store.transform,
+            self._redop,
+            self._dim,
+            self._indexer.get_requirement_index(self._req, self._field_id),
+            self._field_id,
+        )
+
     def __str__(self) -> str:
         return f"RegionFieldArg({self._dim}, {self._req}, {self._field_id})"
 
@@ -543,36 +588,109 @@ class ProjectionSet:
         return str(self._entries)
 
 
-class FieldSet:
-    def __init__(self) -> None:
-        self._fields: dict[int, ProjectionSet] = {}
+_coalescing_plans: LRUCache[
+    tuple[FieldAccesses, bool], tuple[tuple[Permission, int], ...]
+] = LRUCache(_MAX_COALESCING_PLANS)
 
-    def insert(
-        self, field_id: int, perm: Permission, proj_info: EntryType
-    ) -> None:
-        if field_id in self._fields:
-            proj_set = self._fields[field_id]
+
+def _coalesce_field(
+    accesses: FieldAccesses,
+    entries: list[EntryType],
+    error_on_interference: bool,
+) -> Sequence[tuple[Any, ...]]:
+    """
+    Coalesces the requests for a field. The outcome only depends on which
+    of the projections are the same, so it is computed once for each
+    pattern of accesses and reused afterwards.
+    """
+    key = (accesses, error_on_interference)
+    plan = _coalescing_plans.get(key)
+    if plan is not None:
+        return [(perm, *entries[slot]) for perm, slot in plan]
+
+    proj_set = ProjectionSet()
+    for perm, slot in accesses:
+        proj_set.insert(perm, entries[slot])
+    result = proj_set.coalesce(error_on_interference)
+
+    # Outcomes that keep no access requirements apart aren't cached
+    if all(len(item) == 4 for item in result):
+        slots: dict[Any, int] = {
+            entry: slot for slot, entry in enumerate(entries)
+        }
+        _coalescing_plans[key] = tuple(
+            (item[0], slots[item[1:]]) for item in result
+        )
+    return result
+
+
+class LauncherTemplate:
+    """
+    Analyzed requirement layout of a task launch, which is shared by the
+    launches of the same task whose requirements have the same structure.
+    The template also keeps the serialized store arguments of the last
+    launch, so that launches passing the same stores in the same way don't
+    serialize them again.
+    """
+
+    def __init__(self, requirements: tuple[RequirementSlots, ...]) -> None:
+        self.requirements = requirements
+        self.arg_signature: Optional[Hashable] = None
+        self.args: Optional[bytes] = None
+
+
+class LauncherTemplateCache:
+    """
+    Caches launcher templates keyed on the task id and the structure of
+    the region requirements of a launch. Regions, projections, and fields
+    in the key are replaced by the order in which they first appear, as the
+    outcome of the coalescing analysis only depends on which of them are
+    the same. Therefore, launches with different stores of the same
+    strategy, e.g., those alternating between two buffers in a time
+    stepping loop, share a template.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: LRUCache[Hashable, LauncherTemplate] = LRUCache(
+            max(max_entries, 0)
+        )
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def find(self, key: Hashable) -> Optional[LauncherTemplate]:
+        template = self._entries.get(key)
+        if template is None:
+            self._misses += 1
         else:
-            proj_set = ProjectionSet()
-            self._fields[field_id] = proj_set
-        proj_set.insert(perm, proj_info)
-
-    def coalesce(self, error_on_interference: bool) -> dict[Any, list[int]]:
-        coalesced: dict[Any, list[int]] = {}
-        for field_id, proj_set in self._fields.items():
-            proj_infos = proj_set.coalesce(error_on_interference)
-            for key in proj_infos:
-                if key in coalesced:
-                    coalesced[key].append(field_id)
-                else:
-                    coalesced[key] = [field_id]
+            self._hits += 1
+        return template
 
-        return coalesced
+    def record(self, key: Hashable, template: LauncherTemplate) -> None:
+        self._entries[key] = template
 
 
 class RequirementAnalyzer(RequirementIndexer):
     def __init__(self, error_on_interference: bool = True) -> None:
-        self._field_sets: dict[Region, FieldSet] = {}
+        self._inserts: list[tuple[RegionReq, int]] = []
         self._requirements: list[tuple[RegionReq, list[int]]] = []
         self._requirement_map: dict[tuple[RegionReq, int], int] = {}
         self._error_on_interference = error_on_interference
@@ -583,31 +701,123 @@ class RequirementAnalyzer(RequirementIndexer):
 
     @property
     def empty(self) -> bool:
-        return len(self._field_sets) == 0
+        return len(self._inserts) == 0
 
     def __del__(self) -> None:
-        self._field_sets.clear()
+        self._inserts.clear()
         self._requirements.clear()
         self._requirement_map.clear()
 
     def insert(self, req: RegionReq, field_id: int) -> None:
-        region = req.region
-        field_set = self._field_sets.get(region)
-        if field_set is None:
-            field_set = FieldSet()
-            self._field_sets[region] = field_set
-        proj_info = (req.proj, req.tag, req.flags)
-        field_set.insert(field_id, req.permission, proj_info)
-
-    def analyze_requirements(self) -> None:
-        for region, field_set in self._field_sets.items():
-            perm_map = field_set.coalesce(self._error_on_interference)
-            for key, fields in perm_map.items():
-                req_idx = len(self._requirements)
-                req = RegionReq(region, *key)
-                for field_id in fields:
-                    self._requirement_map[(req, field_id)] = req_idx
-                self._requirements.append((req, fields))
+        self._inserts.append((req, field_id))
+
+    def _add_requirement(self, req: RegionReq, fields: list[int]) -> None:
+        req_idx = len(self._requirements)
+        for field_id in fields:
+            self._requirement_map[(req, field_id)] = req_idx
+        self._requirements.append((req, fields))
+
+    def _coalesce(self) -> None:
+        # For each field of each region, the projections are numbered in
+        # the order of their first appearance and the requested accesses
+        # are kept without duplicates
+        regions: dict[
+            Region,
+            dict[int, tuple[dict[EntryType, int], dict[Any, None]]],
+        ] = {}
+        for req, field_id in self._inserts:
+            fields = regions.get(req.region)
+            if fields is None:
+                fields = regions[req.region] = {}
+            field = fields.get(field_id)
+            if field is None:
+                field = fields[field_id] = ({}, {})
+            entries, accesses = field
+            slot = entries.setdefault(
+                (req.proj, req.tag, req.flags), len(entries)
+            )
+            accesses[(req.permission, slot)] = None
+
+        for region, fields in regions.items():
+            coalesced: dict[Any, list[int]] = {}
+            for field_id, (entries, accesses) in fields.items():
+                for key in _coalesce_field(
+                    tuple(accesses),
+                    list(entries),
+                    self._error_on_interference,
+                ):
+                    field_ids = coalesced.get(key)
+                    if field_ids is None:
+                        coalesced[key] = [field_id]
+                    else:
+                        field_ids.append(field_id)
+
+            for key, field_ids in coalesced.items():
+                self._add_requirement(RegionReq(region, *key), field_ids)
+
+    def analyze_requirements(
+        self, task_id: Optional[int] = None
+    ) -> Optional[LauncherTemplate]:
+        """
+        Coalesces the inserted requirements. When a task id is given, the
+        analysis is looked up in and recorded to the template cache, and
+        the template used for the launch is returned.
+        """
+        template_cache = runtime.launcher_template_cache
+        if task_id is None or not template_cache.enabled:
+            self._coalesce()
+            return None
+
+        regions: dict[Region, int] = {}
+        entries: dict[EntryType, int] = {}
+        field_ids: dict[int, int] = {}
+        layout = tuple(
+            (
+                regions.setdefault(req.region, len(regions)),
+                req.permission,
+                entries.setdefault(
+                    (req.proj, req.tag, req.flags), len(entries)
+                ),
+                field_ids.setdefault(field_id, len(field_ids)),
+            )
+            for req, field_id in self._inserts
+        )
+        key = (task_id, self._error_on_interference, layout)
+
+        template = template_cache.find(key)
+        if template is not None:
+            all_regions = list(regions)
+            all_entries = list(entries)
+            all_field_ids = list(field_ids)
+            for slots in template.requirements:
+                region_slot, perm, entry_slot, field_slots = slots
+                req = RegionReq(
+                    all_regions[region_slot], perm, *all_entries[entry_slot]
+                )
+                fields = [all_field_ids[slot] for slot in field_slots]
+                self._add_requirement(req, fields)
+            return template
+
+        self._coalesce()
+
+        requirements: list[RequirementSlots] = []
+        for req, fields in self._requirements:
+            proj_slot = entries.get((req.proj, req.tag, req.flags))
+            # Requirements that don't map back to an inserted projection
+            # can't be reconstructed from the template
+            if proj_slot is None:
+                return None
+            requirements.append(
+                (
+                    regions[req.region],
+                    req.permission,
+                    proj_slot,
+                    tuple(field_ids[field_id] for field_id in fields),
+                )
+            )
+        template = LauncherTemplate(tuple(requirements))
+        template_cache.record(key, template)
+        return template
 
     def get_requirement_index(
         self, req: Union[RegionReq, OutputReq], field_id: int
@@ -725,9 +935,9 @@ class TaskLauncher:
         self._context = context
         self._mapper_id = context.mapper_id
         self._task_id = task_id
-        self._inputs: list[LauncherArg] = []
-        self._outputs: list[LauncherArg] = []
-        self._reductions: list[LauncherArg] = []
+        self._inputs: list[StoreArg] = []
+        self._outputs: list[StoreArg] = []
+        self._reductions: list[StoreArg] = []
         self._scalars: list[ScalarArg] = []
         self._comms: list[FutureMap] = []
         self._req_analyzer = RequirementAnalyzer(error_on_interference)
@@ -769,7 +979,7 @@ class TaskLauncher:
 
     def add_store(
         self,
-        args: list[LauncherArg],
+        args: list[StoreArg],
         store: Store,
         proj: Proj,
         perm: Permission,
@@ -895,24 +1105,47 @@ class TaskLauncher:
     def set_point(self, point: Point) -> None:
         self._point = point
 
+    def _pack_store_args(
+        self, argbuf: BufferBuilder, template: Optional[LauncherTemplate]
+    ) -> None:
+        all_args = (self._inputs, self._outputs, self._reductions)
+        if template is None:
+            for args in all_args:
+                pack_args(argbuf, args)
+            return
+
+        # Reuse the serialized store arguments of the last launch with
+        # the same template if they would come out the same
+        signature = tuple(
+            tuple(arg.signature() for arg in args) for args in all_args
+        )
+        if template.args is None or template.arg_signature != signature:
+            buf = runtime.buffer_pool.acquire(argbuf.type_safe)
+            for args in all_args:
+                pack_args(buf, args)
+            template.arg_signature = signature
+            template.args = buf.get_string()
+            runtime.buffer_pool.release(buf)
+        assert template.args is not None
+        argbuf.pack_bytes(template.args)
+
     def set_mapper_arg(self, task: Mappable) -> None:
-        argbuf = BufferBuilder()
+        argbuf = runtime.buffer_pool.acquire()
         runtime.machine.pack(argbuf)
         proj_id = find_key_projection(
             req for (req, _) in self._req_analyzer.requirements
         )
         argbuf.pack_32bit_uint(runtime.get_sharding(proj_id))
         task.set_mapper_arg(argbuf.get_string(), argbuf.get_size())
+        runtime.buffer_pool.release(argbuf)
 
     def build_task(
         self, launch_domain: Rect, argbuf: BufferBuilder
     ) -> IndexTask:
-        self._req_analyzer.analyze_requirements()
+        template = self._req_analyzer.analyze_requirements(self.legion_task_id)
         self._out_analyzer.analyze_requirements()
 
-        pack_args(argbuf, self._inputs)
-        pack_args(argbuf, self._outputs)
-        pack_args(argbuf, self._reductions)
+        self._pack_store_args(argbuf, template)
         pack_args(argbuf, self._scalars)
         argbuf.pack_bool(self._can_raise_exception)
         argbuf.pack_bool(self._insert_barrier)
@@ -951,12 +1184,10 @@ class TaskLauncher:
         return task
 
     def build_single_task(self, argbuf: BufferBuilder) -> SingleTask:
-        self._req_analyzer.analyze_requirements()
+        template = self._req_analyzer.analyze_requirements(self.legion_task_id)
         self._out_analyzer.analyze_requirements()
 
-        pack_args(argbuf, self._inputs)
-        pack_args(argbuf, self._outputs)
-        pack_args(argbuf, self._reductions)
+        self._pack_store_args(argbuf, template)
         pack_args(argbuf, self._scalars)
         argbuf.pack_bool(self._can_raise_exception)
 
@@ -990,7 +1221,9 @@ class TaskLauncher:
         return task
 
     def execute(self, launch_domain: Rect) -> ParallelExecutionResult:
-        task = self.build_task(launch_domain, BufferBuilder())
+        argbuf = runtime.buffer_pool.acquire()
+        task = self.build_task(launch_domain, argbuf)
+        runtime.buffer_pool.release(argbuf)
         result = self._context.dispatch(task)
         assert isinstance(result, FutureMap)
         self._out_analyzer.update_storages()
@@ -1001,8 +1234,10 @@ class TaskLauncher:
         )
 
     def execute_single(self) -> Future:
-        argbuf = BufferBuilder()
-        result = self._context.dispatch_single(self.build_single_task(argbuf))
+        argbuf = runtime.buffer_pool.acquire()
+        task = self.build_single_task(argbuf)
+        runtime.buffer_pool.release(argbuf)
+        result = self._context.dispatch_single(task)
         self._out_analyzer.update_storages()
         return result
 
@@ -1279,10 +1514,11 @@ class FillLauncher:
         self._point = point
 
     def set_mapper_arg(self, fill: Mappable) -> None:
-        argbuf = BufferBuilder()
+        argbuf = runtime.buffer_pool.acquire()
         runtime.machine.pack(argbuf)
         argbuf.pack_32bit_uint(runtime.get_sharding(self._lhs_proj.proj))
         fill.set_mapper_arg(argbuf.get_string(), argbuf.get_size())
+        runtime.buffer_pool.release(argbuf)
 
     def build_fill(self, launch_domain: Rect) -> IndexFill:
         if TYPE_CHECKING:
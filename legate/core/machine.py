@@ -168,6 +168,9 @@ class Machine:
                 return False
         return True
 
+    def __hash__(self) -> int:
+        return hash(tuple(self._get_range(kind) for kind in ProcessorKind))
+
     @property
     def preferred_kind(self) -> ProcessorKind:
         return self._preferred_kind
@@ -26,6 +26,7 @@ from typing import (
 
 import legate.core.types as ty
 
+from ..settings import settings
 from . import Future, FutureMap, Partition as LegionPartition, Rect
 from .constraints import PartSym
 from .launcher import (
@@ -572,19 +573,26 @@ class Task(TaskProtocol):
                 assert False
         else:
             idx = 0
-            # TODO: We can potentially deduplicate these extraction tasks
-            # by grouping output stores that are mapped to the same field space
+            # Unbound outputs mapped to the same output region have the same
+            # number of elements in each point task, so their weights are
+            # extracted only once per output region
+            partitions: dict[LegionPartition, Weighted] = {}
             for out_idx in self.unbound_outputs:
                 output = self.outputs[out_idx]
                 # TODO: need to track partitions for N-D unbound stores
-                if output.ndim > 1:
-                    continue
-                weights = runtime.extract_scalar_with_domain(
-                    result, idx, launch_domain
-                )
-                partition = Weighted(launch_shape, weights)
-                partition.import_partition(out_partitions[output])
-                output.set_key_partition(partition)
+                if output.ndim == 1:
+                    out_partition = out_partitions[output]
+                    weighted = partitions.get(out_partition)
+                    if weighted is None:
+                        weights = runtime.extract_scalar_with_domain(
+                            result, idx, launch_domain
+                        )
+                        weighted = Weighted(launch_shape, weights)
+                        weighted.import_partition(out_partition)
+                        partitions[out_partition] = weighted
+                    output.set_key_partition(weighted)
+                # Every unbound output has its slot in the result,
+                # including those whose partitions aren't tracked
                 idx += 1
             for red_idx in self.scalar_reductions:
                 (output, redop) = self.reductions[red_idx]
@@ -1470,12 +1478,16 @@ class Fill(AutoOperation):
 
 
 class _RadixProj:
-    def __init__(self, radix: int, offset: int) -> None:
+    def __init__(self, radix: int, offset: int, axis: int = 0) -> None:
         self._radix = radix
         self._offset = offset
+        self._axis = axis
 
     def __call__(self, p: SymbolicPoint) -> ProjOut:
-        return (p[0] * self._radix + self._offset,)
+        axis = self._axis
+        return (
+            p[:axis] + (p[axis] * self._radix + self._offset,) + p[axis + 1 :]
+        )
 
 
 class Reduce(AutoOperation):
@@ -1483,9 +1495,10 @@ class Reduce(AutoOperation):
         self,
         context: Context,
         task_id: int,
-        radix: int,
+        radix: Optional[int],
         op_id: int,
         target_machine: Machine,
+        axis: Optional[int] = None,
     ) -> None:
         super().__init__(
             context=context,
@@ -1494,6 +1507,7 @@ class Reduce(AutoOperation):
         )
         self._radix = radix
         self._task_id = task_id
+        self._axis = axis
 
     def add_input(self, store: Store) -> None:
         self._check_store(store)
@@ -1508,22 +1522,56 @@ class Reduce(AutoOperation):
         self._outputs.append(store)
         self._output_parts.append(partition)
 
+    def _choose_radix(self, extent: int, piece_bytes: int) -> int:
+        """
+        Picks the fan-in of a tree level that reduces ``extent`` pieces of
+        ``piece_bytes`` bytes each, where 0 bytes means the size is unknown
+        """
+        if self._radix is not None:
+            return self._radix
+        # Pieces produced by the processors of a node are reduced together
+        # first, so that most of the data doesn't cross nodes
+        per_node_count = (
+            self.target_machine.get_processor_range().per_node_count
+        )
+        radix = max(min(per_node_count, extent), 2)
+        max_bytes = settings.tree_reduce_max_fanin_bytes()
+        while max_bytes > 0 and radix > 2 and radix * piece_bytes > max_bytes:
+            radix = (radix + 1) // 2
+        return radix
+
     def launch(self, strategy: Strategy) -> None:
         assert len(self._inputs) == 1 and len(self._outputs) == 1
 
         input = self._inputs[0]
         ipart = input.partition(strategy.get_partition(self._input_parts[0]))
 
-        launch_domain = None
-        num_tasks = 1
+        # Unbound stores must have the same dimensionality as the launch
+        # domain, so the output of every level takes that of the result
+        launch_ndim = self._outputs[0].ndim
+        launch_shape = Shape((1,) * launch_ndim)
         if strategy.parallel:
             assert strategy.launch_domain is not None
-            launch_domain = strategy.launch_domain
-            num_tasks = launch_domain.get_volume()
+            launch_shape = Shape(c + 1 for c in strategy.launch_domain.hi)
+            assert launch_shape.ndim == launch_ndim
 
-        proj_fns = list(
-            _RadixProj(self._radix, off) for off in range(self._radix)
-        )
+        # Unless the pieces are laid out along the dimensions of the store,
+        # the reduction is done over all of them
+        if self._axis is None or launch_ndim != input.ndim:
+            axes = tuple(range(launch_ndim))
+        else:
+            axes = (self._axis,)
+
+        # The size of the pieces is known only for the input to the tree
+        piece_bytes = 0
+        if input.shape.fixed:
+            piece_bytes = (
+                input.shape.volume() * input.type.size // launch_shape.volume()
+            )
+
+        # The outputs of all tree levels share one field space
+        fspace = runtime.create_field_space()
+        field_id = fspace.allocate_field(input.type)
 
         # We need to make sure that the while loop below runs at least once
         # even when the input is produced by a single task.
@@ -1537,34 +1585,43 @@ class Reduce(AutoOperation):
                 provenance=self.provenance,
             )
 
-            if num_tasks > 1:
-                for proj_fn in proj_fns:
+            # Each level reduces the pieces along one of the dimensions
+            axis = next((dim for dim in axes if launch_shape[dim] > 1), None)
+            if axis is not None:
+                extent = launch_shape[axis]
+                radix = self._choose_radix(extent, piece_bytes)
+                for off in range(radix):
                     launcher.add_input(
-                        input, ipart.get_requirement(1, proj_fn)
+                        input,
+                        ipart.get_requirement(
+                            launch_ndim, _RadixProj(radix, off, axis)
+                        ),
                     )
+                launch_shape = launch_shape.update(
+                    axis, (extent + radix - 1) // radix
+                )
             else:
-                # If we're here, that means the input to this tree reduction is
-                # not partitioned. So, adding the input multiple times with
-                # different radix functors would just end up duplicating the
-                # inputs, which is both unnecessary and incorrect. Therefore,
-                # we only add the input once.
-                launcher.add_input(input, ipart.get_requirement(1))
+                # If we're here, that means the input to this tree reduction
+                # is not partitioned along the reduced dimensions. So, adding
+                # the input multiple times with different radix functors would
+                # just end up duplicating the inputs, which is both
+                # unnecessary and incorrect. Therefore, we only add the input
+                # once.
+                launcher.add_input(input, ipart.get_requirement(launch_ndim))
 
-            num_tasks = (num_tasks + self._radix - 1) // self._radix
-            done = num_tasks == 1
+            done = all(launch_shape[dim] == 1 for dim in axes)
 
-            if num_tasks == 1:
+            if done:
                 output = self._outputs[0]
             else:
-                output = self._context.create_store(input.type)
-            fspace = runtime.create_field_space()
-            field_id = fspace.allocate_field(input.type)
+                output = self._context.create_store(
+                    input.type, ndim=launch_ndim
+                )
             launcher.add_unbound_output(output, fspace, field_id)
 
-            launch_domain = Rect([num_tasks])
+            launch_domain = Rect(launch_shape.extents)
             result = launcher.execute(launch_domain)
 
-            launch_shape = Shape(c + 1 for c in launch_domain.hi)
             weighted = Weighted(launch_shape, result.future_map)
             weighted.import_partition(result.output_partitions[output])
             output.set_key_partition(weighted)
@@ -1572,3 +1629,4 @@ class Reduce(AutoOperation):
 
             input = output
             ipart = opart
+            piece_bytes = 0
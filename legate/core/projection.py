@@ -14,7 +14,8 @@
 #
 from __future__ import annotations
 
-from typing import Any, Callable, Optional, Tuple, Union
+from itertools import combinations, islice, permutations
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple, Union
 
 from . import ffi  # Make sure we only have one ffi instance
 
@@ -121,6 +122,38 @@ def is_identity_projection(src_ndims: int, dims: SymbolicPoint) -> bool:
     )
 
 
+def canonicalize_symbolic_point(dims: SymbolicPoint) -> SymbolicPoint:
+    """
+    Folds equivalent forms of coordinates into one, so that equivalent
+    projections are served by the same functor. A coordinate with a zero
+    weight is a constant whichever dimension it names.
+    """
+    if all(coord.weight != 0 or coord.dim == -1 for coord in dims):
+        return dims
+    return tuple(
+        ProjExpr(weight=0, offset=coord.offset) if coord.weight == 0 else coord
+        for coord in dims
+    )
+
+
+def enumerate_common_projections(
+    max_ndim: int,
+) -> Iterator[tuple[int, SymbolicPoint]]:
+    """
+    Enumerates the projections of broadcasting and transposed stores of up
+    to ``max_ndim`` dimensions, as pairs of the source dimension and the
+    symbolic point
+    """
+    for ndim in range(2, max_ndim + 1):
+        point = execute_functor_symbolically(ndim)
+        for tgt_ndim in range(1, ndim):
+            for kept in combinations(range(ndim), tgt_ndim):
+                yield ndim, tuple(point[dim] for dim in kept)
+        # The first permutation is the identity, which needs no functor
+        for axes in islice(permutations(range(ndim)), 1, None):
+            yield ndim, tuple(point[dim] for dim in axes)
+
+
 def pack_symbolic_projection_repr(
     src_ndim: int, dims: tuple[ProjExpr, ...]
 ) -> tuple[int, int, Any, Any, Any]:
@@ -134,3 +167,26 @@ def pack_symbolic_projection_repr(
         offsets_c[dim] = coord.offset
 
     return (src_ndim, tgt_ndim, dims_c, weights_c, offsets_c)
+
+
+def pack_symbolic_projection_reprs(
+    specs: Sequence[tuple[int, SymbolicPoint]]
+) -> tuple[int, Any, Any, Any, Any, Any]:
+    num_specs = len(specs)
+    total_ndim = sum(len(dims) for _, dims in specs)
+    src_ndims_c = ffi.new(f"int32_t[{num_specs}]")
+    tgt_ndims_c = ffi.new(f"int32_t[{num_specs}]")
+    dims_c = ffi.new(f"int32_t[{total_ndim}]")
+    weights_c = ffi.new(f"int32_t[{total_ndim}]")
+    offsets_c = ffi.new(f"int32_t[{total_ndim}]")
+    idx = 0
+    for spec_idx, (src_ndim, dims) in enumerate(specs):
+        src_ndims_c[spec_idx] = src_ndim
+        tgt_ndims_c[spec_idx] = len(dims)
+        for coord in dims:
+            dims_c[idx] = coord.dim
+            weights_c[idx] = coord.weight
+            offsets_c[idx] = coord.offset
+            idx += 1
+
+    return (num_specs, src_ndims_c, tgt_ndims_c, dims_c, weights_c, offsets_c)
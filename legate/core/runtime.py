@@ -16,18 +16,23 @@ from __future__ import annotations
 
 import gc
 import inspect
-import math
 import struct
 import sys
+import time
 import weakref
-from collections import deque
+from bisect import bisect_right, insort
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from dataclasses import dataclass
+from itertools import islice
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Deque,
+    Hashable,
+    Iterator,
     List,
     Optional,
     Protocol,
@@ -41,6 +46,9 @@ from legion_top import add_cleanup_item, top_level
 from ..settings import settings
 from . import ffi  # Make sure we only have one ffi instance
 from . import (
+    BeginTrace,
+    BufferBuilderPool,
+    EndTrace,
     Fence,
     FieldSpace,
     Future,
@@ -54,18 +62,30 @@ from . import (
     legion,
     types as ty,
 )
-from ._legion.env import LEGATE_MAX_FIELDS
+from ._legion.env import LEGATE_MAX_DIM, LEGATE_MAX_FIELDS
 from ._legion.util import Dispatchable
 from .allocation import Attachable
 from .communicator import CPUCommunicator, NCCLCommunicator
 from .corelib import core_library
 from .cycle_detector import find_cycles
 from .exception import PendingException
+from .launch_shape import (
+    CostModelLaunchShapePlanner,
+    LaunchShapePlanner,
+    UniformLaunchShapePlanner,
+    prime_factors,
+)
 from .machine import Machine, ProcessorKind
-from .projection import is_identity_projection, pack_symbolic_projection_repr
+from .projection import (
+    canonicalize_symbolic_point,
+    enumerate_common_projections,
+    is_identity_projection,
+    pack_symbolic_projection_repr,
+    pack_symbolic_projection_reprs,
+)
 from .restriction import Restriction
 from .shape import Shape
-from .utils import dlopen_no_autoclose
+from .utils import CacheStats, LRUCache, dlopen_no_autoclose
 
 if TYPE_CHECKING:
     from . import ArgumentMap, Detach, IndexDetach, IndexPartition, Library
@@ -77,9 +97,11 @@ if TYPE_CHECKING:
     from .communicator import Communicator
     from .context import Context
     from .corelib import CoreLib
+    from .launcher import LauncherTemplateCache
     from .operation import AutoTask, Copy, ManualTask, Operation
     from .partition import PartitionBase
     from .projection import SymbolicPoint
+    from .solver import Strategy, StrategyCache
     from .store import Field, RegionField, Store
 
     ProjSpec = Tuple[int, SymbolicPoint]
@@ -96,6 +118,14 @@ assert _sizeof_size_t == 4 or _sizeof_size_t == 8
 
 _LEGATE_FIELD_ID_BASE = 1000
 
+# Number of the oldest free fields checked for a finished detachment when
+# looking for a field that can be reused without blocking
+_MAX_READY_FIELD_CHECKS = 8
+
+# Projection functors for broadcasts and transposes of stores up to this
+# many dimensions are registered at startup
+_MAX_PREREGISTERED_PROJECTION_NDIM = min(4, LEGATE_MAX_DIM)
+
 
 class AnyCallable(Protocol):
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
@@ -156,21 +186,25 @@ class FreeFieldInfo:
 
 
 class FieldMatch(Dispatchable[Future]):
-    __slots__ = ["manager", "fields", "input", "output", "future"]
+    __slots__ = ["manager", "fields", "keys", "input", "output", "future"]
 
     def __init__(self, fields: List[FreeFieldInfo]) -> None:
         self.fields = fields
+        # The 'tree_id,field_id' pair of each field, which is the key used
+        # to find the field in the result of the match
+        self.keys = [
+            (field.region.handle.tree_id, field.field_id) for field in fields
+        ]
         # Allocate arrays of ints that are twice as long as fields since
-        # our values will be 'field_id,tree_id' pairs
+        # our values will be 'tree_id,field_id' pairs
         if (num_fields := len(fields)) > 0:
             alloc_string = f"int[{2 * num_fields}]"
             self.input = ffi.new(alloc_string)
             self.output = ffi.new(alloc_string)
             # Fill in the input buffer with our data
-            for idx in range(num_fields):
-                field = fields[idx]
-                self.input[2 * idx] = field.region.handle.tree_id
-                self.input[2 * idx + 1] = field.field_id
+            for idx, (tree_id, field_id) in enumerate(self.keys):
+                self.input[2 * idx] = tree_id
+                self.input[2 * idx + 1] = field_id
         else:
             self.input = ffi.NULL
             self.output = ffi.NULL
@@ -212,23 +246,24 @@ class FieldMatch(Dispatchable[Future]):
             num_fields = struct.unpack_from("Q", self.future.get_buffer(8))[0]
         assert num_fields <= len(self.fields)
         if num_fields > 0:
+            # Map each returned field to its position in the result, reading
+            # the result out of the cffi buffer only once
+            output = ffi.unpack(self.output, 2 * num_fields)
+            positions = {
+                (output[2 * idx], output[2 * idx + 1]): idx
+                for idx in range(num_fields)
+            }
             # Put all the returned fields onto the ordered queue in the order
             # that they are in this list since we know
             ordered_fields: List[Optional[FreeFieldInfo]] = [None] * num_fields
-            for field in self.fields:
-                found = False
-                for idx in range(num_fields):
-                    if self.output[2 * idx] != field.region.handle.tree_id:
-                        continue
-                    if self.output[2 * idx + 1] != field.field_id:
-                        continue
-                    assert ordered_fields[idx] is None
-                    ordered_fields[idx] = field
-                    found = True
-                    break
-                if not found:
+            for field, key in zip(self.fields, self.keys):
+                position = positions.get(key)
+                if position is None:
                     # Not found so put it back int the unordered queue
                     field.free(ordered=False)
+                    continue
+                assert ordered_fields[position] is None
+                ordered_fields[position] = field
             # Notice that we do this in the order of the list which is the
             # same order as they were in the array returned by the match
             fields = (field for field in ordered_fields if field is not None)
@@ -311,6 +346,8 @@ class RegionManager:
         self._active_field_count = 0
         self._next_field_id = _LEGATE_FIELD_ID_BASE
         self._imported = imported
+        # Sum of the sizes of the fields allocated in the region
+        self._field_bytes = 0
 
     @property
     def region(self) -> Region:
@@ -320,6 +357,15 @@ class RegionManager:
     def shape(self) -> Shape:
         return self._shape
 
+    @property
+    def nbytes(self) -> int:
+        # The extents of an unbound store's region may not be known yet,
+        # and we don't want to block on them, so such a region counts as
+        # empty
+        if not self._shape.fixed:
+            return 0
+        return self._shape.volume() * self._field_bytes
+
     def destroy(self, unordered: bool) -> None:
         # An explicit destruction has a benefit that we can sometimes perform
         # ordered destructions, whereas in a destructor we can only do
@@ -335,9 +381,10 @@ class RegionManager:
         self._active_field_count -= 1
         return self._active_field_count == 0
 
-    def increase_field_count(self) -> bool:
+    def increase_field_count(self, field_size: int) -> bool:
         fresh = self._alloc_field_count == 0
         self._alloc_field_count += 1
+        self._field_bytes += field_size
         revived = self.increase_active_field_count()
         return not fresh and revived
 
@@ -350,25 +397,105 @@ class RegionManager:
         self._next_field_id += 1
         return field_id
 
-    def allocate_field(self, field_size: Any) -> tuple[Region, int, bool]:
+    def allocate_field(self, field_size: int) -> tuple[Region, int, bool]:
         field_id = self._region.field_space.allocate_field(
             field_size, self.get_next_field_id()
         )
-        revived = self.increase_field_count()
+        revived = self.increase_field_count(field_size)
         return self._region, field_id, revived
 
+    def allocate_fields(
+        self, field_size: int, count: int
+    ) -> tuple[list[int], bool]:
+        """
+        Allocates as many of ``count`` fields as the region has space for
+
+        Returns
+        -------
+        tuple[list[int], bool]
+            The ids of the new fields, and whether the region was revived
+        """
+        count = min(count, LEGATE_MAX_FIELDS - self._alloc_field_count)
+        field_ids = []
+        any_revived = False
+        for _ in range(count):
+            _, field_id, revived = self.allocate_field(field_size)
+            field_ids.append(field_id)
+            any_revived = any_revived or revived
+        return field_ids, any_revived
+
+
+FreeField = tuple[Region, int, Union[Future, None]]
+
+
+# An ordered queue of free fields, indexed by region so that all fields of
+# a destroyed region can be dropped without scanning the whole queue
+class FreeFieldQueue:
+    def __init__(self) -> None:
+        self._detach_futures: OrderedDict[
+            tuple[Region, int], Union[Future, None]
+        ] = OrderedDict()
+        self._field_ids_by_region: dict[Region, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._detach_futures)
+
+    def append(self, field_info: FreeField) -> None:
+        region, field_id, detach_future = field_info
+        self._detach_futures[region, field_id] = detach_future
+        self._field_ids_by_region.setdefault(region, set()).add(field_id)
+
+    def _remove(self, region: Region, field_id: int) -> None:
+        field_ids = self._field_ids_by_region[region]
+        field_ids.remove(field_id)
+        if not field_ids:
+            del self._field_ids_by_region[region]
+
+    def popleft(self) -> FreeField:
+        (region, field_id), detach_future = self._detach_futures.popitem(
+            last=False
+        )
+        self._remove(region, field_id)
+        return region, field_id, detach_future
+
+    def pop_ready(self, max_checks: int) -> Optional[tuple[Region, int]]:
+        """
+        Pops the oldest free field that can be reused without waiting on
+        its detachment, checking at most ``max_checks`` fields
+        """
+        for key, future in islice(self._detach_futures.items(), max_checks):
+            if future is None or future.is_ready():
+                del self._detach_futures[key]
+                self._remove(*key)
+                return key
+        return None
+
+    def remove_region(self, region: Region) -> None:
+        for field_id in self._field_ids_by_region.pop(region, ()):
+            del self._detach_futures[region, field_id]
+
 
 def _try_reuse_field(
-    free_fields: Deque[tuple[Region, int, Union[Future, None]]]
+    runtime: Runtime,
+    free_fields: FreeFieldQueue,
 ) -> Optional[tuple[Region, int]]:
     if len(free_fields) == 0:
         return None
     field_info = free_fields.popleft()
     if field_info[2] is not None and not field_info[2].is_ready():
+        runtime.record_field_reuse_wait()
         field_info[2].wait()
     return field_info[0], field_info[1]
 
 
+@dataclass(frozen=True)
+class FieldReuseStats:
+    waits: int
+    fallbacks: int
+    # Bytes of the fallback fields that are still charged to the budget
+    fallback_bytes: int
+
+
 # This class manages the allocation and reuse of fields
 class FieldManager:
     def __init__(
@@ -381,29 +508,170 @@ class FieldManager:
         # This is a sanitized list of (region,field_id) pairs that is
         # guaranteed to be ordered across all the shards even with
         # control replication
-        self.free_fields: Deque[
-            tuple[Region, int, Union[Future, None]]
-        ] = deque()
+        self.free_fields = FreeFieldQueue()
+        # Fields allocated instead of blocking on a detachment, which are
+        # charged to the runtime's field reuse budget until they are reused
+        # or destroyed, and the number of charges for which no field has
+        # been allocated yet
+        self._fallback_fields: set[tuple[Region, int]] = set()
+        self._pending_fallbacks = 0
 
     def destroy(self) -> None:
-        self.free_fields = deque()
+        self.free_fields = FreeFieldQueue()
+        self._refund_fallbacks(len(self._fallback_fields))
+        self._fallback_fields.clear()
+
+    def _refund_fallbacks(self, count: int) -> None:
+        if count > 0:
+            self.runtime.refund_field_reuse_fallback(
+                count * self.shape.volume() * self.field_size
+            )
+
+    def _record_fallback(self, region: Region, field_id: int) -> None:
+        # Binds a pending charge to the field allocated for it
+        if self._pending_fallbacks > 0:
+            self._pending_fallbacks -= 1
+            self._fallback_fields.add((region, field_id))
 
     def try_reuse_field(self) -> Optional[tuple[Region, int]]:
-        return _try_reuse_field(self.free_fields)
+        if len(self.free_fields) == 0:
+            return None
+        # Inside a trace, fields must be picked in the same order in every
+        # replay of the trace. Without a budget for fallback fields, we
+        # block on the oldest field as waiting for any other field could
+        # take just as long.
+        if (
+            self.runtime.current_trace is not None
+            or self.runtime.field_reuse_budget == 0
+        ):
+            result = _try_reuse_field(self.runtime, self.free_fields)
+        else:
+            # Without control replication, the field we pick doesn't need
+            # to be the same across shards, so we prefer fields whose
+            # detachments are done, and rather allocate a new field than
+            # block on a detachment as long as the runtime's budget allows
+            result = self.free_fields.pop_ready(_MAX_READY_FIELD_CHECKS)
+            if result is None:
+                if (
+                    self.shape.fixed
+                    and self.runtime.charge_field_reuse_fallback(
+                        self.shape.volume() * self.field_size
+                    )
+                ):
+                    self._pending_fallbacks += 1
+                    return None
+                result = _try_reuse_field(self.runtime, self.free_fields)
+        self._forget_fallback(result)
+        return result
+
+    def _forget_fallback(self, field: Optional[tuple[Region, int]]) -> None:
+        # A fallback field that is reused is no longer extra
+        if field in self._fallback_fields:
+            self._fallback_fields.remove(field)
+            self._refund_fallbacks(1)
+
+    def lend_free_field(self) -> Optional[tuple[Region, int]]:
+        """
+        Pops the oldest free field, for the field pool to lend it to a
+        store of a smaller shape
+        """
+        result = _try_reuse_field(self.runtime, self.free_fields)
+        self._forget_fallback(result)
+        return result
 
-    def allocate_field(self) -> tuple[Region, int]:
+    def try_reuse_fields(self, count: int) -> list[tuple[Region, int]]:
+        fields: list[tuple[Region, int]] = []
+        while len(fields) < count:
+            if (field := self.try_reuse_field()) is None:
+                break
+            fields.append(field)
+        return fields
+
+    def _reactivate_region(self, region: Region) -> None:
+        region_manager = self.runtime.find_region_manager(region)
+        if region_manager.increase_active_field_count():
+            self.runtime.revive_manager(region_manager)
+
+    def allocate_field(self, borrow: bool = True) -> tuple[Region, int, Shape]:
+        """
+        Returns a field for a store of this manager's shape, which is a free
+        field of this manager, a free field borrowed from the field pool, or
+        a new field, in that order of preference
+
+        Parameters
+        ----------
+        borrow : bool
+            Whether the field can be borrowed from a larger region
+
+        Returns
+        -------
+        tuple[Region, int, Shape]
+            The region and the id of the field, and the shape of the region,
+            which is larger than this manager's shape if the field was
+            borrowed
+        """
         if (result := self.try_reuse_field()) is not None:
-            region_manager = self.runtime.find_region_manager(result[0])
-            if region_manager.increase_active_field_count():
-                self.runtime.revive_manager(region_manager)
-            return result
+            self._reactivate_region(result[0])
+            return result[0], result[1], self.shape
+        borrowed = (
+            self.runtime.field_pool.borrow_field(self.shape, self.field_size)
+            if borrow
+            else None
+        )
+        if borrowed is not None:
+            # Borrowing doesn't allocate memory, so nothing is charged
+            self._refund_fallbacks(self._pending_fallbacks)
+            self._pending_fallbacks = 0
+            self._reactivate_region(borrowed[0])
+            return borrowed
+        trace = self.runtime.current_trace
+        if trace is not None:
+            trace.record_field_allocation(self.shape, self.field_size)
         region_manager = self.runtime.find_or_create_region_manager(self.shape)
         region, field_id, revived = region_manager.allocate_field(
             self.field_size
         )
         if revived:
             self.runtime.revive_manager(region_manager)
-        return region, field_id
+        self._record_fallback(region, field_id)
+        return region, field_id, self.shape
+
+    def allocate_fields(self, count: int) -> list[tuple[Region, int]]:
+        """
+        Returns ``count`` fields for stores of this manager's shape, reusing
+        free fields first and allocating the rest region by region
+
+        Parameters
+        ----------
+        count : int
+            Number of fields to return
+
+        Returns
+        -------
+        list[tuple[Region, int]]
+            The region and the id of each field
+        """
+        fields = self.try_reuse_fields(count)
+        for region, _ in fields:
+            self._reactivate_region(region)
+        trace = self.runtime.current_trace
+        while len(fields) < count:
+            region_manager = self.runtime.find_or_create_region_manager(
+                self.shape
+            )
+            field_ids, revived = region_manager.allocate_fields(
+                self.field_size, count - len(fields)
+            )
+            if revived:
+                self.runtime.revive_manager(region_manager)
+            if trace is not None:
+                for _ in field_ids:
+                    trace.record_field_allocation(self.shape, self.field_size)
+            region = region_manager.region
+            for field_id in field_ids:
+                self._record_fallback(region, field_id)
+                fields.append((region, field_id))
+        return fields
 
     def free_field(
         self,
@@ -420,7 +688,12 @@ class FieldManager:
             )
 
     def remove_all_fields(self, region: Region) -> None:
-        self.free_fields = deque(f for f in self.free_fields if f[0] != region)
+        self.free_fields.remove_region(region)
+        destroyed = [
+            field for field in self._fallback_fields if field[0] is region
+        ]
+        self._fallback_fields.difference_update(destroyed)
+        self._refund_fallbacks(len(destroyed))
 
 
 class ConsensusMatchingFieldManager(FieldManager):
@@ -448,15 +721,15 @@ class ConsensusMatchingFieldManager(FieldManager):
             self._match_credit = self.runtime.max_field_reuse_frequency
             self._need_to_update_match_credit = True
 
-    def try_reuse_field(self) -> Optional[tuple[Region, int]]:
+    def _issue_field_match(self) -> None:
         if self._need_to_update_match_credit:
             self._update_match_credit()
-        self._field_match_manager.issue_field_match(self._match_credit)
-
-        # First, if we have a free field then we know everyone has one of those
-        if len(self.free_fields) > 0:
-            return _try_reuse_field(self.free_fields)
+        # Matches are not issued in traces, as whether they happen depends
+        # on the fields freed before the trace, which can vary across runs
+        if self.runtime.current_trace is None:
+            self._field_match_manager.issue_field_match(self._match_credit)
 
+    def _update_free_fields(self) -> None:
         self._field_match_manager.update_free_fields()
 
         # If any free fields were discovered on all shards, push their
@@ -465,7 +738,31 @@ class ConsensusMatchingFieldManager(FieldManager):
         if len(self.free_fields) > 0:
             self.runtime._progress_unordered_operations()
 
-        return _try_reuse_field(self.free_fields)
+    def try_reuse_field(self) -> Optional[tuple[Region, int]]:
+        self._issue_field_match()
+
+        # First, if we have a free field then we know everyone has one of those
+        if len(self.free_fields) > 0:
+            return _try_reuse_field(self.runtime, self.free_fields)
+
+        self._update_free_fields()
+
+        return _try_reuse_field(self.runtime, self.free_fields)
+
+    def try_reuse_fields(self, count: int) -> list[tuple[Region, int]]:
+        # A batch of fields is charged to the match credit only once
+        self._issue_field_match()
+
+        if len(self.free_fields) < count:
+            self._update_free_fields()
+
+        fields: list[tuple[Region, int]] = []
+        while len(fields) < count:
+            field = _try_reuse_field(self.runtime, self.free_fields)
+            if field is None:
+                break
+            fields.append(field)
+        return fields
 
     def free_field(
         self,
@@ -484,6 +781,117 @@ class ConsensusMatchingFieldManager(FieldManager):
             )
 
 
+@dataclass(frozen=True)
+class FieldPoolStats:
+    hits: int
+    misses: int
+    borrowed_fields: int
+    requested_bytes: int
+    backing_bytes: int
+
+    @property
+    def fragmentation(self) -> float:
+        """
+        Fraction of the bytes of the borrowed fields that are not used by
+        the stores borrowing them
+        """
+        if self.backing_bytes == 0:
+            return 0.0
+        return 1.0 - self.requested_bytes / self.backing_bytes
+
+
+# This class lets stores borrow free fields of larger regions, so that
+# workloads with slowly varying shapes don't keep creating new regions.
+# A borrowed field is used through a subregion of the store's shape,
+# anchored at the origin of the larger region.
+class FieldPool:
+    def __init__(self, slack: int) -> None:
+        # Maximum percentage by which a borrowed field can be larger than
+        # the store using it. A slack of 0 disables the pool.
+        self._slack = max(slack, 0)
+        # Field managers of fixed shapes, bucketed by their field sizes,
+        # numbers of dimensions, and byte size classes
+        self._managers: dict[tuple[int, int, int], List[FieldManager]] = {}
+        # Requested and backing bytes of the borrowed fields still in use
+        self._borrowed: dict[tuple[Region, int], tuple[int, int]] = {}
+        self._requested_bytes = 0
+        self._backing_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._slack > 0
+
+    @property
+    def stats(self) -> FieldPoolStats:
+        return FieldPoolStats(
+            self._hits,
+            self._misses,
+            len(self._borrowed),
+            self._requested_bytes,
+            self._backing_bytes,
+        )
+
+    @staticmethod
+    def _size_class(nbytes: int) -> int:
+        return nbytes.bit_length()
+
+    def register_manager(self, manager: FieldManager) -> None:
+        if not (self.enabled and manager.shape.fixed):
+            return
+        shape = manager.shape
+        nbytes = shape.volume() * manager.field_size
+        key = (manager.field_size, shape.ndim, self._size_class(nbytes))
+        self._managers.setdefault(key, []).append(manager)
+
+    def borrow_field(
+        self, shape: Shape, field_size: int
+    ) -> Optional[tuple[Region, int, Shape]]:
+        if not (self.enabled and shape.fixed):
+            return None
+        extents = shape.extents
+        nbytes = shape.volume() * field_size
+        max_bytes = nbytes * (100 + self._slack) // 100
+        # Smaller size classes are searched first to keep the waste low.
+        # The search only looks at the ordered lists of free fields, so it
+        # makes the same decision on all shards under control replication.
+        for size_class in range(
+            self._size_class(nbytes), self._size_class(max_bytes) + 1
+        ):
+            key = (field_size, shape.ndim, size_class)
+            for donor in self._managers.get(key, ()):
+                if len(donor.free_fields) == 0 or donor.shape == shape:
+                    continue
+                backing_bytes = donor.shape.volume() * field_size
+                if backing_bytes > max_bytes or any(
+                    ext > donor_ext
+                    for ext, donor_ext in zip(extents, donor.shape.extents)
+                ):
+                    continue
+                result = donor.lend_free_field()
+                assert result is not None
+                region, field_id = result
+                self._borrowed[region, field_id] = (nbytes, backing_bytes)
+                self._requested_bytes += nbytes
+                self._backing_bytes += backing_bytes
+                self._hits += 1
+                return region, field_id, donor.shape
+        self._misses += 1
+        return None
+
+    def release_field(self, region: Region, field_id: int) -> None:
+        sizes = self._borrowed.pop((region, field_id), None)
+        if sizes is None:
+            return
+        self._requested_bytes -= sizes[0]
+        self._backing_bytes -= sizes[1]
+
+    def destroy(self) -> None:
+        self._managers = {}
+        self._borrowed = {}
+
+
 class Attachment:
     def __init__(
         self, ptr: int, extent: int, shareable: bool, region_field: RegionField
@@ -514,6 +922,10 @@ class AttachmentManager:
     def __init__(self, runtime: Runtime) -> None:
         self._runtime = runtime
         self._attachments: dict[tuple[int, int], Attachment] = dict()
+        # Sorted base pointers of non-empty attachments, which never
+        # overlap, and the attachments indexed by them
+        self._attachment_ptrs: list[int] = []
+        self._attachments_by_ptr: dict[int, Attachment] = dict()
         self._next_detachment_key = 0
         self._registered_detachments: dict[
             int, Union[Detach, IndexDetach]
@@ -521,7 +933,12 @@ class AttachmentManager:
         self._deferred_detachments: List[
             tuple[Attachable, Union[Detach, IndexDetach], Union[Field, None]]
         ] = list()
-        self._pending_detachments: dict[Future, Attachable] = dict()
+        # Pending detachments are kept in issue order, which is roughly the
+        # order in which they complete, so that only the oldest few need to
+        # be checked after each dispatch
+        self._pending_detachments: Deque[tuple[Future, Attachable]] = deque()
+        self._prune_limit = settings.detachment_prune_limit()
+        self._full_prune_threshold = self._prune_limit
         self._destroyed = False
 
     def destroy(self) -> None:
@@ -536,11 +953,13 @@ class AttachmentManager:
         # so that we don't lose the references and make the GC unhappy
         gc.collect()
         while self._pending_detachments:
-            self.prune_detachments()
+            self.prune_detachments(full=True)
             gc.collect()
 
         # Clean up our attachments so that they can be collected
         self._attachments = dict()
+        self._attachment_ptrs = []
+        self._attachments_by_ptr = dict()
 
     @staticmethod
     def attachment_key(buf: memoryview) -> tuple[int, int]:
@@ -551,6 +970,10 @@ class AttachmentManager:
         base_ptr = int(ptr)  # type: ignore[call-overload]
         return (base_ptr, buf.nbytes)
 
+    @property
+    def num_pending_detachments(self) -> int:
+        return len(self._pending_detachments)
+
     def has_attachment(self, buf: memoryview) -> bool:
         key = self.attachment_key(buf)
         attachment = self._attachments.get(key, None)
@@ -567,10 +990,40 @@ class AttachmentManager:
         # If the region field is already collected, we don't need to keep
         # track of it for de-duplication.
         if rf is None:
-            del self._attachments[key]
+            self._drop_attachment(key)
             return None
         return rf if attachment.shareable else None
 
+    def _drop_attachment(self, key: tuple[int, int]) -> None:
+        attachment = self._attachments.pop(key)
+        if attachment.extent > 0:
+            idx = bisect_right(self._attachment_ptrs, attachment.ptr) - 1
+            assert self._attachment_ptrs[idx] == attachment.ptr
+            del self._attachment_ptrs[idx]
+            del self._attachments_by_ptr[attachment.ptr]
+
+    def _find_overlapping_attachment(
+        self, attachment: Attachment
+    ) -> Optional[Attachment]:
+        # Empty buffers don't overlap with anything
+        if attachment.extent == 0:
+            return None
+        ptrs = self._attachment_ptrs
+        # As the indexed attachments are disjoint, the one with the largest
+        # base pointer not past the end of the new attachment is the only
+        # candidate, unless its region field is already collected, in which
+        # case we drop it and look at the previous one
+        idx = bisect_right(ptrs, attachment.end)
+        while idx > 0:
+            other = self._attachments_by_ptr[ptrs[idx - 1]]
+            if other.end < attachment.ptr:
+                return None
+            if other.region_field is not None:
+                return other
+            self._drop_attachment((other.ptr, other.extent))
+            idx -= 1
+        return None
+
     def _add_attachment(
         self, buf: memoryview, shareable: bool, region_field: RegionField
     ) -> None:
@@ -583,14 +1036,14 @@ class AttachmentManager:
         # If the region field is already collected, we don't need to keep
         # track of it for de-duplication.
         if attachment is not None:
-            del self._attachments[key]
+            self._drop_attachment(key)
         attachment = Attachment(*key, shareable, region_field)
-        for other in self._attachments.values():
-            if other.overlaps(attachment):
-                raise RuntimeError(
-                    "Aliased attachments not supported by Legate"
-                )
+        if self._find_overlapping_attachment(attachment) is not None:
+            raise RuntimeError("Aliased attachments not supported by Legate")
         self._attachments[key] = attachment
+        if attachment.extent > 0:
+            insort(self._attachment_ptrs, attachment.ptr)
+            self._attachments_by_ptr[attachment.ptr] = attachment
 
     def attach_external_allocation(
         self, alloc: Attachable, region_field: RegionField
@@ -609,7 +1062,7 @@ class AttachmentManager:
         key = self.attachment_key(buf)
         if key not in self._attachments:
             raise RuntimeError("Unable to find attachment to remove")
-        del self._attachments[key]
+        self._drop_attachment(key)
 
     def _remove_allocation(self, alloc: Attachable) -> None:
         if isinstance(alloc, memoryview):
@@ -643,7 +1096,7 @@ class AttachmentManager:
         # If the future is already ready, then no need to track it
         if future.is_ready():
             return None
-        self._pending_detachments[future] = alloc
+        self._pending_detachments.append((future, alloc))
         return future
 
     def register_detachment(self, detach: Union[Detach, IndexDetach]) -> int:
@@ -658,6 +1111,8 @@ class AttachmentManager:
         return detach
 
     def perform_detachments(self) -> None:
+        if not self._deferred_detachments:
+            return
         detachments = self._deferred_detachments
         self._deferred_detachments = list()
         for alloc, detach, field in detachments:
@@ -667,68 +1122,137 @@ class AttachmentManager:
             if field is not None and detach_future is not None:
                 field.add_detach_future(detach_future)
 
-    def prune_detachments(self) -> None:
-        to_remove = []
-        for future in self._pending_detachments.keys():
-            if future.is_ready():
-                to_remove.append(future)
-        for future in to_remove:
-            del self._pending_detachments[future]
+    def prune_detachments(self, full: bool = False) -> None:
+        """
+        Drops references to the allocations of finished detachments
+
+        Parameters
+        ----------
+        full : bool
+            If ``True``, checks all pending detachments. Otherwise, checks
+            only the oldest ones up to the prune limit, stopping at the
+            first one still in flight, and falls back to a full sweep when
+            the number of pending detachments has doubled since the last
+            sweep.
+        """
+        pending = self._pending_detachments
+        if full or len(pending) > self._full_prune_threshold:
+            self._pending_detachments = deque(
+                entry for entry in pending if not entry[0].is_ready()
+            )
+            self._full_prune_threshold = max(
+                2 * len(self._pending_detachments), self._prune_limit
+            )
+            return
+        for _ in range(self._prune_limit):
+            if not (pending and pending[0][0].is_ready()):
+                break
+            pending.popleft()
 
 
 class PartitionManager:
     def __init__(self, runtime: Runtime) -> None:
         self._runtime = runtime
-        self._min_shard_volume = runtime.core_context.get_tunable(
-            runtime.core_library.LEGATE_CORE_TUNABLE_MIN_SHARD_VOLUME,
-            ty.int64,
+        self._min_shard_volume = int(
+            runtime.core_context.get_tunable(
+                runtime.core_library.LEGATE_CORE_TUNABLE_MIN_SHARD_VOLUME,
+                ty.int64,
+            )
         )
+        # Minimum shard volumes for machines restricted to a single kind of
+        # processors
+        self._min_shard_volumes = {
+            ProcessorKind.GPU: settings.min_gpu_chunk(),
+            ProcessorKind.OMP: settings.min_omp_chunk(),
+            ProcessorKind.CPU: settings.min_cpu_chunk(),
+        }
 
-        self._launch_spaces: dict[
-            tuple[int, tuple[int, ...]], Optional[tuple[int, ...]]
-        ] = {}
-        self._piece_factors: dict[int, list[int]] = {}
+        self._planner: LaunchShapePlanner = (
+            UniformLaunchShapePlanner()
+            if settings.launch_shape_planner() == "uniform"
+            else CostModelLaunchShapePlanner()
+        )
+        self._launch_spaces: LRUCache[
+            tuple[int, tuple[int, ...], int, int], Optional[tuple[int, ...]]
+        ] = LRUCache(settings.launch_space_cache_size())
 
+        # Index partitions are not bounded, as dropping an entry doesn't
+        # destroy the Legion handle, which lives as long as its index space,
+        # and the next lookup would create a duplicate partition
         self._index_partitions: dict[
             tuple[IndexSpace, PartitionBase], IndexPartition
         ] = {}
         # Maps storage id-partition pairs to Legion partitions
-        self._legion_partitions: dict[
+        self._legion_partitions: LRUCache[
             tuple[int, PartitionBase], Union[None, LegionPartition]
+        ] = LRUCache(
+            settings.partition_cache_size(),
+            on_evict=self._forget_legion_partition,
+        )
+        # Keys of the Legion partitions of each storage, which are dropped
+        # when the storage is destroyed
+        self._legion_partition_keys: dict[
+            int, set[tuple[int, PartitionBase]]
         ] = {}
-        self._storage_key_partitions: dict[tuple[int, int], PartitionBase] = {}
-        self._store_key_partitions: dict[tuple[int, int], PartitionBase] = {}
+        # Key partitions are indexed by store and storage ids first, then
+        # by the number of pieces, so that all key partitions of a store or
+        # a storage can be dropped at once
+        key_partition_cache_size = settings.key_partition_cache_size()
+        self._storage_key_partitions: LRUCache[
+            int, dict[int, PartitionBase]
+        ] = LRUCache(key_partition_cache_size)
+        self._store_key_partitions: LRUCache[
+            int, dict[int, PartitionBase]
+        ] = LRUCache(key_partition_cache_size)
+        # Created on first use, as the solver module imports the runtime
+        self._strategy_cache: Optional[StrategyCache] = None
 
-    def get_current_num_pieces(self) -> int:
-        return len(self._runtime.machine)
+    @property
+    def strategy_cache(self) -> StrategyCache:
+        if self._strategy_cache is None:
+            from .solver import StrategyCache
 
-    def get_piece_factors(self) -> list[int]:
-        num_pieces = self.get_current_num_pieces()
-        if num_pieces in self._piece_factors:
-            return self._piece_factors[num_pieces]
+            self._strategy_cache = StrategyCache(
+                settings.strategy_cache_size()
+            )
+        return self._strategy_cache
 
-        factors: list[int] = []
+    def destroy(self) -> None:
+        # Cached partitions and strategies can refer to Futures and
+        # FutureMaps, so we drop them all here
+        self._launch_spaces.clear()
+        self._index_partitions.clear()
+        self._legion_partitions.clear()
+        self._legion_partition_keys.clear()
+        self._storage_key_partitions.clear()
+        self._store_key_partitions.clear()
+        if self._strategy_cache is not None:
+            self._strategy_cache.clear()
+            self._strategy_cache = None
 
-        remaining = num_pieces
+    def get_current_num_pieces(self) -> int:
+        return len(self._runtime.machine)
 
-        def record_factors(remaining: int, val: int) -> int:
-            while remaining % val == 0:
-                factors.append(val)
-                remaining = remaining // val
-            return remaining
+    def get_piece_factors(self) -> list[int]:
+        return list(prime_factors(self.get_current_num_pieces()))
 
-        for factor in (2, 3, 5, 7, 11):
-            remaining = record_factors(remaining, factor)
+    def get_min_shard_volume(self) -> int:
+        machine = self._runtime.machine
+        if len(machine.kinds) == 1:
+            return self._min_shard_volumes[machine.preferred_kind]
+        return self._min_shard_volume
 
-        if remaining > 1:
-            raise ValueError(
-                "Legate currently doesn't support processor "
-                "counts with large prime factors greater than 11"
-            )
+    def set_launch_shape_planner(self, planner: LaunchShapePlanner) -> None:
+        """
+        Replaces the planner that computes launch shapes for key partitions
 
-        factors = list(reversed(factors))
-        self._piece_factors[num_pieces] = factors
-        return factors
+        Parameters
+        ----------
+        planner : LaunchShapePlanner
+            A new launch shape planner
+        """
+        self._planner = planner
+        self._launch_spaces.clear()
 
     def compute_launch_shape(
         self, store: Store, restrictions: tuple[Restriction, ...]
@@ -745,7 +1269,9 @@ class PartitionManager:
         if prod(to_partition) == 0:
             return None
 
-        launch_shape = self._compute_launch_shape(to_partition)
+        launch_shape = self._compute_launch_shape(
+            to_partition, store.type.size
+        )
         if launch_shape is None:
             return None
 
@@ -761,154 +1287,37 @@ class PartitionManager:
         return Shape(result)
 
     def _compute_launch_shape(
-        self, shape: tuple[int, ...]
+        self, shape: tuple[int, ...], itemsize: int
     ) -> Optional[tuple[int, ...]]:
         num_pieces = self.get_current_num_pieces()
-        key = (num_pieces, shape)
         # Easy case if we only have one piece: no parallel launch space
         if num_pieces == 1:
             return None
         # If there is only one point or no points then we never do a parallel
         # launch
-        # If we only have one point then we never do parallel launches
         elif all(ext <= 1 for ext in shape):
             return None
+        min_shard_volume = self.get_min_shard_volume()
+        key = (num_pieces, shape, itemsize, min_shard_volume)
         # Check to see if we already did the math
-        elif (match := self._launch_spaces.get(key)) is not None:
-            return match
+        if key in self._launch_spaces:
+            return self._launch_spaces.get(key)
         # Prune out any dimensions that are 1
-        temp_shape: tuple[int, ...] = ()
-        temp_dims: tuple[int, ...] = ()
-        volume = 1
-        for dim in range(len(shape)):
-            assert shape[dim] > 0
-            if shape[dim] == 1:
-                continue
-            temp_shape = temp_shape + (shape[dim],)
-            temp_dims = temp_dims + (dim,)
-            volume *= shape[dim]
-        # Figure out how many shards we can make with this array
-        max_pieces = (
-            volume + self._min_shard_volume - 1
-        ) // self._min_shard_volume
-        assert max_pieces > 0
-        # If we can only make one piece return that now
-        if max_pieces == 1:
-            self._launch_spaces[key] = None
-            return None
-        else:
-            # TODO: a better heuristic here For now if we can make at least two
-            # pieces then we will make N pieces
-            max_pieces = num_pieces
-        # Otherwise we need to compute it ourselves
-        # First compute the N-th root of the number of pieces
-        dims = len(temp_shape)
-        temp_result: tuple[int, ...] = ()
-        if dims == 0:
+        temp_dims = tuple(dim for dim in range(len(shape)) if shape[dim] > 1)
+        temp_result = self._planner.plan(
+            tuple(shape[dim] for dim in temp_dims),
+            num_pieces,
+            min_shard_volume,
+            itemsize,
+        )
+        result: Optional[tuple[int, ...]] = None
+        if temp_result is not None:
+            assert len(temp_result) == len(temp_dims)
             # Project back onto the original number of dimensions
-            result: tuple[int, ...] = ()
-            for dim in range(len(shape)):
-                result = result + (1,)
-            return result
-        elif dims == 1:
-            # Easy case for one dimensional things
-            temp_result = (min(temp_shape[0], max_pieces),)
-        elif dims == 2:
-            if volume < max_pieces:
-                # TBD: Once the max_pieces heuristic is fixed, this should
-                # never happen
-                temp_result = temp_shape
-            else:
-                # Two dimensional so we can use square root to try and generate
-                # as square a pieces as possible since most often we will be
-                # doing matrix operations with these
-                nx = temp_shape[0]
-                ny = temp_shape[1]
-                swap = nx > ny
-                if swap:
-                    temp = nx
-                    nx = ny
-                    ny = temp
-                n = math.sqrt(float(max_pieces * nx) / float(ny))
-                # Need to constraint n to be an integer with numpcs % n == 0
-                # try rounding n both up and down
-                n1 = int(math.floor(n + 1e-12))
-                n1 = max(n1, 1)
-                while max_pieces % n1 != 0:
-                    n1 -= 1
-                n2 = int(math.ceil(n - 1e-12))
-                while max_pieces % n2 != 0:
-                    n2 += 1
-                # pick whichever of n1 and n2 gives blocks closest to square
-                # i.e. gives the shortest long side
-                side1 = max(nx // n1, ny // (max_pieces // n1))
-                side2 = max(nx // n2, ny // (max_pieces // n2))
-                px = n1 if side1 <= side2 else n2
-                py = max_pieces // px
-                # we need to trim launch space if it is larger than the
-                # original shape in one of the dimensions (can happen in
-                # testing)
-                if swap:
-                    temp_result = (
-                        min(py, temp_shape[0]),
-                        min(px, temp_shape[1]),
-                    )
-                else:
-                    temp_result = (
-                        min(px, temp_shape[0]),
-                        min(py, temp_shape[1]),
-                    )
-        else:
-            # For higher dimensions we care less about "square"-ness
-            # and more about evenly dividing things, compute the prime
-            # factors for our number of pieces and then round-robin
-            # them onto the shape, with the goal being to keep the
-            # last dimension >= 32 for good memory performance on the GPU
-            local_result: List[int] = [1] * dims
-            factor_prod = 1
-            piece_factors = self.get_piece_factors()
-            for factor in piece_factors:
-                # Avoid exceeding the maximum number of pieces
-                if factor * factor_prod > max_pieces:
-                    break
-                factor_prod *= factor
-                remaining = tuple(
-                    map(
-                        lambda s, r: (s + r - 1) // r, temp_shape, local_result
-                    )
-                )
-                big_dim = remaining.index(max(remaining))
-                if big_dim < len(temp_dims) - 1:
-                    # Not the last dimension, so do it
-                    local_result[big_dim] *= factor
-                else:
-                    # Last dim so see if it still bigger than 32
-                    if (
-                        len(remaining) == 1
-                        or remaining[big_dim] // factor >= 32
-                    ):
-                        # go ahead and do it
-                        local_result[big_dim] *= factor
-                    else:
-                        # Won't be see if we can do it with one of the other
-                        # dimensions
-                        big_dim = remaining.index(
-                            max(remaining[0 : len(remaining) - 1])
-                        )
-                        if remaining[big_dim] // factor > 0:
-                            local_result[big_dim] *= factor
-                        else:
-                            # Fine just do it on the last dimension
-                            local_result[len(temp_dims) - 1] *= factor
-            temp_result = tuple(local_result)
-        # Project back onto the original number of dimensions
-        assert len(temp_result) == dims
-        result = ()
-        for dim in range(len(shape)):
-            if dim in temp_dims:
-                result = result + (temp_result[temp_dims.index(dim)],)
-            else:
-                result = result + (1,)
+            result = tuple(
+                temp_result[temp_dims.index(dim)] if dim in temp_dims else 1
+                for dim in range(len(shape))
+            )
         # Save the result for later
         self._launch_spaces[key] = result
         return result
@@ -943,49 +1352,118 @@ class PartitionManager:
         assert key not in self._index_partitions
         self._index_partitions[key] = index_partition
 
-    def find_store_key_partition(
-        self, store_id: int, restrictions: tuple[Restriction, ...]
+    @staticmethod
+    def _find_key_partition(
+        cache: LRUCache[int, dict[int, PartitionBase]],
+        num_pieces: int,
+        uid: int,
+        restrictions: tuple[Restriction, ...],
     ) -> Union[None, PartitionBase]:
-        key = (self.get_current_num_pieces(), store_id)
-        partition = self._store_key_partitions.get(key)
+        partitions = cache.get(uid)
+        if partitions is None:
+            return None
+        partition = partitions.get(num_pieces)
         if partition is not None and not partition.satisfies_restriction(
             restrictions
         ):
             partition = None
         return partition
 
+    @staticmethod
+    def _record_key_partition(
+        cache: LRUCache[int, dict[int, PartitionBase]],
+        num_pieces: int,
+        uid: int,
+        key_partition: PartitionBase,
+    ) -> None:
+        partitions = cache.get(uid)
+        if partitions is None:
+            cache[uid] = {num_pieces: key_partition}
+        else:
+            partitions[num_pieces] = key_partition
+
+    @staticmethod
+    def _reset_key_partition(
+        cache: LRUCache[int, dict[int, PartitionBase]],
+        num_pieces: int,
+        uid: int,
+    ) -> None:
+        partitions = cache.get(uid)
+        if partitions is None:
+            return
+        partitions.pop(num_pieces, None)
+        if len(partitions) == 0:
+            cache.pop(uid)
+
+    def find_store_key_partition(
+        self, store_id: int, restrictions: tuple[Restriction, ...]
+    ) -> Union[None, PartitionBase]:
+        return self._find_key_partition(
+            self._store_key_partitions,
+            self.get_current_num_pieces(),
+            store_id,
+            restrictions,
+        )
+
+    def get_store_key_partition(
+        self, store_id: int
+    ) -> Union[None, PartitionBase]:
+        partitions = self._store_key_partitions.get(store_id)
+        if partitions is None:
+            return None
+        return partitions.get(self.get_current_num_pieces())
+
     def record_store_key_partition(
         self, store_id: int, key_partition: PartitionBase
     ) -> None:
-        key = (self.get_current_num_pieces(), store_id)
-        self._store_key_partitions[key] = key_partition
+        self._record_key_partition(
+            self._store_key_partitions,
+            self.get_current_num_pieces(),
+            store_id,
+            key_partition,
+        )
 
     def reset_store_key_partition(self, store_id: int) -> None:
-        key = (self.get_current_num_pieces(), store_id)
-        if key in self._store_key_partitions:
-            del self._store_key_partitions[key]
+        self._reset_key_partition(
+            self._store_key_partitions,
+            self.get_current_num_pieces(),
+            store_id,
+        )
 
     def find_storage_key_partition(
         self, storage_id: int, restrictions: tuple[Restriction, ...]
     ) -> Union[None, PartitionBase]:
-        key = (self.get_current_num_pieces(), storage_id)
-        partition = self._storage_key_partitions.get(key)
-        if partition is not None and not partition.satisfies_restriction(
-            restrictions
-        ):
-            partition = None
-        return partition
+        return self._find_key_partition(
+            self._storage_key_partitions,
+            self.get_current_num_pieces(),
+            storage_id,
+            restrictions,
+        )
+
+    def get_storage_key_partition(
+        self, storage_id: int
+    ) -> Union[None, PartitionBase]:
+        partitions = self._storage_key_partitions.get(storage_id)
+        if partitions is None:
+            return None
+        return partitions.get(self.get_current_num_pieces())
 
     def record_storage_key_partition(
         self, storage_id: int, key_partition: PartitionBase
     ) -> None:
-        key = (self.get_current_num_pieces(), storage_id)
-        self._storage_key_partitions[key] = key_partition
+        self._record_key_partition(
+            self._storage_key_partitions,
+            self.get_current_num_pieces(),
+            storage_id,
+            key_partition,
+        )
 
     def reset_storage_key_partition(self, storage_id: int) -> None:
-        key = (self.get_current_num_pieces(), storage_id)
-        if key in self._storage_key_partitions:
-            del self._storage_key_partitions[key]
+        self._reset_key_partition(
+            self._storage_key_partitions,
+            self.get_current_num_pieces(),
+            storage_id,
+        )
 
     def find_legion_partition(
         self, storage_id: int, functor: PartitionBase
@@ -1002,8 +1480,52 @@ class PartitionManager:
         legion_partition: Optional[LegionPartition],
     ) -> None:
         key = (storage_id, functor)
+        self._legion_partition_keys.setdefault(storage_id, set()).add(key)
         self._legion_partitions[key] = legion_partition
 
+    def _forget_legion_partition(
+        self,
+        key: tuple[int, PartitionBase],
+        legion_partition: Optional[LegionPartition],
+    ) -> None:
+        storage_id = key[0]
+        keys = self._legion_partition_keys.get(storage_id)
+        if keys is None:
+            return
+        keys.discard(key)
+        if len(keys) == 0:
+            del self._legion_partition_keys[storage_id]
+
+    def reclaim_store(self, store_id: int) -> None:
+        """
+        Drops all cached entries of a destroyed store
+        """
+        self._store_key_partitions.pop(store_id)
+
+    def reclaim_storage(self, storage_id: int) -> None:
+        """
+        Drops all cached entries of a destroyed storage
+        """
+        self._storage_key_partitions.pop(storage_id)
+        for key in self._legion_partition_keys.pop(storage_id, ()):
+            self._legion_partitions.pop(key)
+
+    def get_cache_stats(self) -> dict[str, CacheStats]:
+        """
+        Returns the occupancy and eviction statistics of the caches
+
+        Returns
+        -------
+        dict[str, CacheStats]
+            Statistics of each cache, keyed by the cache name
+        """
+        return {
+            "launch_spaces": self._launch_spaces.stats,
+            "legion_partitions": self._legion_partitions.stats,
+            "store_key_partitions": self._store_key_partitions.stats,
+            "storage_key_partitions": self._storage_key_partitions.stats,
+        }
+
 
 class CommunicatorManager:
     def __init__(self, runtime: Runtime) -> None:
@@ -1032,6 +1554,173 @@ class CommunicatorManager:
         return self._cpu is not None
 
 
+class SchedulingWindow:
+    # Exponential moving average weight for the submit interval
+    _SMOOTHING = 0.1
+    # Operations submitted faster than this (in seconds) are considered
+    # to be in a tight loop where scheduling overhead dominates
+    _FAST_SUBMIT_INTERVAL = 1e-3
+
+    def __init__(
+        self, initial_size: int, max_size: int, adaptive: bool
+    ) -> None:
+        self._initial_size = max(initial_size, 1)
+        self._max_size = max(max_size, self._initial_size)
+        self._adaptive = adaptive
+        self._size = self._initial_size
+        self._last_submit: Optional[float] = None
+        self._avg_interval: Optional[float] = None
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def adaptive(self) -> bool:
+        return self._adaptive
+
+    def record_submit(self) -> None:
+        if not self._adaptive:
+            return
+        now = time.perf_counter()
+        if self._last_submit is not None:
+            interval = now - self._last_submit
+            if self._avg_interval is None:
+                self._avg_interval = interval
+            else:
+                self._avg_interval += self._SMOOTHING * (
+                    interval - self._avg_interval
+                )
+        self._last_submit = now
+
+    def grow(self, num_pending_exceptions: int) -> None:
+        """
+        Called when the window filled up. The window doubles if operations
+        are being submitted at a high rate and there are no pending
+        exceptions, as growing the window would only delay their reporting.
+        """
+        if not self._adaptive or num_pending_exceptions > 0:
+            return
+        if (
+            self._avg_interval is not None
+            and self._avg_interval < self._FAST_SUBMIT_INTERVAL
+        ):
+            self._size = min(self._size * 2, self._max_size)
+
+    def shrink(self, num_outstanding_ops: int) -> None:
+        """
+        Called when the window is flushed by a blocking point. The window
+        halves if the program synchronizes before filling half of it, so
+        operations don't sit in the window any longer than they need to.
+        """
+        if not self._adaptive:
+            return
+        if num_outstanding_ops < self._size // 2:
+            self._size = max(self._size // 2, self._initial_size)
+        # The submit interval across a blocking point says nothing about
+        # the scheduling overhead, so we don't take it into account
+        self._last_submit = None
+
+
+class Trace:
+    """
+    Keeps the sequence of operations launched in the first run of a trace,
+    so that later runs that diverge from it, and thus can't be replayed by
+    Legion, are reported
+    """
+
+    def __init__(self, trace_id: int) -> None:
+        self._trace_id = trace_id
+        self._recorded: Optional[list[Hashable]] = None
+        self._current: list[Hashable] = []
+        self._divergence: Optional[str] = None
+
+    @property
+    def trace_id(self) -> int:
+        return self._trace_id
+
+    @property
+    def recording(self) -> bool:
+        return self._recorded is None
+
+    def begin(self) -> None:
+        self._current = []
+        self._divergence = None
+
+    def _diverge(self, reason: str) -> None:
+        # Only the first divergence is reported, as the later ones are
+        # likely caused by it
+        if self._divergence is None:
+            self._divergence = reason
+
+    @staticmethod
+    def _signature(op: Operation, strategy: Strategy) -> Hashable:
+        stores: list[Hashable] = []
+        for store in op.get_all_stores():
+            if store.unbound or store.kind is Future or not store.has_storage:
+                stores.append(None)
+                continue
+            region_field = store.storage
+            if TYPE_CHECKING:
+                assert isinstance(region_field, RegionField)
+            stores.append(
+                (
+                    region_field.region.handle.tree_id,
+                    region_field.field.field_id,
+                )
+            )
+        partitions = tuple(
+            None if unknown.store.unbound else strategy.get_partition(unknown)
+            for unknown in op.all_unknowns
+        )
+        return (
+            type(op),
+            op.context.library.get_name(),
+            getattr(op, "_task_id", None),
+            strategy.launch_domain,
+            tuple(stores),
+            partitions,
+        )
+
+    def record_operation(self, op: Operation, strategy: Strategy) -> None:
+        idx = len(self._current)
+        signature = self._signature(op, strategy)
+        self._current.append(signature)
+        if self._recorded is None:
+            return
+        if idx >= len(self._recorded):
+            self._diverge(f"operation #{idx} was not in the first run")
+        elif self._recorded[idx] != signature:
+            self._diverge(
+                f"operation #{idx} has different stores or partitions "
+                f"than in the first run: {self._recorded[idx]} != {signature}"
+            )
+
+    def record_field_allocation(self, shape: Shape, field_size: int) -> None:
+        if self._recorded is None:
+            return
+        self._diverge(
+            f"a new field of size {field_size} was allocated for shape "
+            f"{shape}, while the first run reused all its fields"
+        )
+
+    def end(self) -> None:
+        if self._recorded is None:
+            self._recorded = self._current
+        elif len(self._current) < len(self._recorded):
+            self._diverge(
+                f"only {len(self._current)} of {len(self._recorded)} "
+                "operations in the first run were launched"
+            )
+        self._current = []
+        if self._divergence is not None:
+            raise RuntimeError(
+                f"Trace {self._trace_id} diverged from its first run: "
+                f"{self._divergence}. Operations in a trace must use the same "
+                "stores with the same partitions in every run."
+            )
+
+
 class Runtime:
     _legion_runtime: Union[legion.legion_runtime_t, None]
     _legion_context: Union[legion.legion_context_t, None]
@@ -1075,10 +1764,19 @@ class Runtime:
         # to be dispatched. This list allows cross library introspection for
         # Legate operations.
         self._outstanding_ops: List[Operation] = []
-        self._window_size = self._core_context.get_tunable(
-            legion.LEGATE_CORE_TUNABLE_WINDOW_SIZE,
-            ty.uint32,
+        self._window = SchedulingWindow(
+            int(
+                self._core_context.get_tunable(
+                    legion.LEGATE_CORE_TUNABLE_WINDOW_SIZE,
+                    ty.uint32,
+                )
+            ),
+            settings.max_window_size(),
+            settings.adaptive_window(),
         )
+        self._batch_partitioning = settings.batch_partitioning()
+        self._traces: dict[int, Trace] = {}
+        self._current_trace: Optional[Trace] = None
 
         self._next_store_id = 0
         self._next_storage_id = 0
@@ -1127,14 +1825,32 @@ class Runtime:
         self._partition_manager = PartitionManager(self)
         self._comm_manager = CommunicatorManager(self)
         self._field_match_manager = FieldMatchManager(self)
+        # Argument buffers are reused across launches. The pool is only
+        # used from the top-level task, and every builder is released
+        # before the launch that acquired it returns.
+        self._buffer_pool = BufferBuilderPool()
+        # Created on first use, as the launcher module imports the runtime
+        self._launcher_template_cache: Optional[LauncherTemplateCache] = None
+        self._field_pool = FieldPool(settings.field_pool_slack())
+        # Number of times reusing a field blocked on its detachment, and the
+        # fields allocated instead of blocking
+        self._field_reuse_budget = settings.field_reuse_budget()
+        self._field_reuse_waits = 0
+        self._field_reuse_fallbacks = 0
+        self._field_reuse_fallback_bytes = 0
         # map shapes to index spaces
         self.index_spaces: dict[Rect, IndexSpace] = {}
         # map from shapes to active region managers
         self.active_region_managers: dict[Shape, RegionManager] = {}
         # map from regions to their managers
         self.region_managers_by_region: dict[Region, RegionManager] = {}
-        # LRU for free region managers
-        self.lru_managers: Deque[RegionManager] = deque()
+        # LRU for free region managers, from the least recently freed one,
+        # along with the bytes retained by each of them
+        self.lru_managers: OrderedDict[RegionManager, int] = OrderedDict()
+        self._lru_bytes = 0
+        # If positive, free region managers are evicted once they retain
+        # more bytes than this, instead of once there are too many of them
+        self._max_lru_bytes = settings.max_retained_region_bytes()
         # map from (shape,dtype) to field managers
         self.field_managers: dict[tuple[Shape, Any], FieldManager] = {}
 
@@ -1146,10 +1862,12 @@ class Runtime:
         first_functor_id: int = (
             core_library._lib.LEGATE_CORE_FIRST_DYNAMIC_FUNCTOR_ID  # type: ignore[union-attr] # noqa: E501
         )
+        self._first_functor_id = first_functor_id
         self._next_projection_id = first_functor_id
         self._next_sharding_id = first_functor_id
         self._registered_projections: dict[ProjSpec, int] = {}
         self._registered_shardings: dict[ShardSpec, int] = {}
+        self._preregister_projection_functors()
 
         self._max_pending_exceptions: int = int(
             self._core_context.get_tunable(
@@ -1235,10 +1953,99 @@ class Runtime:
     def partition_manager(self) -> PartitionManager:
         return self._partition_manager
 
+    @property
+    def buffer_pool(self) -> BufferBuilderPool:
+        return self._buffer_pool
+
+    @property
+    def launcher_template_cache(self) -> LauncherTemplateCache:
+        if self._launcher_template_cache is None:
+            from .launcher import LauncherTemplateCache
+
+            self._launcher_template_cache = LauncherTemplateCache(
+                settings.launcher_template_cache_size()
+            )
+        return self._launcher_template_cache
+
     @property
     def field_match_manager(self) -> FieldMatchManager:
         return self._field_match_manager
 
+    @property
+    def field_pool(self) -> FieldPool:
+        return self._field_pool
+
+    @property
+    def field_reuse_budget(self) -> int:
+        return self._field_reuse_budget
+
+    def record_field_reuse_wait(self) -> None:
+        self._field_reuse_waits += 1
+
+    def charge_field_reuse_fallback(self, nbytes: int) -> bool:
+        """
+        Charges a new field allocated instead of blocking on the detachment
+        of a free field to the field reuse budget. The charge is refunded
+        with ``refund_field_reuse_fallback`` once the extra field is no
+        longer outstanding.
+
+        Parameters
+        ----------
+        nbytes : int
+            Size of the new field in bytes
+
+        Returns
+        -------
+        bool
+            ``True`` if the budget allows the allocation
+        """
+        fallback_bytes = self._field_reuse_fallback_bytes + nbytes
+        if fallback_bytes > self._field_reuse_budget:
+            return False
+        self._field_reuse_fallback_bytes = fallback_bytes
+        self._field_reuse_fallbacks += 1
+        return True
+
+    def refund_field_reuse_fallback(self, nbytes: int) -> None:
+        """
+        Returns the charge of fields allocated instead of blocking to the
+        field reuse budget, once they are reused or destroyed
+
+        Parameters
+        ----------
+        nbytes : int
+            Total size of the fields in bytes
+        """
+        self._field_reuse_fallback_bytes -= nbytes
+        assert self._field_reuse_fallback_bytes >= 0
+
+    def get_field_reuse_stats(self) -> FieldReuseStats:
+        """
+        Returns how often reusing a field blocked on a pending detachment
+        and how many fields were allocated to avoid blocking
+
+        Returns
+        -------
+        FieldReuseStats
+            Statistics of field reuse
+        """
+        return FieldReuseStats(
+            self._field_reuse_waits,
+            self._field_reuse_fallbacks,
+            self._field_reuse_fallback_bytes,
+        )
+
+    def get_field_pool_stats(self) -> FieldPoolStats:
+        """
+        Returns the reuse and fragmentation statistics of the field pool
+
+        Returns
+        -------
+        FieldPoolStats
+            Statistics of the fields borrowed from larger regions
+        """
+        return self._field_pool.stats
+
     @property
     def annotation(self) -> LibraryAnnotations:
         """
@@ -1344,10 +2151,14 @@ class Runtime:
         self.active_region_managers = {}
         self.region_managers_by_region = {}
         self.field_managers = {}
+        self._field_pool.destroy()
         self.index_spaces = {}
-        # Explicitly release the reference to the partition manager so that
-        # it may be collected, releasing references to Futures and FutureMaps.
-        del self._partition_manager
+        # Explicitly release the references to Futures and FutureMaps held by
+        # the partition manager. The manager itself is kept alive, as stores
+        # collected below still reclaim their entries.
+        self._partition_manager.destroy()
+        if self._launcher_template_cache is not None:
+            self._launcher_template_cache.clear()
 
         if self._finalize_tasks:
             # Run a gc and then end the legate task
@@ -1370,50 +2181,170 @@ class Runtime:
         return self._next_storage_id
 
     def dispatch(self, op: Dispatchable[T]) -> T:
-        self._attachment_manager.perform_detachments()
-        self._attachment_manager.prune_detachments()
+        # Detachments are deferred to the end of a trace, as they would
+        # make the trace issue different operations in every run
+        if self._current_trace is None:
+            self._attachment_manager.perform_detachments()
+            self._attachment_manager.prune_detachments()
         return op.launch(self.legion_runtime, self.legion_context)
 
     def dispatch_single(self, op: Dispatchable[T]) -> T:
-        self._attachment_manager.perform_detachments()
-        self._attachment_manager.prune_detachments()
+        if self._current_trace is None:
+            self._attachment_manager.perform_detachments()
+            self._attachment_manager.prune_detachments()
         return op.launch(self.legion_runtime, self.legion_context)
 
+    def _split_into_batches(
+        self, ops: List[Operation]
+    ) -> List[List[Operation]]:
+        batches: List[List[Operation]] = []
+        for op in ops:
+            # Operations with scalar outputs must be launched as single
+            # tasks, so we always partition them separately
+            if (
+                not self._batch_partitioning
+                or len(op.scalar_outputs) > 0
+                or len(batches) == 0
+                or len(batches[-1][-1].scalar_outputs) > 0
+                # Changes of machine configuration delineate the batches
+                or batches[-1][-1].target_machine != op.target_machine
+            ):
+                batches.append([op])
+            else:
+                batches[-1].append(op)
+        return batches
+
     def _schedule(self, ops: List[Operation]) -> None:
         from .solver import Partitioner
 
-        # TODO: For now we run the partitioner for each operation separately.
-        #       We will eventually want to compute a trace-wide partitioning
-        #       strategy.
-        strategies = []
-        for op in ops:
-            must_be_single = len(op.scalar_outputs) > 0
-            partitioner = Partitioner([op], must_be_single=must_be_single)
-            # TODO: When we start partitioning a batch of operations, changes
-            # of machine configuration would delineat the batches
-            with op.target_machine:
-                strategies.append(partitioner.partition_stores())
+        strategies: List[Strategy] = []
+        for batch in self._split_into_batches(ops):
+            if len(batch) == 1:
+                op = batch[0]
+                must_be_single = len(op.scalar_outputs) > 0
+                partitioner = Partitioner([op], must_be_single=must_be_single)
+                with op.target_machine:
+                    strategies.append(partitioner.partition_stores())
+            else:
+                partitioner = Partitioner(batch)
+                with batch[0].target_machine:
+                    strategies.extend(partitioner.partition_batch())
 
         for op, strategy in zip(ops, strategies):
+            if self._current_trace is not None:
+                self._current_trace.record_operation(op, strategy)
             with op.target_machine:
                 op.launch(strategy)
 
-    def flush_scheduling_window(self) -> None:
+    @property
+    def window_size(self) -> int:
+        return self._window.size
+
+    def _flush_window(self) -> None:
         if len(self._outstanding_ops) == 0:
             return
         ops = self._outstanding_ops
         self._outstanding_ops = []
         self._schedule(ops)
 
+    def flush_scheduling_window(self) -> None:
+        """
+        Launches all outstanding operations in the scheduling window. This
+        is a blocking point for the window, so the window shrinks if the
+        program synchronizes more often than the window fills up.
+        """
+        if len(self._outstanding_ops) == 0:
+            return
+        # The window is kept intact in a trace, so the operations are
+        # partitioned in the same batches in every run
+        if self._current_trace is None:
+            self._window.shrink(len(self._outstanding_ops))
+        self._flush_window()
+
     def submit(self, op: Operation) -> None:
         if op.can_raise_exception and self._precise_exception_trace:
             op.capture_traceback()
+        self._window.record_submit()
         self._outstanding_ops.append(op)
-        if len(self._outstanding_ops) >= self._window_size:
-            self.flush_scheduling_window()
+        if len(self._outstanding_ops) >= self._window.size:
+            self._flush_window()
+            if self._current_trace is None:
+                self._window.grow(len(self._pending_exceptions))
         if len(self._pending_exceptions) >= self._max_pending_exceptions:
             self.raise_exceptions()
 
+    @property
+    def current_trace(self) -> Optional[Trace]:
+        return self._current_trace
+
+    @property
+    def num_pending_detachments(self) -> int:
+        """
+        Returns the number of issued detachments not yet known to be done
+
+        Returns
+        -------
+        int
+            Number of pending detachments
+        """
+        return self._attachment_manager.num_pending_detachments
+
+    @contextmanager
+    def trace(self, trace_id: int) -> Iterator[None]:
+        """
+        Returns a context manager that traces the operations issued in its
+        scope. Legion memoizes the dependence analysis of the operations in
+        the first run of a trace and replays it in the later runs with the
+        same trace id, which saves the analysis cost for programs that
+        repeat the same sequence of operations, e.g., in every time step.
+
+        The scheduling window is flushed at the boundaries of the trace and
+        doesn't change its size within the trace, so the operations are
+        partitioned the same way in every run. Detachments and consensus
+        matches for field reuse are deferred to the end of the trace.
+
+        Parameters
+        ----------
+        trace_id : int
+            Id of the trace
+
+        Raises
+        ------
+        RuntimeError
+            If traces are nested, or if a run of the trace launches
+            different operations, uses different stores or partitions, or
+            allocates new fields, compared to the first run
+        """
+        if self._current_trace is not None:
+            raise RuntimeError(
+                f"Cannot start trace {trace_id} inside trace "
+                f"{self._current_trace.trace_id}"
+            )
+        trace = self._traces.get(trace_id)
+        if trace is None:
+            trace = Trace(trace_id)
+            self._traces[trace_id] = trace
+
+        self._flush_window()
+        self._attachment_manager.perform_detachments()
+        self._attachment_manager.prune_detachments()
+
+        trace.begin()
+        BeginTrace(trace_id).launch(self.legion_runtime, self.legion_context)
+        self._current_trace = trace
+        try:
+            yield
+        finally:
+            try:
+                # Operations issued in the trace must be launched in it
+                self._flush_window()
+            finally:
+                self._current_trace = None
+                EndTrace(trace_id).launch(
+                    self.legion_runtime, self.legion_context
+                )
+        trace.end()
+
     def _progress_unordered_operations(self) -> None:
         legion.legion_context_progress_unordered_operations(
             self.legion_runtime, self.legion_context
@@ -1455,6 +2386,48 @@ class Runtime:
 
         return proj_id
 
+    def _preregister_projection_functors(self) -> None:
+        specs = list(
+            enumerate_common_projections(_MAX_PREREGISTERED_PROJECTION_NDIM)
+        )
+        proj_ids = ffi.new(f"legion_projection_id_t[{len(specs)}]")
+        for idx, spec in enumerate(specs):
+            proj_id = self.core_context.get_projection_id(
+                self._next_projection_id
+            )
+            self._next_projection_id += 1
+            self._registered_projections[spec] = proj_id
+            proj_ids[idx] = proj_id
+
+        num_specs, *specs_c = pack_symbolic_projection_reprs(specs)
+        self.core_library.legate_register_affine_projection_functors(
+            num_specs, *specs_c, proj_ids
+        )
+
+    @property
+    def num_projection_functors(self) -> int:
+        """
+        Returns the number of projection functors registered by the runtime
+
+        Returns
+        -------
+        int
+            Number of projection functors
+        """
+        return self._next_projection_id - self._first_functor_id
+
+    @property
+    def num_sharding_functors(self) -> int:
+        """
+        Returns the number of sharding functors registered by the runtime
+
+        Returns
+        -------
+        int
+            Number of sharding functors
+        """
+        return self._next_sharding_id - self._first_functor_id
+
     def get_sharding(self, proj_id: int) -> int:
         proc_range = self.machine.get_processor_range()
         shard_spec = (
@@ -1488,17 +2461,24 @@ class Runtime:
     def get_projection(self, src_ndim: int, dims: SymbolicPoint) -> int:
         proj_spec = (src_ndim, dims)
 
-        proj_id: int
-        if proj_spec in self._registered_projections:
-            proj_id = self._registered_projections[proj_spec]
-        else:
+        proj_id: Optional[int] = self._registered_projections.get(proj_spec)
+        if proj_id is not None:
+            return proj_id
+
+        # Equivalent projections share the functor of their canonical form
+        dims = canonicalize_symbolic_point(dims)
+        canonical_spec = (src_ndim, dims)
+        proj_id = self._registered_projections.get(canonical_spec)
+        if proj_id is None:
             if is_identity_projection(src_ndim, dims):
                 proj_id = 0
             else:
                 proj_id = self._register_projection_functor(
-                    proj_spec, *pack_symbolic_projection_repr(src_ndim, dims)
+                    canonical_spec,
+                    *pack_symbolic_projection_repr(src_ndim, dims),
                 )
-            self._registered_projections[proj_spec] = proj_id
+            self._registered_projections[canonical_spec] = proj_id
+        self._registered_projections[proj_spec] = proj_id
 
         return proj_id
 
@@ -1600,6 +2580,59 @@ class Runtime:
             ndim=ndim,
         )
 
+    def create_stores(
+        self,
+        dtype: ty.Dtype,
+        shape: Union[Shape, tuple[int, ...]],
+        count: int,
+    ) -> list[Store]:
+        """
+        Creates stores of the same shape and type, allocating the fields of
+        all of them in one pass
+
+        Parameters
+        ----------
+        dtype : Dtype
+            Type of the elements
+        shape : Shape or tuple[int]
+            Shape of the stores
+        count : int
+            Number of stores to create
+
+        Returns
+        -------
+        list[Store]
+            New stores, each backed by its own field
+
+        Raises
+        ------
+        ValueError
+            If the type is not supported or ``count`` is negative
+        """
+        from .store import RegionField
+
+        if not isinstance(dtype, ty.Dtype):
+            raise ValueError(f"Unsupported type: {dtype}")
+        if count < 0:
+            raise ValueError(f"Invalid number of stores: {count}")
+        if not isinstance(shape, Shape):
+            shape = Shape(shape)
+
+        assert not self.destroyed
+        # As in create_store, 0D stores are backed by 1D regions
+        field_shape = Shape([1]) if shape.ndim == 0 else shape
+        field_mgr = self.find_or_create_field_manager(field_shape, dtype.size)
+        return [
+            self.create_store(
+                dtype,
+                shape=shape,
+                data=RegionField.create(
+                    region, field_id, dtype.size, field_shape
+                ),
+            )
+            for region, field_id in field_mgr.allocate_fields(count)
+        ]
+
     def create_manual_task(
         self,
         context: Context,
@@ -1735,7 +2768,12 @@ class Runtime:
         fill.execute()
 
     def tree_reduce(
-        self, context: Context, task_id: int, store: Store, radix: int = 4
+        self,
+        context: Context,
+        task_id: int,
+        store: Store,
+        radix: Optional[int] = None,
+        axis: Optional[int] = None,
     ) -> Store:
         """
         Performs a user-defined reduction by building a tree of reduction
@@ -1753,26 +2791,42 @@ class Runtime:
         store : Store
             Store to perform reductions on
 
-        radix : int
+        radix : int, optional
             Fan-in of each reducer task. If the store is partitioned into
             :math:`N` sub-stores by the runtime, then the first level of
             reduction tree has :math:`\\ceil{N / \\mathtt{radix}}` reducer
-            tasks.
+            tasks. If not given, the fan-in is the number of processors per
+            node, lowered so that the inputs of each reducer fit in
+            ``LEGATE_TREE_REDUCE_MAX_FANIN_BYTES`` when their size is known.
+
+        axis : int, optional
+            Dimension of the store along which sub-stores are reduced. The
+            results of the sub-stores in the other dimensions are kept apart
+            and concatenated in the output store. If not given, all
+            sub-stores are reduced into one.
 
         Returns
         -------
         Store
-            Store that contains reduction results
+            Store that contains reduction results, with the same number of
+            dimensions as the input store
+
+        Raises
+        ------
+        ValueError
+            If ``radix`` is less than 2 or ``axis`` is not a dimension of the
+            store
         """
         from .operation import Reduce
 
-        if store.ndim > 1:
-            raise NotImplementedError(
-                "Tree reduction doesn't currently support "
-                "multi-dimensional stores"
-            )
+        if radix is not None and radix < 2:
+            raise ValueError(f"Radix must be at least 2, but got {radix}")
+        if axis is not None and not 0 <= axis < store.ndim:
+            raise ValueError(f"invalid axis {axis} for a {store.ndim}-D store")
 
-        result = self.create_store(store.type)
+        # The result has the dimensionality of the store, so that the tree
+        # can be launched over the store's pieces in all dimensions
+        result = self.create_store(store.type, ndim=store.ndim)
 
         # A single Reduce operation is mapped to a whole reduction tree
         task = Reduce(
@@ -1781,6 +2835,7 @@ class Runtime:
             radix,
             self.get_unique_op_id(),
             self.machine,
+            axis=axis,
         )
         task.add_input(store)
         task.add_output(result)
@@ -1792,19 +2847,38 @@ class Runtime:
         return self.region_managers_by_region[region]
 
     def revive_manager(self, region_mgr: RegionManager) -> None:
-        self.lru_managers.remove(region_mgr)
+        self._lru_bytes -= self.lru_managers.pop(region_mgr)
+
+    @property
+    def retained_region_bytes(self) -> int:
+        """
+        Returns the number of bytes held by free regions kept for reuse
+
+        Returns
+        -------
+        int
+            Total size of the fields of the free regions
+        """
+        return self._lru_bytes
+
+    def _lru_over_budget(self) -> bool:
+        if self._max_lru_bytes > 0:
+            return self._lru_bytes > self._max_lru_bytes
+        return len(self.lru_managers) > self._max_lru_length
 
     def free_region_manager(
         self, shape: Shape, region: Region, unordered: bool = False
     ) -> None:
         assert region in self.region_managers_by_region
         region_mgr = self.region_managers_by_region[region]
-        self.lru_managers.appendleft(region_mgr)
+        nbytes = region_mgr.nbytes
+        self.lru_managers[region_mgr] = nbytes
+        self._lru_bytes += nbytes
 
-        if len(self.lru_managers) > self._max_lru_length:
-            region_mgr = self.lru_managers.pop()
+        while self._lru_over_budget():
+            region_mgr, nbytes = self.lru_managers.popitem(last=False)
+            self._lru_bytes -= nbytes
             self.destroy_region_manager(region_mgr, unordered)
-        assert len(self.lru_managers) <= self._max_lru_length
 
     def destroy_region_manager(
         self, region_mgr: RegionManager, unordered: bool
@@ -1843,17 +2917,29 @@ class Runtime:
             return field_mgr
         field_mgr = self._field_manager_class(self, shape, field_size)
         self.field_managers[key] = field_mgr
+        self._field_pool.register_manager(field_mgr)
         return field_mgr
 
-    def allocate_field(self, shape: Shape, dtype: Any) -> RegionField:
+    def allocate_field(
+        self, shape: Shape, dtype: Any, borrow: bool = True
+    ) -> RegionField:
+        from .partition import Tiling
         from .store import RegionField
 
         assert not self.destroyed
-        region = None
-        field_id = None
         field_mgr = self.find_or_create_field_manager(shape, dtype.size)
-        region, field_id = field_mgr.allocate_field()
-        return RegionField.create(region, field_id, dtype.size, shape)
+        region, field_id, field_shape = field_mgr.allocate_field(borrow)
+        region_field = RegionField.create(
+            region, field_id, dtype.size, field_shape
+        )
+        if field_shape is field_mgr.shape:
+            return region_field
+        # The field was borrowed from a larger region, so we hand out the
+        # subregion of the requested shape
+        ndim = shape.ndim
+        return region_field.get_child(
+            Tiling(shape, Shape((1,) * ndim)), Shape((0,) * ndim)
+        )
 
     def free_field(
         self,
@@ -1867,6 +2953,7 @@ class Runtime:
         # do this after we have been destroyed
         if self.destroyed:
             return
+        self._field_pool.release_field(region, field_id)
         # Now save it in our data structure for free fields eligible for reuse
         key = (shape, field_size)
         if key not in self.field_managers:
@@ -1887,7 +2974,7 @@ class Runtime:
             self.region_managers_by_region[region] = region_mgr
             self.find_or_create_field_manager(shape, dtype.size)
 
-        revived = region_mgr.increase_field_count()
+        revived = region_mgr.increase_field_count(dtype.size)
         if revived:
             self.revive_manager(region_mgr)
         return RegionField.create(region, field_id, dtype.size, shape)
@@ -2019,6 +3106,7 @@ class Runtime:
         block : bool
             If ``True``, the call blocks until all upstream operations finish.
         """
+        self.flush_scheduling_window()
         fence = Fence(mapping=False)
         future = fence.launch(self.legion_runtime, self.legion_context)
         if block:
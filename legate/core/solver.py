@@ -14,17 +14,35 @@
 #
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Generic, List, Optional, Tuple, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from . import FieldSpace, Future, Rect
-from .constraints import Alignment, Broadcast, Containment, PartSym
+from .constraints import (
+    Alignment,
+    Broadcast,
+    Containment,
+    Lit,
+    PartSym,
+    Scale,
+    Translate,
+)
 from .partition import REPLICATE
 from .runtime import runtime
 from .shape import Shape
-from .utils import OrderedSet
+from .utils import LRUCache, OrderedSet
 
 if TYPE_CHECKING:
-    from .constraints import Expr, Lit
+    from .constraints import Expr
     from .operation import Operation
     from .partition import PartitionBase
     from .store import Store
@@ -39,85 +57,113 @@ T = TypeVar("T")
 
 
 class EqClass(Generic[T]):
+    """
+    A disjoint-set forest with path compression and union by rank. Members
+    of each class are iterated in the order in which they were first
+    recorded, regardless of the order of the merges.
+    """
+
     def __init__(self) -> None:
-        # Maps a variable to the equivalent class id
-        self._class_ids: dict[T, int] = {}
-        self._next_class_id = 0
-        # Maps an equivalent class id to the class
-        self._classes: dict[int, OrderedSet[T]] = {}
+        # Maps a variable to its parent in the forest. Roots are their own
+        # parents.
+        self._parents: dict[T, T] = {}
+        self._ranks: dict[T, int] = {}
+        # Maps a variable to the order in which it was first recorded
+        self._order: dict[T, int] = {}
+        # Maps a root to the members of its class
+        self._members: dict[T, list[T]] = {}
+        # Maps a root to the members of its class in order. Entries are
+        # dropped when classes are merged.
+        self._classes: dict[T, OrderedSet[T]] = {}
 
     @property
     def empty(self) -> bool:
-        return self._next_class_id == 0
-
-    def _add(self, var1: T, var2: T) -> None:
-        cls = OrderedSet([var1, var2])
-        cls_id = self._next_class_id
-        self._next_class_id += 1
-        self._classes[cls_id] = cls
-        self._class_ids[var1] = cls_id
-        self._class_ids[var2] = cls_id
-
-    def _update(self, var1: T, var2: T) -> None:
-        cls_id = self._class_ids[var1]
-        cls = self._classes[cls_id]
-        cls.add(var2)
-        self._class_ids[var2] = cls_id
-
-    def _merge(self, var1: T, var2: T) -> None:
-        cls_id1 = self._class_ids[var1]
-        cls_id2 = self._class_ids[var2]
-        new_cls: OrderedSet[T] = OrderedSet()
-        new_cls.update(self._classes[cls_id1])
-        new_cls.update(self._classes[cls_id2])
-        self._classes[cls_id1] = new_cls
-        self._classes[cls_id2] = new_cls
+        return len(self._parents) == 0
+
+    def _add(self, var: T) -> None:
+        self._parents[var] = var
+        self._ranks[var] = 0
+        self._order[var] = len(self._order)
+        self._members[var] = [var]
+
+    def _find_root(self, var: T) -> T:
+        parents = self._parents
+        root = var
+        while (parent := parents[root]) is not root:
+            root = parent
+        # Point all variables on the path directly to the root
+        while var is not root:
+            parent = parents[var]
+            parents[var] = root
+            var = parent
+        return root
 
     def record(self, var1: T, var2: T) -> None:
         """
         Record an equivalence relation between two vars
         """
-        found1 = var1 in self._class_ids
-        found2 = var2 in self._class_ids
-
-        if found1 and found2:  # both
-            self._merge(var1, var2)
-        elif found1:  # first only
-            self._update(var1, var2)
-        elif found2:  # second only
-            self._update(var2, var1)
-        else:  # neither
-            self._add(var1, var2)
+        if var1 not in self._parents:
+            self._add(var1)
+        if var2 not in self._parents:
+            self._add(var2)
+
+        root1 = self._find_root(var1)
+        root2 = self._find_root(var2)
+        if root1 is root2:
+            return
+
+        rank1 = self._ranks[root1]
+        rank2 = self._ranks[root2]
+        if rank1 < rank2:
+            root1, root2 = root2, root1
+        elif rank1 == rank2:
+            self._ranks[root1] = rank1 + 1
+
+        self._parents[root2] = root1
+        self._members[root1].extend(self._members.pop(root2))
+        self._classes.pop(root1, None)
+        self._classes.pop(root2, None)
 
     def copy(self) -> EqClass[T]:
         new: EqClass[T] = EqClass()
-        new._class_ids = self._class_ids.copy()
-        new._classes = self._classes.copy()
+        new._parents = self._parents.copy()
+        new._ranks = self._ranks.copy()
+        new._order = self._order.copy()
+        new._members = {
+            root: members.copy() for root, members in self._members.items()
+        }
         return new
 
     def union(self, other: EqClass[T]) -> None:
-        if self.empty:
-            self._class_ids = other._class_ids.copy()
-            self._classes = other._classes.copy()
-        else:
-            for other_class in other._classes.values():
-                cls: OrderedSet[T] = OrderedSet()
-                cls.update(other_class)
-                var1 = cls.pop()
-                for var2 in cls:
-                    self.record(var1, var2)
+        for root in other._members:
+            cls = iter(other.find(root))
+            var1 = next(cls)
+            for var2 in cls:
+                self.record(var1, var2)
 
     def find(self, var: T) -> OrderedSet[T]:
         """
         Return an equivalence class for a given var.
         """
-        if var not in self._class_ids:
+        if var not in self._parents:
             return OrderedSet([var])
-        else:
-            return self._classes[self._class_ids[var]]
+        root = self._find_root(var)
+        cls = self._classes.get(root)
+        if cls is None:
+            members = self._members[root]
+            # Merged classes are concatenations of sorted runs, which
+            # Timsort merges in close to linear time
+            members.sort(key=self._order.__getitem__)
+            cls = OrderedSet(members)
+            self._classes[root] = cls
+        return cls
 
     def aligned(self, var1: T, var2: T) -> bool:
-        return self._class_ids[var1] == self._class_ids[var2]
+        if var1 is var2:
+            return True
+        if var1 not in self._parents or var2 not in self._parents:
+            return False
+        return self._find_root(var1) is self._find_root(var2)
 
 
 class Strategy:
@@ -199,6 +245,208 @@ class Strategy:
         return str(self)
 
 
+def _encode_expr(expr: Expr) -> Optional[Hashable]:
+    if isinstance(expr, PartSym):
+        return (PartSym, expr._id)
+    elif isinstance(expr, Lit):
+        return (Lit, expr._part)
+    elif isinstance(expr, Translate):
+        sub = _encode_expr(expr._expr)
+        return None if sub is None else (Translate, sub, expr._offset)
+    elif isinstance(expr, Scale):
+        sub = _encode_expr(expr._expr)
+        return None if sub is None else (Scale, sub, expr._scale)
+    return None
+
+
+class StrategyCache:
+    """
+    Caches partitioning strategies keyed on a structural signature of the
+    operations partitioned together, so that operations repeatedly submitted
+    with the same arguments, e.g., in an iterative solver, don't go through
+    the solver.
+
+    The signature captures the key partitions of the stores, so changing
+    them with ``set_key_partition`` or ``reset_key_partition`` invalidates
+    strategies computed with the old ones.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        # Each entry stores the launch shapes, and the partitions and key
+        # partition flags indexed by symbol ids, of the operations, and the
+        # equivalence classes of the symbols, which are identified by pairs
+        # of operation indices and symbol ids. Cache hits refresh entries,
+        # so the least recently used strategies are evicted first.
+        self._entries: LRUCache[
+            Hashable,
+            tuple[
+                tuple[Optional[Shape], ...],
+                tuple[tuple[PartitionBase, ...], ...],
+                tuple[tuple[bool, ...], ...],
+                tuple[tuple[tuple[int, int], ...], ...],
+            ],
+        ] = LRUCache(max(max_entries, 1))
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def compute_signature(
+        self, ops: Sequence[Operation], must_be_single: bool
+    ) -> Optional[Hashable]:
+        """
+        Returns the signature of the operations, or ``None`` if the
+        strategies for the operations cannot be cached
+        """
+        if self._max_entries <= 0:
+            return None
+
+        # Stores are numbered across all operations, so that the signature
+        # captures which operations share stores
+        store_ids: dict[int, int] = {}
+        stores: list[Any] = []
+        op_signatures: list[Any] = []
+        for op in ops:
+            unknowns: list[Any] = []
+            for unknown in op.all_unknowns:
+                store = unknown.store
+                # Unbound stores need fresh field spaces for every launch
+                if store.unbound:
+                    return None
+                idx = store_ids.get(id(store))
+                if idx is None:
+                    idx = len(stores)
+                    store_ids[id(store)] = idx
+                    stores.append(store.get_partitioning_signature())
+                unknowns.append((idx, unknown._disjoint, unknown._complete))
+
+            constraints: list[Any] = []
+            for c in op.constraints:
+                if isinstance(c, Alignment):
+                    constraints.append((Alignment, c._lhs._id, c._rhs._id))
+                elif isinstance(c, Broadcast):
+                    constraints.append(
+                        (Broadcast, c._expr._id, c._restrictions)
+                    )
+                elif isinstance(c, Containment):
+                    lhs = _encode_expr(c._lhs)
+                    rhs = _encode_expr(c._rhs)
+                    if lhs is None or rhs is None:
+                        return None
+                    constraints.append((Containment, lhs, rhs))
+                else:
+                    return None
+
+            op_signatures.append(
+                (
+                    type(op),
+                    op.context.library.get_name(),
+                    getattr(op, "_task_id", None),
+                    op.target_machine,
+                    tuple(unknowns),
+                    tuple(constraints),
+                )
+            )
+
+        return (must_be_single, tuple(stores), tuple(op_signatures))
+
+    def find(
+        self, signature: Hashable, ops: Sequence[Operation]
+    ) -> Optional[list[Strategy]]:
+        entry = self._entries.get(signature)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+
+        launch_shapes, partitions, key_flags, classes = entry
+        eq_classes: EqClass[PartSym] = EqClass()
+        for cls in classes:
+            op_idx, sym_id = cls[0]
+            first = ops[op_idx].all_unknowns[sym_id]
+            for op_idx, sym_id in cls[1:]:
+                eq_classes.record(first, ops[op_idx].all_unknowns[sym_id])
+        return [
+            Strategy(
+                launch_shape,
+                dict(zip(op.all_unknowns, op_partitions)),
+                {},
+                set(
+                    unknown
+                    for unknown, is_key in zip(op.all_unknowns, op_key_flags)
+                    if is_key
+                ),
+                eq_classes,
+            )
+            for op, launch_shape, op_partitions, op_key_flags in zip(
+                ops, launch_shapes, partitions, key_flags
+            )
+        ]
+
+    def record(
+        self,
+        signature: Hashable,
+        ops: Sequence[Operation],
+        launch_shapes: Sequence[Optional[Shape]],
+        strategies: Sequence[Strategy],
+    ) -> None:
+        if signature in self._entries:
+            return
+
+        # All strategies of a batch share the same equivalence classes
+        eq_classes = strategies[0]._eq_classes
+        positions = {
+            unknown: (op_idx, unknown._id)
+            for op_idx, op in enumerate(ops)
+            for unknown in op.all_unknowns
+        }
+        classes: list[tuple[tuple[int, int], ...]] = []
+        seen: set[PartSym] = set()
+        for unknown in positions:
+            if unknown in seen:
+                continue
+            cls = [
+                to_align
+                for to_align in eq_classes.find(unknown)
+                if to_align in positions
+            ]
+            seen.update(cls)
+            if len(cls) < 2:
+                continue
+            classes.append(tuple(positions[to_align] for to_align in cls))
+
+        self._entries[signature] = (
+            tuple(launch_shapes),
+            tuple(
+                tuple(
+                    strategy._strategy[unknown] for unknown in op.all_unknowns
+                )
+                for op, strategy in zip(ops, strategies)
+            ),
+            tuple(
+                tuple(
+                    strategy.is_key_part(unknown)
+                    for unknown in op.all_unknowns
+                )
+                for op, strategy in zip(ops, strategies)
+            ),
+            tuple(classes),
+        )
+
+
 class Partitioner:
     def __init__(
         self,
@@ -471,48 +719,92 @@ class Partitioner:
 
         return reset_any
 
+    @staticmethod
+    def _record_constraints(
+        op: Operation,
+        constraints: EqClass[PartSym],
+        broadcasts: dict[PartSym, Restrictions],
+        dependent: dict[PartSym, Expr],
+        must_be_even: OrderedSet[PartSym],
+    ) -> None:
+        for c in op.constraints:
+            if isinstance(c, Alignment):
+                constraints.record(c._lhs, c._rhs)
+            elif isinstance(c, Broadcast):
+                broadcasts[c._expr] = c._restrictions
+            elif isinstance(c, Containment) and isinstance(c._lhs, PartSym):
+                if c._lhs in dependent:
+                    raise NotImplementedError(
+                        "Partitions constrained by multiple constraints "
+                        "are not supported yet"
+                    )
+                for unknown in c._rhs.unknowns():
+                    must_be_even.add(unknown)
+                dependent[c._lhs] = c._rhs
+            elif isinstance(c, Containment) and isinstance(c._rhs, PartSym):
+                if c._rhs in dependent:
+                    raise NotImplementedError(
+                        "Partitions constrained by multiple constraints "
+                        "are not supported yet"
+                    )
+                for unknown in c._lhs.unknowns():
+                    must_be_even.add(unknown)
+                dependent[c._rhs] = c._lhs
+
     def partition_stores(self) -> Strategy:
+        """
+        Solves partitioning constraints of the only operation of this
+        partitioner and returns its strategy
+        """
+        assert len(self._ops) == 1
+        return self.partition_batch()[0]
+
+    def partition_batch(self) -> list[Strategy]:
+        """
+        Solves partitioning constraints of all operations in the batch
+        jointly and returns one strategy per operation. Partition symbols of
+        a store produced by one operation and consumed by a later one are
+        unified so that the store keeps the same partition throughout the
+        batch.
+
+        All operations in the batch must target the same machine.
+        """
+        strategy_cache = runtime.partition_manager.strategy_cache
+        signature = strategy_cache.compute_signature(
+            self._ops, self._must_be_single
+        )
+        if signature is not None:
+            cached = strategy_cache.find(signature, self._ops)
+            if cached is not None:
+                return cached
+
+        launch_shapes, strategies = self._partition_stores()
+
+        # The solver may reset key partitions to find a better strategy,
+        # in which case the signature no longer matches the strategies
+        if signature is not None and signature == (
+            strategy_cache.compute_signature(self._ops, self._must_be_single)
+        ):
+            strategy_cache.record(
+                signature, self._ops, launch_shapes, strategies
+            )
+        return strategies
+
+    def _partition_stores(
+        self,
+    ) -> tuple[list[Optional[Shape]], list[Strategy]]:
         unknowns: OrderedSet[PartSym] = OrderedSet()
         constraints: EqClass[PartSym] = EqClass()
         broadcasts: dict[PartSym, Restrictions] = {}
         dependent: dict[PartSym, Expr] = {}
         must_be_even: OrderedSet[PartSym] = OrderedSet()
-        all_outputs: set[Store] = set()
         for op in self._ops:
             unknowns.update(op.all_unknowns)
-            for c in op.constraints:
-                if isinstance(c, Alignment):
-                    constraints.record(c._lhs, c._rhs)
-                elif isinstance(c, Broadcast):
-                    broadcasts[c._expr] = c._restrictions
-                elif isinstance(c, Containment) and isinstance(
-                    c._lhs, PartSym
-                ):
-                    if c._lhs in dependent:
-                        raise NotImplementedError(
-                            "Partitions constrained by multiple constraints "
-                            "are not supported yet"
-                        )
-                    for unknown in c._rhs.unknowns():
-                        must_be_even.add(unknown)
-                    dependent[c._lhs] = c._rhs
-                elif isinstance(c, Containment) and isinstance(
-                    c._rhs, PartSym
-                ):
-                    if c._rhs in dependent:
-                        raise NotImplementedError(
-                            "Partitions constrained by multiple constraints "
-                            "are not supported yet"
-                        )
-                    for unknown in c._lhs.unknowns():
-                        must_be_even.add(unknown)
-                    dependent[c._rhs] = c._lhs
-        for op in self._ops:
-            all_outputs.update(
-                store for store in op.outputs if not store.unbound
+            self._record_constraints(
+                op, constraints, broadcasts, dependent, must_be_even
             )
 
-        if self._must_be_single or len(unknowns) == 0:
+        if self._must_be_single:
             for unknown in unknowns:
                 c = unknown.broadcast()
                 broadcasts[unknown] = c._restrictions
@@ -526,17 +818,30 @@ class Partitioner:
             partitions,
         )
 
-        unknowns, unbound_ndim = self._solve_unbound_constraints(
-            unknowns,
-            constraints,
-            partitions,
-            fspaces,
-        )
+        # Unbound stores are solved per operation, as each operation can
+        # have unbound stores of a different dimensionality
+        unbound_ndims: list[Optional[int]] = []
+        for op in self._ops:
+            op_unknowns: OrderedSet[PartSym] = OrderedSet(
+                unknown for unknown in op.all_unknowns if unknown in unknowns
+            )
+            remaining, unbound_ndim = self._solve_unbound_constraints(
+                op_unknowns,
+                constraints,
+                partitions,
+                fspaces,
+            )
+            unknowns = unknowns.remove_all(op_unknowns.remove_all(remaining))
+            unbound_ndims.append(unbound_ndim)
 
         all_restrictions = self._find_all_restrictions(
             unknowns, broadcasts, constraints
         )
 
+        self._unify_producers_and_consumers(
+            constraints, all_restrictions, dependent
+        )
+
         def cost(unknown: PartSym) -> tuple[int, bool]:
             store = unknown.store
             return (
@@ -546,7 +851,7 @@ class Partitioner:
 
         result: dict[PartSym, PartitionBase]
         key_parts: set[PartSym]
-        launch_shape: Optional[Shape]
+        launch_shapes: list[Optional[Shape]]
 
         can_retry = True
         while True:
@@ -559,24 +864,86 @@ class Partitioner:
                 must_be_even,
             )
 
-            launch_shape, done = self.compute_launch_shape(
-                result, all_outputs, unbound_ndim
-            )
-            # When partitions have different numbers of chunks, the solver
-            # normally decides to serialize the operation, as there's no
-            # obvious mapping between the partitions. However, it is
-            # sometimes possible to recover parallelism by searching for
-            # an alternative solution to the given set of partitioning
-            # constraints, especially when some of the stores have cached key
-            # partitions that are not computed for themselves but copied from
-            # others due to alignments.
-            if can_retry and not done:
-                # We only retry once because resetting the cached key
-                # partitions followed recomputing key partitions is
-                # idempotent.
+            launch_shapes = []
+            reset_any = False
+            for op, unbound_ndim in zip(self._ops, unbound_ndims):
+                op_result = {
+                    unknown: result[unknown] for unknown in op.all_unknowns
+                }
+                launch_shape, done = self.compute_launch_shape(
+                    op_result,
+                    set(store for store in op.outputs if not store.unbound),
+                    unbound_ndim,
+                )
+                launch_shapes.append(launch_shape)
+                # When partitions have different numbers of chunks, the
+                # solver normally decides to serialize the operation, as
+                # there's no obvious mapping between the partitions. However,
+                # it is sometimes possible to recover parallelism by
+                # searching for an alternative solution to the given set of
+                # partitioning constraints, especially when some of the
+                # stores have cached key partitions that are not computed
+                # for themselves but copied from others due to alignments.
+                if can_retry and not done:
+                    reset_any = (
+                        self._reset_less_optimal_partitions(op_result)
+                        or reset_any
+                    )
+            # We only retry once because resetting the cached key partitions
+            # followed recomputing key partitions is idempotent.
+            if can_retry and reset_any:
                 can_retry = False
-                if self._reset_less_optimal_partitions(result):
-                    continue
+                continue
             break
 
-        return Strategy(launch_shape, result, fspaces, key_parts, constraints)
+        strategies: list[Strategy] = []
+        for op, launch_shape in zip(self._ops, launch_shapes):
+            op_unknowns = OrderedSet(op.all_unknowns)
+            strategies.append(
+                Strategy(
+                    launch_shape,
+                    {unknown: result[unknown] for unknown in op_unknowns},
+                    {
+                        unknown: fspace
+                        for unknown, fspace in fspaces.items()
+                        if unknown in op_unknowns
+                    },
+                    set(
+                        unknown
+                        for unknown in key_parts
+                        if unknown in op_unknowns
+                    ),
+                    constraints,
+                )
+            )
+        return launch_shapes, strategies
+
+    def _unify_producers_and_consumers(
+        self,
+        constraints: EqClass[PartSym],
+        all_restrictions: dict[PartSym, Restrictions],
+        dependent: dict[PartSym, Expr],
+    ) -> None:
+        # Maps each store written by an operation in the batch to the
+        # partition symbol used by the last writer
+        producers: dict[Store, PartSym] = {}
+        for op in self._ops:
+            outputs = op.outputs
+            for unknown in op.all_unknowns:
+                if unknown not in all_restrictions or unknown in dependent:
+                    continue
+                producer = producers.get(unknown.store)
+                # We unify two partition symbols only when they impose the
+                # same restrictions on the store. Otherwise, the consumer's
+                # broadcasting constraints would leak into the producer and
+                # could serialize it.
+                if (
+                    producer is not None
+                    and all_restrictions[producer] == all_restrictions[unknown]
+                ):
+                    constraints.record(producer, unknown)
+            for unknown in op.all_unknowns:
+                if unknown not in all_restrictions or unknown in dependent:
+                    continue
+                if any(unknown.store is output for output in outputs):
+                    producers[unknown.store] = unknown
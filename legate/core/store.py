@@ -15,7 +15,19 @@
 from __future__ import annotations
 
 import weakref
-from typing import TYPE_CHECKING, Any, Optional, Sequence, Type, Union
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Hashable,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
+import numpy as np
 
 from . import (
     AffineTransform,
@@ -33,6 +45,7 @@ from .allocation import (
     Attachable,
     DistributedAllocation,
     InlineMappedAllocation,
+    PrefetchedMapping,
 )
 from .legate import Array, Field as LegateField
 from .partition import REPLICATE, PartitionBase, Restriction, Tiling
@@ -66,6 +79,63 @@ from math import prod
 
 attachment_manager = runtime.attachment_manager
 
+# Shape, address, and strides of an inline allocation
+AllocationInfo = tuple[tuple[int, ...], int, tuple[int, ...]]
+
+
+@lru_cache
+def _get_accessor_functions(
+    dim: int, with_transform: bool
+) -> tuple[Callable[..., Any], Callable[..., Any]]:
+    """
+    Resolves the Legion functions that create an accessor of a physical
+    region and get a pointer to its data, for a given dimension
+    """
+    suffix = "_with_transform" if with_transform else ""
+    return (
+        getattr(
+            legion,
+            f"legion_physical_region_get_field_accessor_array_{dim}d{suffix}",
+        ),
+        getattr(legion, f"legion_accessor_array_{dim}d_raw_rect_ptr"),
+    )
+
+
+class _ArrayInterface:
+    def __init__(self, interface: dict[str, Any], owner: Any = None) -> None:
+        self.__array_interface__ = interface
+        # Arrays created from this interface keep the owner alive
+        self._owner = owner
+
+
+def _export_array_interface(view: np.ndarray[Any, Any]) -> dict[str, Any]:
+    # Arrays that NumPy creates from an array interface only keep the
+    # exporter alive, so we pass the memory as a buffer that refers to the
+    # view, which in turn keeps the store mapped
+    if view.size == 0:
+        return view.__array_interface__
+    lo = hi = 0
+    for extent, stride in zip(view.shape, view.strides):
+        if stride < 0:
+            lo += stride * (extent - 1)
+        else:
+            hi += stride * (extent - 1)
+    address = view.__array_interface__["data"][0]
+    span = {
+        "version": 3,
+        "shape": (hi - lo + view.dtype.itemsize,),
+        "typestr": "|u1",
+        "data": (address + lo, not view.flags.writeable),
+    }
+    return {
+        "version": 3,
+        "shape": view.shape,
+        "typestr": view.dtype.str,
+        "strides": view.strides,
+        "data": np.asarray(_ArrayInterface(span, owner=view)),
+        "offset": -lo,
+    }
+
 
 # A Field holds a reference to a field in a region tree
 class Field:
@@ -124,6 +194,16 @@ class RegionField:
         self.physical_region: Union[None, PhysicalRegion] = None
         self.physical_region_refs = 0
         self.physical_region_mapped = False
+        self.physical_region_privilege = legion.LEGION_READ_WRITE
+        # Whether we know the data of the physical region is ready, which
+        # isn't the case for mappings issued without waiting on them
+        self.physical_region_valid = True
+        # Inline allocations computed for the current mapping, which stay
+        # valid until the physical region is unmapped
+        self._inline_allocations: dict[Hashable, AllocationInfo] = {}
+        # Region fields of slices that currently have their own mappings,
+        # tracked only on the root region field
+        self._mapped_subregions: set[RegionField] = set()
 
         self._partitions: dict[Tiling, LegionPartition] = {}
 
@@ -262,82 +342,212 @@ class RegionField:
         self.physical_region = None
         self.physical_region_mapped = False
         self.physical_region_refs = 0
+        self._inline_allocations = {}
         self.attached_alloc = None
         if detach_future is not None:
             self.field.add_detach_future(detach_future)
 
-    def get_inline_mapped_region(self) -> PhysicalRegion:
-        if self.parent is None:
-            if self.physical_region is None:
-                # We don't have a valid numpy array so we need to do an inline
-                # mapping and then use the buffer to share the storage
-                mapping = InlineMapping(
-                    self.region,
-                    self.field.field_id,
-                    mapper=runtime.core_context.mapper_id,
-                    provenance=runtime.provenance,
+    def _get_root(self) -> RegionField:
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return root
+
+    def _get_mapping_owner(self) -> RegionField:
+        # A region field is served by the closest region field up the tree
+        # that is mapped or attached, so that we don't create interfering
+        # mappings. If there is none, it maps its own region, which is
+        # a subregion if this region field is for a slice.
+        rf: Optional[RegionField] = self
+        while rf is not None:
+            if rf.physical_region is not None:
+                return rf
+            rf = rf.parent
+        return self
+
+    def _overlaps(self, other: RegionField) -> bool:
+        mine = self.region.index_space.get_bounds()
+        theirs = other.region.index_space.get_bounds()
+        return all(
+            mine.lo[d] <= theirs.hi[d] and theirs.lo[d] <= mine.hi[d]
+            for d in range(mine.dim)
+        )
+
+    def _contains(self, other: RegionField) -> bool:
+        rf = other.parent
+        while rf is not None:
+            if rf is self:
+                return True
+            rf = rf.parent
+        return False
+
+    def _resolve_mapping_conflicts(self, privilege: int) -> list[RegionField]:
+        # Legion would block a new inline mapping until the mappings that
+        # interfere with it go away, which would never happen as they are
+        # held by the same task. Only read-only mappings can coexist.
+        # Mappings of slices within this region field are taken over by the
+        # new mapping instead, and the ones returned here must be unmapped
+        # before the new mapping is issued.
+        root = self._get_root()
+        to_unmap: list[RegionField] = []
+        for other in root._mapped_subregions:
+            if (
+                privilege == legion.LEGION_READ_ONLY
+                and other.physical_region_privilege == legion.LEGION_READ_ONLY
+            ):
+                continue
+            if self._contains(other):
+                to_unmap.append(other)
+            elif self._overlaps(other):
+                raise RuntimeError(
+                    "Cannot map a slice of a store while an overlapping "
+                    "slice is mapped, unless both mappings are read-only"
                 )
-                self.physical_region = runtime.dispatch(mapping)
-                self.physical_region_mapped = True
-                # Wait until it is valid before returning
-                self.physical_region.wait_until_valid()
-            elif not self.physical_region_mapped:
-                # If we have a physical region but it is not mapped then
-                # we actually need to remap it, we do this by launching it
-                runtime.dispatch(self.physical_region)
-                self.physical_region_mapped = True
-                # Wait until it is valid before returning
-                self.physical_region.wait_until_valid()
-            # Increment our ref count so we know when it can be collected
-            self.physical_region_refs += 1
-            return self.physical_region
-        else:
-            return self.parent.get_inline_mapped_region()
+        return to_unmap
+
+    def _take_over_mapping(self) -> int:
+        # Unmapping flushes the contents of the slice, and the slice is
+        # served by the enclosing mapping from now on, which inherits the
+        # references to this mapping
+        assert self.physical_region is not None
+        refs = self.physical_region_refs
+        runtime.unmap_region(self.physical_region)
+        self.physical_region = None
+        self.physical_region_mapped = False
+        self.physical_region_privilege = legion.LEGION_READ_WRITE
+        self.physical_region_valid = True
+        self.physical_region_refs = 0
+        self._inline_allocations = {}
+        self._get_root()._mapped_subregions.discard(self)
+        return refs
+
+    def get_inline_mapped_region(
+        self, privilege: int = legion.LEGION_READ_WRITE, wait: bool = True
+    ) -> PhysicalRegion:
+        owner = self._get_mapping_owner()
+        if owner is not self:
+            return owner.get_inline_mapped_region(privilege, wait)
+        if self.physical_region is None:
+            to_unmap = self._resolve_mapping_conflicts(privilege)
+            refs = 0
+            for other in to_unmap:
+                if other.physical_region_privilege != legion.LEGION_READ_ONLY:
+                    privilege = legion.LEGION_READ_WRITE
+                refs += other._take_over_mapping()
+            if len(to_unmap) > 0 and privilege == legion.LEGION_WRITE_DISCARD:
+                # Discarding would lose the contents flushed from the slices
+                privilege = legion.LEGION_READ_WRITE
+            # We don't have a valid numpy array so we need to do an inline
+            # mapping and then use the buffer to share the storage
+            mapping = InlineMapping(
+                self.region,
+                self.field.field_id,
+                read_only=privilege == legion.LEGION_READ_ONLY,
+                write_discard=privilege == legion.LEGION_WRITE_DISCARD,
+                mapper=runtime.core_context.mapper_id,
+                provenance=runtime.provenance,
+            )
+            self.physical_region = runtime.dispatch(mapping)
+            self.physical_region_mapped = True
+            self.physical_region_privilege = privilege
+            self.physical_region_valid = False
+            self.physical_region_refs += refs
+            self._inline_allocations = {}
+            if self.parent is not None:
+                self._get_root()._mapped_subregions.add(self)
+        elif not self.physical_region_mapped:
+            # If we have a physical region but it is not mapped then
+            # we actually need to remap it, we do this by launching it
+            runtime.dispatch(self.physical_region)
+            self.physical_region_mapped = True
+            self.physical_region_valid = False
+            self._inline_allocations = {}
+        elif (
+            self.physical_region_privilege == legion.LEGION_READ_ONLY
+            and privilege != legion.LEGION_READ_ONLY
+        ):
+            # A read-only mapping can't be upgraded while it is in use,
+            # as a second mapping would wait for the first to go away
+            raise RuntimeError(
+                "Cannot map a store for writing while it is mapped read-only"
+            )
+        if wait and not self.physical_region_valid:
+            # Wait until it is valid before returning
+            self.physical_region.wait_until_valid()
+            self.physical_region_valid = True
+        # Increment our ref count so we know when it can be collected
+        self.physical_region_refs += 1
+        return self.physical_region
 
     def decrement_inline_mapped_ref_count(
         self, unordered: bool = False
     ) -> None:
-        if self.parent is None:
-            if self.physical_region is None:
-                return
-            assert self.physical_region_refs > 0
-            self.physical_region_refs -= 1
-            if self.physical_region_refs == 0:
-                runtime.unmap_region(self.physical_region, unordered=unordered)
-                self.physical_region = None
-                self.physical_region_mapped = False
-        else:
-            self.parent.decrement_inline_mapped_ref_count(unordered=unordered)
+        owner = self._get_mapping_owner()
+        if owner is not self:
+            owner.decrement_inline_mapped_ref_count(unordered=unordered)
+            return
+        if self.physical_region is None:
+            return
+        assert self.physical_region_refs > 0
+        self.physical_region_refs -= 1
+        if self.physical_region_refs == 0:
+            runtime.unmap_region(self.physical_region, unordered=unordered)
+            self.physical_region = None
+            self.physical_region_mapped = False
+            self.physical_region_privilege = legion.LEGION_READ_WRITE
+            self.physical_region_valid = True
+            self._inline_allocations = {}
+            if self.parent is not None:
+                self._get_root()._mapped_subregions.discard(self)
 
     def get_inline_allocation(
         self,
         shape: Shape,
         transform: Optional[AffineTransform] = None,
+        privilege: int = legion.LEGION_READ_WRITE,
     ) -> InlineMappedAllocation:
-        physical_region = self.get_inline_mapped_region()
+        physical_region = self.get_inline_mapped_region(privilege)
+        # The allocation only depends on the mapping, the shape, and the
+        # transform, so we can reuse the one computed for the same request
+        # as long as the mapping is alive
+        owner = self._get_mapping_owner()
+        key = (
+            tuple(shape),
+            None
+            if transform is None
+            else (transform.transform.shape, transform.transform.tobytes()),
+        )
+        info = owner._inline_allocations.get(key)
+        if info is None:
+            info = self._compute_inline_allocation(
+                physical_region, shape, transform
+            )
+            owner._inline_allocations[key] = info
+        return InlineMappedAllocation(self, *info)
+
+    def _compute_inline_allocation(
+        self,
+        physical_region: PhysicalRegion,
+        shape: Shape,
+        transform: Optional[AffineTransform],
+    ) -> AllocationInfo:
         # We need a pointer to the physical allocation for this physical region
         dim = max(shape.ndim, 1)
+        get_accessor, get_raw_rect_ptr = _get_accessor_functions(
+            dim, transform is not None
+        )
         # Build the accessor for this physical region
         if transform is not None:
             # We have a transform so build the accessor special with a
             # transform
-            func = getattr(
-                legion,
-                "legion_physical_region_get_field_accessor_array_"
-                f"{dim}d_with_transform",
-            )
-            accessor = func(
+            accessor = get_accessor(
                 physical_region.handle,
                 ffi.cast("legion_field_id_t", self.field.field_id),
                 transform.raw(),
             )
         else:
             # No transfrom so we can do the normal thing
-            func = getattr(
-                legion,
-                f"legion_physical_region_get_field_accessor_array_{dim}d",
-            )
-            accessor = func(
+            accessor = get_accessor(
                 physical_region.handle,
                 ffi.cast("legion_field_id_t", self.field.field_id),
             )
@@ -352,8 +562,7 @@ class RegionField:
                 rect[0].hi.x[d] = shape[d] - 1  # inclusive
         subrect = ffi.new(f"legion_rect_{dim}d_t *")
         offsets = ffi.new("legion_byte_offset_t[]", dim)
-        func = getattr(legion, f"legion_accessor_array_{dim}d_raw_rect_ptr")
-        base_ptr = func(accessor, rect[0], subrect, offsets)
+        base_ptr = get_raw_rect_ptr(accessor, rect[0], subrect, offsets)
         assert base_ptr is not None
         # Check that the subrect is the same as in the in rect
         for d in range(dim):
@@ -363,8 +572,7 @@ class RegionField:
         # Numpy doesn't know about CFFI pointers, so we have to cast
         # this to a Python long before we can hand it off to Numpy.
         ptr = ffi.cast("size_t", base_ptr)
-        return InlineMappedAllocation(
-            self,
+        return (
             tuple(shape) if shape.ndim > 0 else (1,),
             int(ptr),  # type: ignore[call-overload]
             strides,
@@ -535,6 +743,12 @@ class Storage:
         # True means this storage is transferred
         self._transferred = False
 
+    def __del__(self) -> None:
+        # The partition manager is gone once the runtime is destroyed
+        if runtime.destroyed:
+            return
+        runtime.partition_manager.reclaim_storage(self._unique_id)
+
     def __str__(self) -> str:
         return (
             f"{self._kind.__name__}(uninitialized)"
@@ -685,6 +899,18 @@ class Storage:
             self._data = attachment_manager.reuse_existing_attachment(alloc)
             if self._data is not None:
                 return
+        # Attachments need a field spanning its whole region, so the field
+        # must not be borrowed from a larger region
+        if (
+            self._data is None
+            and self._kind is RegionField
+            and self._parent is None
+        ):
+            runtime.flush_scheduling_window()
+            if self._data is None:
+                self._data = runtime.allocate_field(
+                    self.extents, self._dtype, borrow=False
+                )
         # Force the RegionField to be instantiated, do the attachment normally
         assert isinstance(self.data, RegionField)
         self.data.attach_external_allocation(alloc, share)
@@ -736,9 +962,19 @@ class Storage:
         self,
         shape: Shape,
         transform: Optional[AffineTransform] = None,
+        privilege: int = legion.LEGION_READ_WRITE,
     ) -> InlineMappedAllocation:
         assert isinstance(self.data, RegionField)
-        return self.data.get_inline_allocation(shape, transform=transform)
+        return self.data.get_inline_allocation(
+            shape, transform=transform, privilege=privilege
+        )
+
+    def prefetch(self, privilege: int) -> tuple[RegionField, PhysicalRegion]:
+        # Accessing the data flushes the scheduling window, so the mapping
+        # is issued after all pending operations on the storage
+        data = self.data
+        assert isinstance(data, RegionField)
+        return data, data.get_inline_mapped_region(privilege, wait=False)
 
     def find_key_partition(
         self, restrictions: tuple[Restriction, ...]
@@ -750,6 +986,14 @@ class Storage:
             partition = self._parent.find_key_partition(restrictions)
         return partition
 
+    def get_key_partition_signature(self) -> tuple[Any, ...]:
+        partition = runtime.partition_manager.get_storage_key_partition(
+            self._unique_id
+        )
+        if self._parent is None:
+            return (partition,)
+        return (partition,) + self._parent.parent.get_key_partition_signature()
+
     def set_key_partition(self, partition: PartitionBase) -> None:
         runtime.partition_manager.record_storage_key_partition(
             self._unique_id, partition
@@ -907,6 +1151,7 @@ class Store:
         # when no custom functor is given
         self._projection: Union[None, int] = None
         self._restrictions: Union[None, tuple[Restriction, ...]] = None
+        self._numpy_views: dict[bool, weakref.ref[np.ndarray[Any, Any]]] = {}
 
         if self._shape is not None:
             if any(extent < 0 for extent in self._shape.extents):
@@ -916,6 +1161,12 @@ class Store:
                 f"Store does not yet support variable size type {dtype}"
             )
 
+    def __del__(self) -> None:
+        # The partition manager is gone once the runtime is destroyed
+        if runtime.destroyed:
+            return
+        runtime.partition_manager.reclaim_store(self._unique_id)
+
     @property
     def linear(self) -> bool:
         return self._storage.linear
@@ -1045,6 +1296,30 @@ class Store:
     def has_storage(self) -> bool:
         return self._storage.has_data
 
+    async def get_value_async(self) -> Any:
+        """
+        Returns the value of a scalar store once the operation producing it
+        finishes, without blocking the event loop while it is running
+
+        Returns
+        -------
+        Any
+            A NumPy scalar holding the value of the store
+
+        Raises
+        ------
+        ValueError
+            If the store is not scalar
+        """
+        if not self.scalar:
+            raise ValueError("Only the value of a scalar store can be read")
+        future = self.storage
+        if TYPE_CHECKING:
+            assert isinstance(future, Future)
+        dtype = self.type.to_numpy_dtype()
+        buf = await future.get_buffer_async(dtype.itemsize)
+        return np.frombuffer(buf, dtype=dtype)[0]
+
     def same_root(self, rhs: Store) -> bool:
         return self._storage.get_root() is rhs._storage.get_root()
 
@@ -1533,25 +1808,169 @@ class Store:
             shape=new_shape,
         )
 
-    def get_inline_allocation(self) -> InlineMappedAllocation:
+    def get_inline_allocation(
+        self, read_only: bool = False, write_discard: bool = False
+    ) -> InlineMappedAllocation:
         """
         Creates an inline allocation for the store.
 
+        Parameters
+        ----------
+        read_only : bool
+            Whether the allocation will only be read. A read-only mapping
+            doesn't invalidate other copies of the store's data.
+        write_discard : bool
+            Whether the allocation will be overwritten without being read.
+            A write-discard mapping doesn't fetch the store's data.
+
         Notes
         -------
         This call blocks the client's control flow. And it fetches the data for
-        the whole store on a single node.
+        the whole store on a single node. For a slice of a store, only the
+        data of the slice is fetched, unless the store is already mapped.
+        Mapping a store unmaps the mappings of its slices that it would
+        interfere with, after which the allocations and arrays obtained
+        from those slices must not be used.
 
         Returns
         -------
         InlineMappedAllocation
             A helper object wrapping the allocation
+
+        Raises
+        ------
+        ValueError
+            If both ``read_only`` and ``write_discard`` are ``True``
+        RuntimeError
+            If the mapping would interfere with a mapping of an overlapping
+            slice that is still in use
         """
         assert self.kind is RegionField
         return self._storage.get_inline_allocation(
             self.shape,
             transform=self._transform.get_inverse_transform(self.shape.ndim),
+            privilege=InlineMapping.get_privilege(read_only, write_discard),
+        )
+
+    def prefetch(
+        self, read_only: bool = False, write_discard: bool = False
+    ) -> PrefetchedMapping:
+        """
+        Issues an inline mapping of the store without waiting for its data,
+        so that the data movement overlaps with the operations running in
+        the meantime. The scheduling window is flushed first, so the mapping
+        sees the results of all operations issued before this call.
+
+        Parameters
+        ----------
+        read_only : bool
+            Whether the store will only be read
+        write_discard : bool
+            Whether the store will be overwritten without being read
+
+        Returns
+        -------
+        PrefetchedMapping
+            A handle whose ``get_inline_allocation`` returns an allocation
+            once the data is ready. The store stays mapped while the handle
+            is alive.
+
+        Raises
+        ------
+        ValueError
+            If the store is not backed by a region, or if both ``read_only``
+            and ``write_discard`` are ``True``
+        """
+        if self.kind is not RegionField:
+            raise ValueError("Only stores backed by regions can be prefetched")
+        region_field, physical_region = self._storage.prefetch(
+            InlineMapping.get_privilege(read_only, write_discard)
         )
+        return PrefetchedMapping(
+            self, region_field, physical_region, read_only, write_discard
+        )
+
+    def to_numpy(self, read_only: bool = False) -> np.ndarray[Any, Any]:
+        """
+        Returns a NumPy array that shares the memory of the store
+
+        Repeated calls return the same array for as long as it is alive,
+        and the store stays mapped until all arrays returned for it are
+        collected. Arrays of stores backed by futures are never writeable.
+
+        Parameters
+        ----------
+        read_only : bool
+            If ``True``, the store is mapped read-only and the returned
+            array is not writeable
+
+        Notes
+        -----
+        This call blocks the client's control flow. And it fetches the data for
+        the whole store on a single node.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array aliasing the store
+
+        Raises
+        ------
+        RuntimeError
+            If a writeable array is requested while the store is mapped
+            read-only
+        """
+        view_ref = self._numpy_views.get(read_only)
+        if view_ref is not None and (view := view_ref()) is not None:
+            return view
+        dtype = self.type.to_numpy_dtype()
+        if self.kind is Future:
+            future = self.storage
+            if TYPE_CHECKING:
+                assert isinstance(future, Future)
+            array = np.frombuffer(
+                future.get_buffer(dtype.itemsize), dtype=dtype
+            ).reshape(self.shape.extents)
+        else:
+
+            def make_array(
+                shape: tuple[int, ...], address: int, strides: tuple[int, ...]
+            ) -> np.ndarray[Any, Any]:
+                interface = {
+                    "version": 3,
+                    "shape": shape,
+                    "typestr": dtype.str,
+                    "data": (address, read_only),
+                    "strides": strides,
+                }
+                return np.asarray(_ArrayInterface(interface))
+
+            allocation = self.get_inline_allocation(read_only=read_only)
+            array = allocation.consume(make_array)
+            if self.ndim == 0:
+                array = array.reshape(())
+        # Futures are immutable, so arrays aliasing them are never writeable
+        if read_only or self.kind is Future:
+            array.flags.writeable = False
+        self._numpy_views[read_only] = weakref.ref(array)
+        return array
+
+    @property
+    def __array_interface__(self) -> dict[str, Any]:
+        """
+        Exposes the store to NumPy through the array interface protocol.
+        The store stays mapped for as long as the arrays created from the
+        interface are alive. If the store is only mapped read-only by
+        ``to_numpy``, the interface is read-only as well.
+        """
+        view: Optional[np.ndarray[Any, Any]] = None
+        for read_only in (False, True):
+            view_ref = self._numpy_views.get(read_only)
+            if view_ref is not None and (view := view_ref()) is not None:
+                break
+        if view is None:
+            view = self.to_numpy()
+        return _export_array_interface(view)
 
     def overlaps(self, other: Store) -> bool:
         return self._storage.overlaps(other._storage)
@@ -1580,6 +1999,27 @@ class Store:
             self._unique_id, self.find_restrictions()
         )
 
+    def get_partitioning_signature(self) -> tuple[Any, ...]:
+        """
+        Returns a hashable summary of the properties of the store that the
+        partitioner takes into account. Two stores with the same signature
+        get the same partitions under the same partitioning constraints.
+
+        Returns
+        -------
+        tuple
+            The store's partitioning signature
+        """
+        return (
+            self.kind is Future,
+            self.shape,
+            self._dtype.uid,
+            self._transform,
+            self.comm_volume(),
+            runtime.partition_manager.get_store_key_partition(self._unique_id),
+            self._storage.get_key_partition_signature(),
+        )
+
     def has_key_partition(self, restrictions: tuple[Restriction, ...]) -> bool:
         key_partition = runtime.partition_manager.find_store_key_partition(
             self._unique_id, restrictions
@@ -14,18 +14,17 @@
 #
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol, Tuple
+from typing import TYPE_CHECKING, Optional, Protocol, Tuple
 
 import numpy as np
 
-from . import AffineTransform
+from . import AffineTransform, BufferBuilder
 from .partition import Replicate, Restriction, Tiling
 from .projection import ProjExpr
 from .runtime import runtime
 from .shape import Shape
 
 if TYPE_CHECKING:
-    from . import BufferBuilder
     from .partition import PartitionBase
     from .projection import SymbolicPoint
 
@@ -36,6 +35,9 @@ class NonInvertibleError(Exception):
 
 Restrictions = Tuple[Restriction, ...]
 
+# Maximum number of inversion results memoized by each transform stack
+_MAX_MEMOIZED_INVERSIONS = 32
+
 
 class TransformProto(Protocol):
     def __repr__(self) -> str:
@@ -581,7 +583,7 @@ class TransformStackBase(TransformProto, Protocol):
     def bottom(self) -> bool:
         ...
 
-    def stack(self, transform: Transform) -> TransformStack:
+    def stack(self, transform: Transform) -> TransformStackBase:
         ...
 
     def convert_partition(self, partition: PartitionBase) -> PartitionBase:
@@ -594,16 +596,59 @@ class TransformStackBase(TransformProto, Protocol):
         ...
 
 
+def _compose(inner: Transform, outer: Transform) -> Optional[Transform]:
+    """
+    Composes two adjacent transforms into one, if possible. Returns ``None``
+    when the transforms don't compose.
+    """
+    if isinstance(inner, Shift) and isinstance(outer, Shift):
+        if inner._dim != outer._dim:
+            return None
+        return Shift(inner._dim, inner._offset + outer._offset)
+    elif isinstance(inner, Transpose) and isinstance(outer, Transpose):
+        return Transpose(tuple(inner._axes[axis] for axis in outer._axes))
+    return None
+
+
+def _is_noop(transform: Transform) -> bool:
+    if isinstance(transform, Shift):
+        return transform._offset == 0
+    elif isinstance(transform, Transpose):
+        return all(idx == axis for idx, axis in enumerate(transform._axes))
+    return False
+
+
 class TransformStack(TransformStackBase):
     def __init__(
         self, transform: Transform, parent: TransformStackBase
     ) -> None:
         self._transform = transform
         self._parent = parent
+        self._hash = hash((transform, parent))
+        # Stacks are immutable, so the results of inversions and
+        # serialization are computed once and reused by every task that
+        # uses the stack
+        self._inverted_partitions: dict[PartitionBase, PartitionBase] = {}
+        self._inverted_points: dict[SymbolicPoint, SymbolicPoint] = {}
+        self._inverse_transforms: dict[int, AffineTransform] = {}
+        self._serialized: dict[bool, bytes] = {}
 
     def __str__(self) -> str:
         return f"{self._transform} >> {self._parent}"
 
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        return (
+            isinstance(other, TransformStack)
+            and self._hash == other._hash
+            and self._transform == other._transform
+            and self._parent == other._parent
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
     def __repr__(self) -> str:
         return str(self)
 
@@ -637,21 +682,31 @@ class TransformStack(TransformStackBase):
         )
 
     def _invert_partition(self, partition: PartitionBase) -> PartitionBase:
-        return self._parent._invert_partition(
-            self._transform.invert(partition)
-        )
+        result = self._inverted_partitions.get(partition)
+        if result is None:
+            result = self._parent._invert_partition(
+                self._transform.invert(partition)
+            )
+            if len(self._inverted_partitions) >= _MAX_MEMOIZED_INVERSIONS:
+                self._inverted_partitions.clear()
+            self._inverted_partitions[partition] = result
+        return result
 
     def invert_partition(self, partition: PartitionBase) -> PartitionBase:
         if isinstance(partition, Replicate):
             return partition
-        return self._parent._invert_partition(
-            self._transform.invert(partition)
-        )
+        return self._invert_partition(partition)
 
     def invert_symbolic_point(self, dims: SymbolicPoint) -> SymbolicPoint:
-        return self._parent.invert_symbolic_point(
-            self._transform.invert_symbolic_point(dims)
-        )
+        result = self._inverted_points.get(dims)
+        if result is None:
+            result = self._parent.invert_symbolic_point(
+                self._transform.invert_symbolic_point(dims)
+            )
+            if len(self._inverted_points) >= _MAX_MEMOIZED_INVERSIONS:
+                self._inverted_points.clear()
+            self._inverted_points[dims] = result
+        return result
 
     def convert_restrictions(self, restrictions: Restrictions) -> Restrictions:
         return self._transform.convert_restrictions(
@@ -664,16 +719,38 @@ class TransformStack(TransformStackBase):
         )
 
     def get_inverse_transform(self, ndim: int) -> AffineTransform:
-        transform = self._transform.get_inverse_transform(ndim)
-        parent = self._parent.get_inverse_transform(transform.M)
-        return transform.compose(parent)
+        # The composed transform is cached, so callers must not modify it
+        result = self._inverse_transforms.get(ndim)
+        if result is None:
+            transform = self._transform.get_inverse_transform(ndim)
+            parent = self._parent.get_inverse_transform(transform.M)
+            result = transform.compose(parent)
+            self._inverse_transforms[ndim] = result
+        return result
 
-    def stack(self, transform: Transform) -> TransformStack:
-        return TransformStack(transform, self)
+    def stack(self, transform: Transform) -> TransformStackBase:
+        # Adjacent shifts of the same dimension and adjacent transposes are
+        # merged, so chains of slices and transposes don't deepen the stack
+        merged = _compose(self._transform, transform)
+        if merged is None:
+            return TransformStack(transform, self)
+        elif _is_noop(merged):
+            return self._parent
+        else:
+            return self._parent.stack(merged)
 
     def serialize(self, buf: BufferBuilder) -> None:
-        self._transform.serialize(buf)
-        self._parent.serialize(buf)
+        # The serialized transforms are packed once per stack and appended
+        # to the buffer as a single chunk afterwards
+        data = self._serialized.get(buf.type_safe)
+        if data is None:
+            sub = BufferBuilder(type_safe=buf.type_safe)
+            self._transform.serialize(sub)
+            self._parent.serialize(sub)
+            packed = sub.get_string()
+            assert packed is not None
+            data = self._serialized[buf.type_safe] = packed
+        buf.pack_bytes(data)
 
 
 class IdentityTransform(TransformStackBase):
@@ -683,6 +760,12 @@ class IdentityTransform(TransformStackBase):
     def __str__(self) -> str:
         return "id"
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IdentityTransform)
+
+    def __hash__(self) -> int:
+        return hash(IdentityTransform)
+
     def __repr__(self) -> str:
         return str(self)
 
@@ -727,7 +810,7 @@ class IdentityTransform(TransformStackBase):
     def get_inverse_transform(self, ndim: int) -> AffineTransform:
         return AffineTransform(ndim, ndim, True)
 
-    def stack(self, transform: Transform) -> TransformStack:
+    def stack(self, transform: Transform) -> TransformStackBase:
         return TransformStack(transform, self)
 
     def serialize(self, buf: BufferBuilder) -> None:
@@ -15,19 +15,26 @@
 from __future__ import annotations
 
 import traceback
+from collections import OrderedDict
 from ctypes import CDLL, RTLD_GLOBAL
+from dataclasses import dataclass
 from types import TracebackType
 from typing import (
     Any,
+    Callable,
+    Generic,
     Hashable,
     Iterable,
     Iterator,
     MutableSet,
     Optional,
     TypeVar,
+    Union,
 )
 
 T = TypeVar("T", bound="Hashable")
+K = TypeVar("K", bound="Hashable")
+V = TypeVar("V")
 
 
 class OrderedSet(MutableSet[T]):
@@ -69,6 +76,75 @@ class OrderedSet(MutableSet[T]):
         return OrderedSet(obj for obj in self if obj not in other)
 
 
+@dataclass(frozen=True)
+class CacheStats:
+    size: int
+    capacity: int
+    evictions: int
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A mapping that holds at most ``capacity`` entries and evicts the least
+    recently used entry when a new entry would exceed the capacity. A
+    capacity of 0 means the cache is unbounded.
+
+    An optional callback is invoked with the key and value of every evicted
+    entry.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        on_evict: Optional[Callable[[K, V], None]] = None,
+    ) -> None:
+        self._capacity = max(capacity, 0)
+        self._on_evict = on_evict
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._evictions = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(len(self._entries), self._capacity, self._evictions)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self._capacity == 0:
+            return
+        while len(self._entries) > self._capacity:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(evicted_key, evicted)
+
+    def pop(self, key: K, default: Union[V, None] = None) -> Optional[V]:
+        return self._entries.pop(key, default)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 def cast_tuple(value: Any) -> tuple[Any, ...]:
     return value if isinstance(value, tuple) else tuple(value)
 
@@ -20,6 +20,7 @@ from .util.settings import (
     Settings,
     convert_bool,
     convert_int,
+    convert_str,
 )
 
 __all__ = ("settings",)
@@ -68,6 +69,21 @@ class LegateRuntimeSettings(Settings):
         """,
     )
 
+    batch_partitioning: PrioritizedSetting[bool] = PrioritizedSetting(
+        "batch_partitioning",
+        "LEGATE_BATCH_PARTITIONING",
+        default=False,
+        convert=convert_bool,
+        help="""
+        Whether to solve partitioning constraints jointly for consecutive
+        operations in the scheduling window that target the same machine.
+        Stores produced by one operation in a batch and consumed by a later
+        one are then assigned the same partition, which avoids repartitioning
+        between the two operations. Only effective when the window size is
+        larger than 1.
+        """,
+    )
+
     test: EnvOnlySetting[bool] = EnvOnlySetting(
         "test",
         "LEGATE_TEST",
@@ -136,6 +152,185 @@ class LegateRuntimeSettings(Settings):
         """,
     )
 
+    strategy_cache_size: PrioritizedSetting[int] = PrioritizedSetting(
+        "strategy_cache_size",
+        "LEGATE_STRATEGY_CACHE_SIZE",
+        default=1024,
+        convert=convert_int,
+        help="""
+        The maximum number of partitioning strategies to cache. Operations
+        that have the same task, the same constraints, and stores with the
+        same shapes, types, transforms, and key partitions as a previously
+        partitioned operation reuse its strategy instead of invoking the
+        solver again. A value of 0 disables the cache.
+        """,
+    )
+
+    launch_space_cache_size: PrioritizedSetting[int] = PrioritizedSetting(
+        "launch_space_cache_size",
+        "LEGATE_LAUNCH_SPACE_CACHE_SIZE",
+        default=1024,
+        convert=convert_int,
+        help="""
+        The maximum number of launch shapes the partition manager caches.
+        The least recently used entries are evicted first. A value of 0 means
+        the cache is unbounded.
+        """,
+    )
+
+    partition_cache_size: PrioritizedSetting[int] = PrioritizedSetting(
+        "partition_cache_size",
+        "LEGATE_PARTITION_CACHE_SIZE",
+        default=8192,
+        convert=convert_int,
+        help="""
+        The maximum number of Legion partitions the partition manager caches.
+        The least recently used entries are evicted first, and evicted
+        partitions are looked up again on demand. A value of 0 means the
+        cache is unbounded.
+        """,
+    )
+
+    key_partition_cache_size: PrioritizedSetting[int] = PrioritizedSetting(
+        "key_partition_cache_size",
+        "LEGATE_KEY_PARTITION_CACHE_SIZE",
+        default=65536,
+        convert=convert_int,
+        help="""
+        The maximum number of stores and storages (each) whose key partitions
+        the partition manager keeps. The least recently used entries are
+        evicted first. Entries of destroyed stores and storages are always
+        dropped. A value of 0 means the cache is unbounded.
+        """,
+    )
+
+    launch_shape_planner: PrioritizedSetting[str] = PrioritizedSetting(
+        "launch_shape_planner",
+        "LEGATE_LAUNCH_SHAPE_PLANNER",
+        default="cost",
+        convert=convert_str,
+        help="""
+        How to choose launch shapes for key partitions. "cost" picks the
+        number of pieces and their layout that minimize the estimated
+        computation and communication cost, without making pieces smaller
+        than the minimum chunk size of the processor kind. "uniform" always
+        uses all processors once an array is larger than the minimum chunk
+        size.
+        """,
+    )
+
+    launcher_template_cache_size: PrioritizedSetting[int] = PrioritizedSetting(
+        "launcher_template_cache_size",
+        "LEGATE_LAUNCHER_TEMPLATE_CACHE_SIZE",
+        default=256,
+        convert=convert_int,
+        help="""
+        The maximum number of task launcher templates to cache. A template
+        holds the coalesced region requirements of a task launch and the
+        serialized store arguments of its last launch, which are reused by
+        later launches of the same task with the same requirement layout
+        instead of analyzing and serializing them again. A value of 0
+        disables the cache.
+        """,
+    )
+
+    detachment_prune_limit: PrioritizedSetting[int] = PrioritizedSetting(
+        "detachment_prune_limit",
+        "LEGATE_DETACHMENT_PRUNE_LIMIT",
+        default=4,
+        convert=convert_int,
+        help="""
+        The maximum number of pending detachments checked for completion
+        after each dispatched operation. Detachments are checked oldest
+        first, and a full sweep is done only when the number of pending
+        detachments doubles since the last sweep.
+        """,
+    )
+
+    field_pool_slack: PrioritizedSetting[int] = PrioritizedSetting(
+        "field_pool_slack",
+        "LEGATE_FIELD_POOL_SLACK",
+        default=0,
+        convert=convert_int,
+        help="""
+        The maximum percentage by which a field borrowed from a larger region
+        can exceed the size of the store using it. When a store has no free
+        field of its exact shape, a free field of the same size from a region
+        at least as large in every dimension is reused through a subregion,
+        instead of creating a new region. A value of 0 disables borrowing.
+        """,
+    )
+
+    field_reuse_budget: PrioritizedSetting[int] = PrioritizedSetting(
+        "field_reuse_budget",
+        "LEGATE_FIELD_REUSE_BUDGET",
+        default=0,
+        convert=convert_int,
+        help="""
+        The maximum number of bytes of outstanding fields allocated instead
+        of reusing a free field whose detachment is still pending. With a
+        non-zero budget, free fields whose detachments are done are
+        preferred. A fallback field stops counting against the budget once
+        it is reused or destroyed. While the budget is spent, and always
+        with a budget of 0, reusing a field takes the oldest free field and
+        blocks until its detachment is done. This setting has no effect with
+        control replication, where every shard must reuse the same field.
+        """,
+    )
+
+    max_retained_region_bytes: PrioritizedSetting[int] = PrioritizedSetting(
+        "max_retained_region_bytes",
+        "LEGATE_MAX_RETAINED_REGION_BYTES",
+        default=0,
+        convert=convert_int,
+        help="""
+        The maximum number of bytes that regions with no live fields can hold
+        while being kept around for reuse. The size of a region is its
+        volume times the sum of the sizes of its fields. Once the limit is
+        exceeded, the least recently freed regions are destroyed. A value of
+        0 caps the number of such regions instead, using the limit given by
+        the LEGATE_CORE_TUNABLE_MAX_LRU_LENGTH tunable.
+        """,
+    )
+
+    tree_reduce_max_fanin_bytes: PrioritizedSetting[int] = PrioritizedSetting(
+        "tree_reduce_max_fanin_bytes",
+        "LEGATE_TREE_REDUCE_MAX_FANIN_BYTES",
+        default=268435456,
+        convert=convert_int,
+        help="""
+        The maximum number of bytes that a reducer task in a tree reduction
+        should get from its inputs, when the size of the inputs is known.
+        The fan-in of a reduction tree chosen by the runtime is halved until
+        the inputs of a reducer fit in this many bytes, or the fan-in
+        becomes 2. A value of 0 means no limit.
+        """,
+    )
+
+    adaptive_window: PrioritizedSetting[bool] = PrioritizedSetting(
+        "adaptive_window",
+        "LEGATE_ADAPTIVE_WINDOW",
+        default=False,
+        convert=convert_bool,
+        help="""
+        Whether to adapt the scheduling window size at runtime. Starting from
+        the window size, the window grows while operations are submitted in
+        quick succession and shrinks when the program blocks on the results
+        of outstanding operations before the window fills up.
+        """,
+    )
+
+    max_window_size: PrioritizedSetting[int] = PrioritizedSetting(
+        "max_window_size",
+        "LEGATE_MAX_WINDOW_SIZE",
+        default=256,
+        convert=convert_int,
+        help="""
+        The maximum number of Legate operations the scheduling window can
+        accumulate when the window size is adaptive.
+        """,
+    )
+
     max_pending_exceptions: EnvOnlySetting[int] = EnvOnlySetting(
         "max_pending_exceptions",
         "LEGATE_MAX_PENDING_EXCEPTIONS",
@@ -109,6 +109,11 @@ class Time:
     def __rdiv__(self, lhs: Union[int, float]) -> float:
         return lhs / self.get_value()
 
+    async def get_value_async(self) -> Union[int, float]:
+        if self.value is None:
+            await self.future.wait_async()
+        return self.get_value()
+
     def get_value(self) -> Union[int, float]:
         if self.value is None:
             if self.dtype == ty.int64:
@@ -141,6 +141,9 @@ void legate_core_perform_registration(void);
 void legate_register_affine_projection_functor(
   int32_t, int32_t, int32_t*, int32_t*, int32_t*, legion_projection_id_t);
 
+void legate_register_affine_projection_functors(
+  uint32_t, int32_t*, int32_t*, int32_t*, int32_t*, int32_t*, legion_projection_id_t*);
+
 void legate_create_sharding_functor_using_projection(
   legion_sharding_id_t, legion_projection_id_t, uint32_t, uint32_t, uint32_t);
 
@@ -297,6 +297,30 @@ void legate_register_affine_projection_functor(int32_t src_ndim,
                           proj_id);
 }
 
+void legate_register_affine_projection_functors(uint32_t num_functors,
+                                                int32_t* src_ndims,
+                                                int32_t* tgt_ndims,
+                                                int32_t* dims,
+                                                int32_t* weights,
+                                                int32_t* offsets,
+                                                legion_projection_id_t* proj_ids)
+{
+  // The specs of all functors are concatenated in dims, weights, and offsets
+  auto runtime   = Legion::Runtime::get_runtime();
+  int32_t offset = 0;
+  for (uint32_t idx = 0; idx < num_functors; ++idx) {
+    legate::double_dispatch(src_ndims[idx],
+                            tgt_ndims[idx],
+                            legate::create_affine_functor_fn{},
+                            runtime,
+                            dims + offset,
+                            weights + offset,
+                            offsets + offset,
+                            proj_ids[idx]);
+    offset += tgt_ndims[idx];
+  }
+}
+
 void* legate_linearizing_point_transform_functor()
 {
   return legate::linearizing_point_transform_functor;
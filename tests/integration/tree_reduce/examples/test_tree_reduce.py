@@ -38,6 +38,28 @@ def test_tree_reduce_normal():
     assert not result.unbound
 
 
+@pytest.mark.parametrize("axis", (None, 0, 1))
+def test_tree_reduce_2d(axis):
+    num_tasks = user_lib.cffi.NUM_NORMAL_PRODUCER
+    tile_size = user_lib.cffi.TILE_SIZE
+    task = user_context.create_manual_task(
+        user_lib.shared_object.PRODUCE_NORMAL, Rect([num_tasks, 2])
+    )
+    store = user_context.create_store(
+        ty.int64, shape=(num_tasks * tile_size, 2 * tile_size)
+    )
+    part = store.partition_by_tiling((tile_size, tile_size))
+    task.add_output(part)
+    task.execute()
+
+    result = user_context.tree_reduce(
+        user_lib.shared_object.REDUCE_NORMAL_2D, store, radix=2, axis=axis
+    )
+    # The result should be a normal store of the same dimensionality
+    assert not result.unbound
+    assert result.ndim == 2
+
+
 def test_tree_reduce_unbound():
     num_tasks = 4
     task = user_context.create_manual_task(
@@ -69,6 +91,18 @@ def test_tree_single_proc():
     assert not result.unbound
 
 
+def test_tree_reduce_invalid_args():
+    store = user_context.create_store(ty.int64, shape=(4, 4))
+    with pytest.raises(ValueError):
+        user_context.tree_reduce(
+            user_lib.shared_object.REDUCE_NORMAL, store, radix=1
+        )
+    with pytest.raises(ValueError):
+        user_context.tree_reduce(
+            user_lib.shared_object.REDUCE_NORMAL, store, axis=2
+        )
+
+
 if __name__ == "__main__":
     import sys
 
@@ -18,6 +18,7 @@
 #include "produce_normal.h"
 #include "produce_unbound.h"
 #include "reduce_normal.h"
+#include "reduce_normal_2d.h"
 #include "reduce_unbound.h"
 
 namespace tree_reduce {
@@ -34,6 +35,7 @@ void registration_callback()
   ReduceUnboundTask::register_variants(context);
   ProduceNormalTask::register_variants(context);
   ReduceNormalTask::register_variants(context);
+  ReduceNormal2DTask::register_variants(context);
 }
 
 }  // namespace tree_reduce
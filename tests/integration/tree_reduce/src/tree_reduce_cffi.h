@@ -27,10 +27,11 @@ enum Constants {
 };
 
 enum TreeReduceOpCode {
-  PRODUCE_NORMAL  = 0,
-  REDUCE_NORMAL   = 1,
-  PRODUCE_UNBOUND = 2,
-  REDUCE_UNBOUND  = 3,
+  PRODUCE_NORMAL   = 0,
+  REDUCE_NORMAL    = 1,
+  PRODUCE_UNBOUND  = 2,
+  REDUCE_UNBOUND   = 3,
+  REDUCE_NORMAL_2D = 4,
 
 };
 
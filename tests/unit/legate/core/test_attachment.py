@@ -0,0 +1,169 @@
+# Copyright 2022 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gc
+from collections import deque
+from typing import Any
+
+import pytest
+
+from legate.core import get_legate_runtime
+from legate.core.runtime import AttachmentManager
+
+
+class FakeRegionField:
+    pass
+
+
+class TestAttachmentOverlap:
+    def make_buffer(self) -> memoryview:
+        # Slices of the same buffer give allocations at known offsets
+        return memoryview(bytearray(64))
+
+    def attach(
+        self, manager: AttachmentManager, buf: memoryview, rf: Any
+    ) -> None:
+        manager.attach_external_allocation(buf, rf)
+
+    def test_adjacent(self) -> None:
+        manager = AttachmentManager(get_legate_runtime())
+        buf = self.make_buffer()
+        rfs = [FakeRegionField() for _ in range(3)]
+        self.attach(manager, buf[16:32], rfs[0])
+        self.attach(manager, buf[0:16], rfs[1])
+        self.attach(manager, buf[32:48], rfs[2])
+        assert len(manager._attachment_ptrs) == 3
+        assert manager._attachment_ptrs == sorted(manager._attachment_ptrs)
+
+    @pytest.mark.parametrize("lo, hi", [(8, 24), (24, 40), (15, 17), (31, 33)])
+    def test_overlapping(self, lo: int, hi: int) -> None:
+        manager = AttachmentManager(get_legate_runtime())
+        buf = self.make_buffer()
+        rf = FakeRegionField()
+        self.attach(manager, buf[16:32], rf)
+        with pytest.raises(RuntimeError):
+            self.attach(manager, buf[lo:hi], FakeRegionField())
+
+    @pytest.mark.parametrize("lo, hi", [(20, 28), (0, 64), (16, 32)])
+    def test_nested(self, lo: int, hi: int) -> None:
+        manager = AttachmentManager(get_legate_runtime())
+        buf = self.make_buffer()
+        rf = FakeRegionField()
+        self.attach(manager, buf[16:32], rf)
+        with pytest.raises(RuntimeError):
+            self.attach(manager, buf[lo:hi], FakeRegionField())
+
+    def test_empty(self) -> None:
+        manager = AttachmentManager(get_legate_runtime())
+        buf = self.make_buffer()
+        rf = FakeRegionField()
+        self.attach(manager, buf[16:32], rf)
+        # Empty buffers don't overlap with anything and aren't indexed
+        self.attach(manager, buf[20:20], FakeRegionField())
+        assert len(manager._attachment_ptrs) == 1
+
+    def test_removed(self) -> None:
+        manager = AttachmentManager(get_legate_runtime())
+        buf = self.make_buffer()
+        rf = FakeRegionField()
+        self.attach(manager, buf[16:32], rf)
+        manager._remove_allocation(buf[16:32])
+        assert manager._attachment_ptrs == []
+
+        other = FakeRegionField()
+        self.attach(manager, buf[8:40], other)
+        assert len(manager._attachment_ptrs) == 1
+
+    def test_collected(self) -> None:
+        manager = AttachmentManager(get_legate_runtime())
+        buf = self.make_buffer()
+        rfs = [FakeRegionField() for _ in range(2)]
+        self.attach(manager, buf[0:16], rfs[0])
+        self.attach(manager, buf[16:32], rfs[1])
+        del rfs
+        gc.collect()
+
+        # Attachments whose region fields are collected are dropped when
+        # they're found to overlap with a new one
+        rf: Any = FakeRegionField()
+        self.attach(manager, buf[8:24], rf)
+        assert (
+            manager._attachments_by_ptr[
+                manager._attachment_ptrs[0]
+            ].region_field
+            is rf
+        )
+        assert len(manager._attachment_ptrs) == 1
+
+
+class FakeFuture:
+    def __init__(self, ready: bool) -> None:
+        self.ready = ready
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+
+class TestPruneDetachments:
+    def make_manager(
+        self, monkeypatch: pytest.MonkeyPatch, ready: list[bool]
+    ) -> tuple[AttachmentManager, list[Any]]:
+        manager = AttachmentManager(get_legate_runtime())
+        monkeypatch.setattr(manager, "_prune_limit", 2)
+        monkeypatch.setattr(manager, "_full_prune_threshold", len(ready))
+        futures = [FakeFuture(r) for r in ready]
+        pending: Any = deque((future, None) for future in futures)
+        monkeypatch.setattr(manager, "_pending_detachments", pending)
+        return manager, futures
+
+    def test_partial(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        manager, futures = self.make_manager(monkeypatch, [True] * 5)
+        manager.prune_detachments()
+        # Only up to the prune limit are dropped, oldest first
+        assert manager.num_pending_detachments == 3
+        assert manager._pending_detachments[0][0] is futures[2]
+
+    def test_partial_in_flight(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        manager, futures = self.make_manager(monkeypatch, [False, True, True])
+        manager.prune_detachments()
+        # A partial prune stops at the first detachment still in flight
+        assert manager.num_pending_detachments == 3
+
+    def test_full(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        manager, futures = self.make_manager(
+            monkeypatch, [False, True, True, True, True]
+        )
+        manager.prune_detachments(full=True)
+        assert manager.num_pending_detachments == 1
+
+        futures[0].ready = True
+        manager.prune_detachments(full=True)
+        assert manager.num_pending_detachments == 0
+
+    def test_threshold(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        manager, futures = self.make_manager(monkeypatch, [False, True, True])
+        # Once the pending detachments outgrow the threshold, a partial
+        # prune falls back to a full sweep
+        pending: Any = manager._pending_detachments
+        pending.append((FakeFuture(True), None))
+        manager.prune_detachments()
+        assert manager.num_pending_detachments == 1
+        assert manager._full_prune_threshold == 2
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
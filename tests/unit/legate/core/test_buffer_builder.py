@@ -0,0 +1,213 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+import numpy as np
+import pytest
+
+from legate.core import BufferBuilder, BufferBuilderPool, Point, legion
+from legate.core._legion.transform import AffineTransform
+
+SCALARS = (
+    ("pack_8bit_int", "b", -3),
+    ("pack_16bit_int", "h", 300),
+    ("pack_32bit_int", "i", -7),
+    ("pack_64bit_int", "q", 1 << 40),
+    ("pack_8bit_uint", "B", 250),
+    ("pack_16bit_uint", "H", 6000),
+    ("pack_32bit_uint", "I", 1 << 31),
+    ("pack_64bit_uint", "Q", 1 << 63),
+    ("pack_32bit_float", "f", 1.5),
+    ("pack_64bit_float", "d", 2.25),
+    ("pack_bool", "?", True),
+    ("pack_16bit_float", "h", 123),
+)
+
+
+class TestBufferBuilder:
+    @pytest.mark.parametrize("method,fmt,value", SCALARS)
+    def test_scalar(self, method: str, fmt: str, value: Any) -> None:
+        buf = BufferBuilder()
+        getattr(buf, method)(value)
+        expected = struct.pack("=" + fmt, value)
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_scalar_type_safe(self) -> None:
+        buf = BufferBuilder(type_safe=True)
+        buf.pack_32bit_int(5)
+        buf.pack_bool(False)
+        expected = struct.pack(
+            "=iii?",
+            legion.LEGION_TYPE_INT32,
+            5,
+            legion.LEGION_TYPE_BOOL,
+            False,
+        )
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_complex(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_64bit_complex(1 + 2j)
+        buf.pack_128bit_complex(3 - 4j)
+        expected = struct.pack("=ffdd", 1, 2, 3, -4)
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_string(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_string("legate")
+        expected = struct.pack("=I6c", 6, *(c.encode() for c in "legate"))
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_string_type_safe(self) -> None:
+        buf = BufferBuilder(type_safe=True)
+        buf.pack_string("ab")
+        char_type = legion.LEGION_TYPE_TOTAL + 1
+        expected = struct.pack(
+            "=iIicic",
+            legion.LEGION_TYPE_UINT32,
+            2,
+            char_type,
+            b"a",
+            char_type,
+            b"b",
+        )
+        assert buf.get_string() == expected
+
+    def test_point(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_point(Point((1, 2, 3)))
+        expected = struct.pack("=qqq", 1, 2, 3)
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_accessor(self) -> None:
+        transform = AffineTransform(2, 3, eye=False)
+        transform.transform[:2, :3] = np.arange(6).reshape(2, 3)
+        transform.offset = 7
+        buf = BufferBuilder()
+        buf.pack_accessor(5, transform)
+        expected = struct.pack(
+            "=iii" + "q" * 8, 5, 2, 3, 0, 1, 2, 3, 4, 5, 7, 7
+        )
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_ndarray(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_ndarray(np.array([[1, 2], [3, 4]], dtype=np.int32).T)
+        expected = struct.pack("=iiii", 1, 3, 2, 4)
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_ndarray_type_safe(self) -> None:
+        buf = BufferBuilder(type_safe=True)
+        buf.pack_ndarray(np.array([1.5, 2.5], dtype=np.float64))
+        code = legion.LEGION_TYPE_FLOAT64
+        expected = struct.pack("=idid", code, 1.5, code, 2.5)
+        assert buf.get_string() == expected
+
+    def test_buffer(self) -> None:
+        inner = BufferBuilder()
+        inner.pack_32bit_int(1)
+        inner.pack_string("x")
+        buf = BufferBuilder()
+        buf.pack_buffer(inner)
+        expected = struct.pack("=IiIc", 9, 1, 1, b"x")
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    @pytest.mark.parametrize(
+        "dtype", (np.bool_, np.int8, np.uint64, np.float32, np.complex128)
+    )
+    def test_ndarray_dtypes(self, dtype: Any) -> None:
+        array = np.arange(6).reshape(2, 3).astype(dtype)
+        buf = BufferBuilder()
+        buf.pack_ndarray(array)
+        expected = BufferBuilder()
+        for value in array.flat:
+            expected._ndarray_packers[array.dtype.type](expected, value)
+        assert buf.get_string() == expected.get_string()
+
+    def test_empty_ndarray(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_ndarray(np.zeros((0, 2), dtype=np.int64))
+        assert buf.get_string() == b""
+
+    def test_grow(self) -> None:
+        buf = BufferBuilder()
+        values = list(range(1000))
+        for value in values:
+            buf.pack_64bit_int(value)
+        buf.pack_ndarray(np.arange(1000, dtype=np.int64))
+        expected = struct.pack("=2000q", *values, *values)
+        assert buf.get_string() == expected
+        assert buf.get_size() == len(expected)
+
+    def test_get_string_after_packing(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_32bit_int(1)
+        assert buf.get_string() == struct.pack("=i", 1)
+        buf.pack_32bit_int(2)
+        assert buf.get_string() == struct.pack("=ii", 1, 2)
+
+    def test_reset(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_32bit_int(1)
+        assert buf.get_string() == struct.pack("=i", 1)
+        buf.reset()
+        buf.pack_bool(True)
+        assert buf.get_string() == struct.pack("=?", True)
+        assert buf.get_size() == 1
+
+    def test_reset_shorter(self) -> None:
+        buf = BufferBuilder()
+        buf.pack_string("a long string to grow the buffer" * 4)
+        buf.reset()
+        buf.pack_string("ab")
+        assert buf.get_string() == struct.pack("=I2s", 2, b"ab")
+
+
+class TestBufferBuilderPool:
+    def test_reuse(self) -> None:
+        pool = BufferBuilderPool()
+        buf = pool.acquire()
+        buf.pack_32bit_int(1)
+        pool.release(buf)
+        reused = pool.acquire()
+        assert reused is buf
+        assert reused.get_size() == 0
+        assert reused.get_string() == b""
+
+    def test_max_size(self) -> None:
+        pool = BufferBuilderPool(max_size=1)
+        buf1 = pool.acquire()
+        buf2 = pool.acquire()
+        pool.release(buf1)
+        pool.release(buf2)
+        assert pool.acquire() is buf1
+        assert pool.acquire() is not buf2
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
@@ -0,0 +1,61 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from legate.core import gather, get_legate_runtime, types as ty
+
+from .util import make_future, make_value
+
+
+class TestAsync:
+    def test_await(self) -> None:
+        future = make_future(1)
+
+        async def wait() -> None:
+            await future
+
+        asyncio.run(wait())
+        assert future.is_ready()
+
+    def test_get_buffer_async(self) -> None:
+        future = make_future(2)
+        buf = asyncio.run(future.get_buffer_async(8))
+        assert np.frombuffer(buf, dtype=np.int64)[0] == 2
+
+    def test_gather(self) -> None:
+        futures = [make_future(value) for value in range(4)]
+        bufs = asyncio.run(gather(*futures))
+        values = [np.frombuffer(buf, dtype=np.int64)[0] for buf in bufs]
+        assert values == list(range(4))
+
+    def test_store_get_value_async(self) -> None:
+        store = make_value(3)
+        assert asyncio.run(store.get_value_async()) == 3
+
+    def test_non_scalar_store(self) -> None:
+        runtime = get_legate_runtime()
+        store = runtime.create_store(ty.int64, shape=(4,))
+        with pytest.raises(ValueError):
+            asyncio.run(store.get_value_async())
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
@@ -0,0 +1,178 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gc
+
+import numpy as np
+import pytest
+
+from legate.core import Store, get_legate_runtime, types as ty
+
+from .util import make_value
+
+
+def make_store(shape: tuple[int, ...], value: int) -> Store:
+    runtime = get_legate_runtime()
+    store = runtime.create_store(ty.int64, shape=shape)
+    runtime.issue_fill(store, make_value(value))
+    return store
+
+
+class TestToNumpy:
+    def test_values(self) -> None:
+        store = make_store((4, 3), 5)
+        array = store.to_numpy()
+        assert array.shape == (4, 3)
+        assert array.dtype == np.int64
+        assert np.all(array == 5)
+        # Repeated calls return the same array while it's alive
+        assert store.to_numpy() is array
+
+    def test_write(self) -> None:
+        store = make_store((6,), 0)
+        array = store.to_numpy()
+        array[2] = 7
+        del array
+        gc.collect()
+        assert store.to_numpy(read_only=True)[2] == 7
+
+    def test_read_only(self) -> None:
+        store = make_store((6,), 1)
+        array = store.to_numpy(read_only=True)
+        assert not array.flags.writeable
+        with pytest.raises(RuntimeError):
+            store.to_numpy()
+
+    def test_future(self) -> None:
+        array = make_value(3).to_numpy()
+        assert not array.flags.writeable
+        assert array[0] == 3
+
+    def test_array_interface(self) -> None:
+        store = make_store((3, 4), 2)
+        array = np.asarray(store)
+        assert array.flags.writeable
+        array[1, 2] = 9
+        # The store doesn't pin the mapping, the array does
+        gc.collect()
+        assert array[1, 2] == 9
+        assert np.asarray(store)[1, 2] == 9
+
+    def test_array_interface_read_only(self) -> None:
+        store = make_store((3, 4), 4)
+        view = store.to_numpy(read_only=True)
+        array = np.asarray(store)
+        assert not array.flags.writeable
+        assert np.all(array == 4)
+        del view
+        gc.collect()
+        assert np.all(array == 4)
+
+    def test_array_interface_strided(self) -> None:
+        store = make_store((4, 6), 0)
+        store.to_numpy()[...] = np.arange(24).reshape(4, 6)
+        transposed = store.transpose((1, 0))
+        assert np.array_equal(
+            np.asarray(transposed), np.arange(24).reshape(4, 6).T
+        )
+
+
+class TestSliceMapping:
+    def test_slice(self) -> None:
+        store = make_store((10,), 1)
+        sliced = store.slice(0, slice(2, 5))
+        array = sliced.to_numpy()
+        assert array.shape == (3,)
+        assert np.all(array == 1)
+        array[:] = 6
+        del array
+        gc.collect()
+
+        expected = np.ones(10, dtype=np.int64)
+        expected[2:5] = 6
+        assert np.array_equal(store.to_numpy(read_only=True), expected)
+
+    def test_map_store(self) -> None:
+        store = make_store((10,), 1)
+        array = store.slice(0, slice(2, 5)).to_numpy()
+        array[:] = 4
+        # Mapping the store takes over the mapping of the slice
+        whole = store.to_numpy()
+        expected = np.ones(10, dtype=np.int64)
+        expected[2:5] = 4
+        assert np.array_equal(whole, expected)
+        del array
+
+    def test_map_enclosing_slice(self) -> None:
+        store = make_store((10,), 1)
+        inner = store.slice(0, slice(2, 5)).to_numpy()
+        inner[:] = 5
+        outer = store.slice(0, slice(0, 8)).to_numpy(read_only=True)
+        assert np.array_equal(outer[2:5], [5, 5, 5])
+        del inner
+
+    def test_interference(self) -> None:
+        store = make_store((10,), 1)
+        array = store.slice(0, slice(2, 5)).to_numpy()
+        with pytest.raises(RuntimeError):
+            store.slice(0, slice(4, 8)).to_numpy()
+        del array
+
+    def test_read_only_slices(self) -> None:
+        store = make_store((10,), 2)
+        first = store.slice(0, slice(0, 5)).to_numpy(read_only=True)
+        second = store.to_numpy(read_only=True)
+        assert np.all(first == 2)
+        assert np.all(second == 2)
+
+    def test_write_discard(self) -> None:
+        store = make_store((8,), 3)
+        allocation = store.get_inline_allocation(write_discard=True)
+        del allocation
+        with pytest.raises(ValueError):
+            store.get_inline_allocation(read_only=True, write_discard=True)
+
+
+class TestPrefetch:
+    def test_prefetch(self) -> None:
+        store = make_store((8,), 5)
+        mapping = store.prefetch(read_only=True)
+        allocation = mapping.get_inline_allocation()
+        assert mapping.ready
+        del allocation
+        assert np.all(store.to_numpy(read_only=True) == 5)
+        mapping.release()
+        # Releasing twice is harmless
+        mapping.release()
+        with pytest.raises(RuntimeError):
+            mapping.get_inline_allocation()
+
+    def test_prefetch_sees_pending_operations(self) -> None:
+        runtime = get_legate_runtime()
+        store = make_store((8,), 1)
+        runtime.issue_fill(store, make_value(8))
+        mapping = store.prefetch()
+        assert np.all(store.to_numpy() == 8)
+        mapping.release()
+
+    def test_future(self) -> None:
+        with pytest.raises(ValueError):
+            make_value(1).prefetch()
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
@@ -0,0 +1,109 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from legate.core.launch_shape import (
+    CostModelLaunchShapePlanner,
+    UniformLaunchShapePlanner,
+    divisors,
+    prime_factors,
+)
+
+
+def test_prime_factors() -> None:
+    assert prime_factors(1) == ()
+    assert prime_factors(12) == (3, 2, 2)
+    assert prime_factors(13) == (13,)
+    assert prime_factors(34) == (17, 2)
+
+
+def test_prime_factors_invalid() -> None:
+    with pytest.raises(ValueError):
+        prime_factors(0)
+
+
+def test_divisors() -> None:
+    assert divisors(1) == (1,)
+    assert divisors(12) == (1, 2, 3, 4, 6, 12)
+    assert divisors(17) == (1, 17)
+
+
+class TestUniformLaunchShapePlanner:
+    def test_too_small(self) -> None:
+        planner = UniformLaunchShapePlanner()
+        assert planner.plan((100,), 8, 100, 8) is None
+
+    def test_all_pieces(self) -> None:
+        planner = UniformLaunchShapePlanner()
+        assert planner.plan((200,), 8, 100, 8) == (8,)
+        assert planner.plan((1000, 1000), 8, 100, 8) == (2, 4)
+
+    @pytest.mark.parametrize("num_pieces", (13, 17, 26))
+    def test_large_prime_factors(self, num_pieces: int) -> None:
+        planner = UniformLaunchShapePlanner()
+        result = planner.plan((100, 100, 100), num_pieces, 2, 8)
+        assert result is not None
+        assert math.prod(result) == num_pieces
+
+
+class TestCostModelLaunchShapePlanner:
+    def test_too_small(self) -> None:
+        planner = CostModelLaunchShapePlanner()
+        assert planner.plan((100,), 8, 100, 8) is None
+
+    def test_no_shredding(self) -> None:
+        planner = CostModelLaunchShapePlanner()
+        # Only 6 pieces of at least 16384 elements fit in this array
+        assert planner.plan((100000,), 8, 16384, 8) == (6,)
+        assert planner.plan((1000000,), 8, 16384, 8) == (8,)
+
+    def test_square_pieces(self) -> None:
+        planner = CostModelLaunchShapePlanner()
+        assert planner.plan((1000, 1000), 16, 2, 8) == (4, 4)
+        assert planner.plan((4000, 1000), 4, 2, 8) == (4, 1)
+        # Ties are broken in favor of squarer pieces
+        assert planner.plan((1000, 1000), 4, 2, 8) == (2, 2)
+
+    def test_non_divisor_pieces(self) -> None:
+        planner = CostModelLaunchShapePlanner()
+        # 13 pieces would be too small, so the largest feasible number of
+        # pieces is used instead
+        assert planner.plan((200000,), 13, 16384, 8) == (12,)
+        result = planner.plan((4000, 4000), 17, 1 << 20, 8)
+        assert result is not None
+        assert math.prod(result) == 15
+        assert planner.plan((1 << 24,), 17, 1 << 20, 8) == (16,)
+
+    @pytest.mark.parametrize("num_pieces", (13, 17, 26))
+    def test_large_prime_factors(self, num_pieces: int) -> None:
+        planner = CostModelLaunchShapePlanner()
+        result = planner.plan((100, 100, 100), num_pieces, 2, 8)
+        assert result is not None
+        assert math.prod(result) == num_pieces
+
+    def test_contiguous_pieces(self) -> None:
+        planner = CostModelLaunchShapePlanner()
+        # Splitting the last dimension would make rows of 8 bytes
+        assert planner.plan((64, 4), 4, 2, 8) == (4, 1)
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
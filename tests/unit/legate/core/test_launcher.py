@@ -0,0 +1,176 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+
+from legate.core import get_legate_runtime, types as ty
+from legate.core.launcher import (
+    Partition,
+    Permission,
+    RegionFieldArg,
+    RegionReq,
+    RequirementAnalyzer,
+)
+from legate.core.transform import Shift, identity
+
+if TYPE_CHECKING:
+    from legate.core import Partition as LegionPartition, Region
+
+TASK_ID = 12345
+
+
+# The analyzer only compares regions and partitions by identity, so plain
+# objects stand in for them
+def make_region() -> Region:
+    return cast("Region", object())
+
+
+def make_partition() -> LegionPartition:
+    return cast("LegionPartition", object())
+
+
+def analyze(
+    inserts: list[tuple[Any, Permission, Any, int]], task_id: Any = None
+) -> RequirementAnalyzer:
+    analyzer = RequirementAnalyzer()
+    for region, perm, part, field_id in inserts:
+        req = RegionReq(region, perm, Partition(part, 0), 0, 0)
+        analyzer.insert(req, field_id)
+    analyzer.analyze_requirements(task_id)
+    return analyzer
+
+
+def make_inserts(
+    src: object, dst: object, part: object
+) -> list[tuple[Any, Permission, Any, int]]:
+    return [
+        (src, Permission.READ, part, 1),
+        (src, Permission.READ, part, 2),
+        (dst, Permission.WRITE, part, 3),
+        (dst, Permission.READ, part, 3),
+    ]
+
+
+class TestLauncherTemplate:
+    def setup_method(self) -> None:
+        get_legate_runtime().launcher_template_cache.clear()
+
+    def test_same_layout_reuses_template(self) -> None:
+        template_cache = get_legate_runtime().launcher_template_cache
+        if not template_cache.enabled:
+            pytest.skip("launcher template cache is disabled")
+        hits = template_cache.hits
+        src, dst, part = object(), object(), object()
+        first = analyze(make_inserts(src, dst, part), TASK_ID)
+        # Swapping the buffers keeps the structure of the requirements
+        second = analyze(make_inserts(dst, src, part), TASK_ID)
+        assert template_cache.hits == hits + 1
+
+        expected = analyze(make_inserts(dst, src, part))
+        assert second.requirements == expected.requirements
+        assert first.requirements != second.requirements
+        for req, fields in expected.requirements:
+            for field_id in fields:
+                assert second.get_requirement_index(
+                    req, field_id
+                ) == expected.get_requirement_index(req, field_id)
+
+    def test_different_layout(self) -> None:
+        template_cache = get_legate_runtime().launcher_template_cache
+        hits = template_cache.hits
+        src, dst, part = object(), object(), object()
+        analyze(make_inserts(src, dst, part), TASK_ID)
+        analyze(make_inserts(src, src, part), TASK_ID)
+        analyze(make_inserts(src, dst, part), TASK_ID + 1)
+        assert template_cache.hits == hits
+
+    def test_promotion(self) -> None:
+        region, part = make_region(), make_partition()
+        analyzer = analyze(make_inserts(object(), region, part), TASK_ID)
+        read = RegionReq(region, Permission.READ, Partition(part, 0), 0, 0)
+        (req, fields), *_ = [
+            (req, fields)
+            for req, fields in analyzer.requirements
+            if req.region is region
+        ]
+        assert req.permission == Permission.READ_WRITE
+        assert fields == [3]
+        assert analyzer.get_requirement_index(
+            read, 3
+        ) == analyzer.get_requirement_index(req, 3)
+
+
+class TestCoalescing:
+    def test_reused_plan(self) -> None:
+        for _ in range(2):
+            region, part = make_region(), make_partition()
+            analyzer = analyze(make_inserts(object(), region, part))
+            (req, fields), *_ = [
+                (req, fields)
+                for req, fields in analyzer.requirements
+                if req.region is region
+            ]
+            assert req.permission == Permission.READ_WRITE
+            assert req.proj == Partition(part, 0)
+            assert fields == [3]
+
+    def test_interference(self) -> None:
+        for _ in range(2):
+            region = object()
+            inserts = [
+                (region, Permission.READ, object(), 1),
+                (region, Permission.WRITE, object(), 1),
+            ]
+            with pytest.raises(ValueError):
+                analyze(inserts)
+
+
+def make_arg(dtype: Any, transform: Any) -> RegionFieldArg:
+    # Views of the same storage can share the store id
+    store: Any = SimpleNamespace(
+        _unique_id=1, unbound=False, type=dtype, transform=transform
+    )
+    req = RegionReq(make_region(), Permission.READ, Partition(None, 0), 0, 0)
+    analyzer = RequirementAnalyzer()
+    analyzer.insert(req, 1)
+    analyzer.analyze_requirements()
+    return RegionFieldArg(analyzer, store, 1, req, 1, -1)
+
+
+class TestRegionFieldArg:
+    def test_same(self) -> None:
+        lhs = make_arg(ty.int64, identity)
+        rhs = make_arg(ty.int64, identity)
+        assert lhs.signature() == rhs.signature()
+
+    def test_transform(self) -> None:
+        lhs = make_arg(ty.int64, identity)
+        rhs = make_arg(ty.int64, identity.stack(Shift(0, 1)))
+        assert lhs.signature() != rhs.signature()
+
+    def test_dtype(self) -> None:
+        lhs = make_arg(ty.int64, identity)
+        rhs = make_arg(ty.float64, identity)
+        assert lhs.signature() != rhs.signature()
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
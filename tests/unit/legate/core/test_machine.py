@@ -219,6 +219,12 @@ class TestMachine:
         m4 = Machine([CPU_RANGE, OMP_RANGE, EMPTY_RANGE])
         assert m1 == m4
 
+    def test_hash(self) -> None:
+        m1 = Machine([CPU_RANGE, OMP_RANGE])
+        m2 = Machine([CPU_RANGE, OMP_RANGE, EMPTY_RANGE])
+        assert hash(m1) == hash(m2)
+        assert len({m1, m2, Machine([])}) == 2
+
     @pytest.mark.parametrize("n", range(1, len(RANGES) + 1))
     def test_preferred_kind(self, n: int) -> None:
         m = Machine(RANGES[:n])
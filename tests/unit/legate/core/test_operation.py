@@ -0,0 +1,125 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from legate.core import get_legate_runtime
+from legate.core.operation import Task
+from legate.core.partition import Weighted
+from legate.core.shape import Shape
+
+
+class FakeOutput:
+    def __init__(self, ndim: int) -> None:
+        self.ndim = ndim
+        self.key_partition: Any = None
+
+    def set_key_partition(self, partition: Any) -> None:
+        self.key_partition = partition
+
+
+class TestDemuxUnboundOutputs:
+    # Weights of the outputs in each slot of the result, where outputs
+    # mapped to the same output region have the same weights
+    WEIGHTS = [(1, 2), (1, 2), (3, 4), (5, 6), (1, 2)]
+
+    def demux(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        outputs: list[FakeOutput],
+        regions: list[str],
+        can_raise_exception: bool = False,
+    ) -> tuple[list[int], list[Any]]:
+        runtime = get_legate_runtime()
+        extracted: list[int] = []
+        exceptions: list[Any] = []
+
+        def extract_scalar_with_domain(
+            result: Any, idx: int, launch_domain: Any
+        ) -> Any:
+            extracted.append(idx)
+            return result[idx]
+
+        def record_pending_exception(
+            exn_types: Any, future: Any, tb_repr: Any
+        ) -> None:
+            exceptions.append(future)
+
+        monkeypatch.setattr(
+            runtime, "extract_scalar_with_domain", extract_scalar_with_domain
+        )
+        monkeypatch.setattr(
+            runtime, "reduce_exception_future_map", lambda fut_map: fut_map
+        )
+        monkeypatch.setattr(
+            runtime, "record_pending_exception", record_pending_exception
+        )
+        monkeypatch.setattr(Weighted, "import_partition", lambda *_: None)
+
+        task: Any = SimpleNamespace(
+            outputs=outputs,
+            unbound_outputs=list(range(len(outputs))),
+            scalar_outputs=[],
+            scalar_reductions=[],
+            can_raise_exception=can_raise_exception,
+            _exn_types=[],
+            _tb_repr=None,
+        )
+        # The exception, if any, comes after the weights of the outputs
+        result: Any = self.WEIGHTS[: len(outputs)] + ["exception"]
+        out_partitions: Any = dict(zip(outputs, regions))
+        launch_domain: Any = SimpleNamespace(hi=(1,))
+        Task._demux_scalar_stores_future_map(
+            task, result, out_partitions, launch_domain
+        )
+        return extracted, exceptions
+
+    def test_shared_regions(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        outputs = [FakeOutput(1) for _ in range(5)]
+        regions = ["a", "a", "b", "c", "a"]
+        extracted, _ = self.demux(monkeypatch, outputs, regions)
+        # The weights are extracted once per output region
+        assert extracted == [0, 2, 3]
+        assert outputs[1].key_partition is outputs[0].key_partition
+        assert outputs[4].key_partition is outputs[0].key_partition
+        # and match those extracted for each output on its own
+        for idx, output in enumerate(outputs):
+            assert output.key_partition == Weighted(
+                Shape((2,)), self.WEIGHTS[idx]  # type: ignore[arg-type]
+            )
+
+    def test_nd_outputs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        outputs = [FakeOutput(2), FakeOutput(1), FakeOutput(2), FakeOutput(1)]
+        regions = ["a", "b", "c", "d"]
+        extracted, exceptions = self.demux(
+            monkeypatch, outputs, regions, can_raise_exception=True
+        )
+        # N-D outputs still take up their slots in the result
+        assert extracted == [1, 3, 4]
+        assert exceptions == ["exception"]
+        assert outputs[0].key_partition is None
+        assert outputs[2].key_partition is None
+        for idx in (1, 3):
+            assert outputs[idx].key_partition == Weighted(
+                Shape((2,)), self.WEIGHTS[idx]  # type: ignore[arg-type]
+            )
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
@@ -0,0 +1,48 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+import legate.core.runtime as m
+from legate.core import get_legate_runtime
+from legate.core.partition import Tiling
+from legate.core.shape import Shape
+
+
+class TestIndexPartitionCache:
+    def test_no_duplicates(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        runtime = get_legate_runtime()
+        # Make sure the Legion partition cache evicts entries
+        monkeypatch.setenv("LEGATE_PARTITION_CACHE_SIZE", "1")
+        manager = m.PartitionManager(runtime)
+        monkeypatch.setattr(runtime, "_partition_manager", manager)
+
+        index_space = runtime.find_or_create_index_space((8,))
+        region = runtime.create_region(
+            index_space, runtime.create_field_space()
+        )
+        tilings = [Tiling(Shape((n,)), Shape((8 // n,))) for n in (1, 2, 4)]
+        first = [tiling.construct(region) for tiling in tilings]
+        second = [tiling.construct(region) for tiling in tilings]
+        for lhs, rhs in zip(first, second):
+            assert lhs is not None and rhs is not None
+            assert lhs.index_partition is rhs.index_partition
+            assert lhs is rhs
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
@@ -0,0 +1,46 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import annotations
+
+from legate.core.projection import (
+    ProjExpr,
+    canonicalize_symbolic_point,
+    enumerate_common_projections,
+    execute_functor_symbolically,
+    is_identity_projection,
+)
+
+
+def test_canonicalize_symbolic_point() -> None:
+    point = execute_functor_symbolically(2)
+    assert canonicalize_symbolic_point(point) is point
+
+    dims = (point[0] * 0 + 3, point[1])
+    assert canonicalize_symbolic_point(dims) == (
+        ProjExpr(weight=0, offset=3),
+        point[1],
+    )
+
+
+def test_enumerate_common_projections() -> None:
+    specs = list(enumerate_common_projections(3))
+    assert len(specs) == len(set(specs))
+    assert not any(is_identity_projection(*spec) for spec in specs)
+
+    point = execute_functor_symbolically(3)
+    assert (3, (point[0], point[2])) in specs
+    assert (3, (point[2], point[0], point[1])) in specs
+    # 2 + 6 broadcasts and 1 + 5 transposes
+    assert len(specs) == 14
@@ -0,0 +1,176 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import legate.core.runtime as m
+from legate.core import get_legate_runtime, types as ty
+from legate.core.runtime import SchedulingWindow
+
+from .util import make_value
+
+
+def make_op(machine: str = "cpus", scalar: bool = False) -> Any:
+    return SimpleNamespace(
+        scalar_outputs=[object()] if scalar else [], target_machine=machine
+    )
+
+
+class TestSplitIntoBatches:
+    def split(
+        self, ops: list[Any], monkeypatch: pytest.MonkeyPatch
+    ) -> list[list[Any]]:
+        runtime = get_legate_runtime()
+        monkeypatch.setattr(runtime, "_batch_partitioning", True)
+        return runtime._split_into_batches(ops)
+
+    def test_single_batch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        ops = [make_op() for _ in range(3)]
+        assert self.split(ops, monkeypatch) == [ops]
+
+    def test_empty(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert self.split([], monkeypatch) == []
+
+    def test_scalar_outputs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        a, b, c, d = make_op(), make_op(), make_op(scalar=True), make_op()
+        # Operations with scalar outputs are partitioned on their own
+        assert self.split([a, b, c, d], monkeypatch) == [[a, b], [c], [d]]
+
+    def test_machines(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        a, b, c = make_op("cpus"), make_op("gpus"), make_op("gpus")
+        assert self.split([a, b, c], monkeypatch) == [[a], [b, c]]
+
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        runtime = get_legate_runtime()
+        monkeypatch.setattr(runtime, "_batch_partitioning", False)
+        ops = [make_op() for _ in range(3)]
+        assert runtime._split_into_batches(ops) == [[op] for op in ops]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def submit(window: SchedulingWindow, clock: Clock, interval: float) -> None:
+    clock.now += interval
+    window.record_submit()
+
+
+class TestSchedulingWindow:
+    @pytest.fixture
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> Clock:
+        clock = Clock()
+        monkeypatch.setattr(m, "time", SimpleNamespace(perf_counter=clock))
+        return clock
+
+    def test_grow_when_full(self, clock: Clock) -> None:
+        window = SchedulingWindow(2, 16, True)
+        for _ in range(3):
+            submit(window, clock, 1e-4)
+        window.grow(0)
+        assert window.size == 4
+        for _ in range(3):
+            window.grow(0)
+        # The window never exceeds the maximum size
+        assert window.size == 16
+
+    def test_no_grow_when_slow(self, clock: Clock) -> None:
+        window = SchedulingWindow(2, 16, True)
+        for _ in range(3):
+            submit(window, clock, 0.1)
+        window.grow(0)
+        assert window.size == 2
+
+    def test_no_grow_with_pending_exceptions(self, clock: Clock) -> None:
+        window = SchedulingWindow(2, 16, True)
+        for _ in range(3):
+            submit(window, clock, 1e-4)
+        window.grow(1)
+        assert window.size == 2
+
+    def test_average_interval(self, clock: Clock) -> None:
+        window = SchedulingWindow(2, 16, True)
+        for _ in range(3):
+            submit(window, clock, 1e-4)
+        window.grow(0)
+        assert window.size == 4
+        # A single slow submit moves the average above the threshold
+        submit(window, clock, 0.1)
+        window.grow(0)
+        assert window.size == 4
+        # and enough fast ones bring it back down
+        for _ in range(50):
+            submit(window, clock, 1e-4)
+        window.grow(0)
+        assert window.size == 8
+
+    def test_shrink_on_blocking_flush(self, clock: Clock) -> None:
+        window = SchedulingWindow(2, 16, True)
+        for _ in range(3):
+            submit(window, clock, 1e-4)
+        for _ in range(3):
+            window.grow(0)
+        assert window.size == 16
+        # Flushing with at least half of the window filled keeps the size
+        window.shrink(8)
+        assert window.size == 16
+        window.shrink(7)
+        assert window.size == 8
+        for _ in range(3):
+            window.shrink(0)
+        # The window never shrinks below the initial size
+        assert window.size == 2
+
+    def test_shrink_resets_interval(self, clock: Clock) -> None:
+        window = SchedulingWindow(2, 16, True)
+        for _ in range(3):
+            submit(window, clock, 1e-4)
+        window.shrink(0)
+        # The time spent at the blocking point isn't a submit interval
+        submit(window, clock, 10.0)
+        window.grow(0)
+        assert window.size == 4
+
+    def test_not_adaptive(self, clock: Clock) -> None:
+        window = SchedulingWindow(2, 16, False)
+        for _ in range(3):
+            submit(window, clock, 1e-4)
+        window.grow(0)
+        assert window.size == 2
+        window.shrink(0)
+        assert window.size == 2
+
+    def test_flushed_by_fence(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        runtime = get_legate_runtime()
+        runtime.flush_scheduling_window()
+        monkeypatch.setattr(runtime, "_window", SchedulingWindow(8, 8, False))
+        store = runtime.create_store(ty.int64, shape=(4,))
+        runtime.issue_fill(store, make_value(1))
+        assert len(runtime._outstanding_ops) == 1
+        runtime.issue_execution_fence()
+        assert len(runtime._outstanding_ops) == 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
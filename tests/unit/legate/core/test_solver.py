@@ -0,0 +1,188 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from legate.core.restriction import Restriction
+from legate.core.solver import EqClass, Partitioner, Strategy, StrategyCache
+
+
+class TestEqClass:
+    def test_empty(self) -> None:
+        eq: EqClass[str] = EqClass()
+        assert eq.empty
+        assert list(eq.find("a")) == ["a"]
+        assert eq.aligned("a", "a")
+        assert not eq.aligned("a", "b")
+
+    def test_record(self) -> None:
+        eq: EqClass[str] = EqClass()
+        eq.record("a", "b")
+        eq.record("c", "d")
+        assert not eq.empty
+        assert eq.aligned("a", "b")
+        assert not eq.aligned("a", "c")
+        assert list(eq.find("d")) == ["c", "d"]
+
+    def test_merge_order(self) -> None:
+        eq: EqClass[str] = EqClass()
+        eq.record("a", "b")
+        eq.record("c", "d")
+        eq.record("e", "c")
+        # Merging classes keeps the members in the order they were
+        # first recorded
+        eq.record("d", "a")
+        for var in "abcde":
+            assert list(eq.find(var)) == ["a", "b", "c", "d", "e"]
+        assert eq.aligned("b", "e")
+
+    def test_chain(self) -> None:
+        eq: EqClass[int] = EqClass()
+        num_vars = 1000
+        for idx in range(num_vars - 1, 0, -1):
+            eq.record(idx, idx - 1)
+        assert all(eq.aligned(0, idx) for idx in range(num_vars))
+        assert list(eq.find(0)) == list(range(num_vars - 1, -1, -1))
+
+    def test_copy(self) -> None:
+        eq: EqClass[str] = EqClass()
+        eq.record("a", "b")
+        copied = eq.copy()
+        copied.record("b", "c")
+        assert copied.aligned("a", "c")
+        assert not eq.aligned("a", "c")
+        assert list(eq.find("a")) == ["a", "b"]
+
+    def test_union(self) -> None:
+        eq1: EqClass[str] = EqClass()
+        eq1.record("a", "b")
+        eq2: EqClass[str] = EqClass()
+        eq2.record("c", "d")
+        eq2.record("b", "c")
+        eq1.union(eq2)
+        assert list(eq1.find("d")) == ["a", "b", "c", "d"]
+        assert list(eq2.find("a")) == ["a"]
+
+
+class Sym:
+    def __init__(self, store: Any) -> None:
+        self.store = store
+
+
+def make_op(reads: list[Any], writes: list[Any]) -> Any:
+    unknowns = [Sym(store) for store in reads + writes]
+    return SimpleNamespace(outputs=writes, all_unknowns=unknowns)
+
+
+class TestUnifyProducersAndConsumers:
+    def unify(self, ops: list[Any]) -> EqClass[Any]:
+        constraints: EqClass[Any] = EqClass()
+        all_restrictions: dict[Any, Any] = {
+            unknown: (Restriction.UNRESTRICTED,)
+            for op in ops
+            for unknown in op.all_unknowns
+        }
+        Partitioner(ops)._unify_producers_and_consumers(
+            constraints, all_restrictions, {}
+        )
+        return constraints
+
+    def test_producer_consumer(self) -> None:
+        a, b, c = object(), object(), object()
+        producer = make_op([a], [b])
+        consumer = make_op([b], [c])
+        constraints = self.unify([producer, consumer])
+        # The consumer of b shares the partition of its producer
+        assert constraints.aligned(
+            producer.all_unknowns[1], consumer.all_unknowns[0]
+        )
+        assert not constraints.aligned(
+            producer.all_unknowns[0], consumer.all_unknowns[1]
+        )
+
+    def test_last_writer(self) -> None:
+        a = object()
+        first = make_op([], [a])
+        second = make_op([], [a])
+        consumer = make_op([a], [])
+        constraints = self.unify([first, second, consumer])
+        assert constraints.aligned(
+            second.all_unknowns[0], consumer.all_unknowns[0]
+        )
+        # The first writer is unified with the second one, as the second
+        # one consumes the store's previous contents too
+        assert constraints.aligned(
+            first.all_unknowns[0], second.all_unknowns[0]
+        )
+
+    def test_unrelated(self) -> None:
+        a, b = object(), object()
+        first = make_op([], [a])
+        second = make_op([b], [])
+        assert self.unify([first, second]).empty
+
+    def test_different_restrictions(self) -> None:
+        a = object()
+        producer = make_op([], [a])
+        consumer = make_op([a], [])
+        constraints: EqClass[Any] = EqClass()
+        all_restrictions: dict[Any, Any] = {
+            producer.all_unknowns[0]: (Restriction.UNRESTRICTED,),
+            consumer.all_unknowns[0]: (Restriction.RESTRICTED,),
+        }
+        Partitioner([producer, consumer])._unify_producers_and_consumers(
+            constraints, all_restrictions, {}
+        )
+        # A consumer that broadcasts the store must not serialize the
+        # producer
+        assert constraints.empty
+
+
+class TestStrategyCache:
+    def record(self, cache: StrategyCache, signature: str) -> None:
+        ops: Any = [SimpleNamespace(all_unknowns=[])]
+        strategy = Strategy(None, {}, {}, set(), EqClass())
+        cache.record(signature, ops, [None], [strategy])
+
+    def test_hits_and_misses(self) -> None:
+        cache = StrategyCache(4)
+        ops: Any = [SimpleNamespace(all_unknowns=[])]
+        self.record(cache, "a")
+        assert cache.find("a", ops) is not None
+        assert cache.find("b", []) is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_evict_least_recently_used(self) -> None:
+        cache = StrategyCache(2)
+        ops: Any = [SimpleNamespace(all_unknowns=[])]
+        self.record(cache, "a")
+        self.record(cache, "b")
+        # A hit makes "a" the most recently used entry
+        assert cache.find("a", ops) is not None
+        self.record(cache, "c")
+        assert len(cache) == 2
+        assert cache.find("b", ops) is None
+        assert cache.find("a", ops) is not None
+        assert cache.find("c", ops) is not None
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
@@ -13,9 +13,22 @@
 # limitations under the License.
 #
 
+import struct
+from types import SimpleNamespace
+from typing import Any
+
 import pytest
 
-from legate.core import get_legate_runtime, types as ty
+from legate.core import LEGATE_MAX_FIELDS, get_legate_runtime, types as ty
+from legate.core.runtime import (
+    ConsensusMatchingFieldManager,
+    FieldManager,
+    FieldMatch,
+    FieldPool,
+    FreeFieldInfo,
+    FreeFieldQueue,
+)
+from legate.core.shape import Shape
 
 
 class Test_store_creation:
@@ -41,6 +54,434 @@ class Test_store_creation:
             store.shape
 
 
+def get_field(store: Any) -> tuple[Any, int]:
+    return store.storage.region, store.storage.field.field_id
+
+
+class Test_store_batch_creation:
+    def test_empty(self) -> None:
+        runtime = get_legate_runtime()
+        assert runtime.create_stores(ty.int64, (4, 4), 0) == []
+
+    def test_bound(self) -> None:
+        runtime = get_legate_runtime()
+        stores = runtime.create_stores(ty.int32, (5, 3), 4)
+        assert len(stores) == 4
+        for store in stores:
+            assert not store.unbound
+            assert store.shape == (5, 3)
+            assert store.type == ty.int32
+        assert len(set(get_field(store) for store in stores)) == 4
+
+    def test_0d(self) -> None:
+        runtime = get_legate_runtime()
+        stores = runtime.create_stores(ty.float64, (), 3)
+        assert len(stores) == 3
+        for store in stores:
+            assert store.ndim == 0
+            assert store.shape == ()
+
+    def test_invalid(self) -> None:
+        runtime = get_legate_runtime()
+        with pytest.raises(ValueError):
+            runtime.create_stores(ty.int64, (4,), -1)
+
+    def test_many_regions(self) -> None:
+        runtime = get_legate_runtime()
+        count = LEGATE_MAX_FIELDS + 2
+        stores = runtime.create_stores(ty.int8, (17,), count)
+        fields = set(get_field(store) for store in stores)
+        assert len(fields) == count
+        # A region holds at most LEGATE_MAX_FIELDS fields
+        assert len(set(region for region, _ in fields)) > 1
+
+    def test_context(self) -> None:
+        context = get_legate_runtime().core_context
+        stores = context.create_stores(ty.int64, (6,), 2)
+        assert len(stores) == 2
+        for store in stores:
+            assert not store.unbound
+            assert store.shape == (6,)
+            assert store.type == ty.int64
+
+
+class Test_field_manager_batch_allocation:
+    def test_reuse(self) -> None:
+        runtime = get_legate_runtime()
+        field_mgr = FieldManager(runtime, Shape((19, 3)), 8)
+        fields = field_mgr.allocate_fields(3)
+        assert len(set(fields)) == 3
+        for region, field_id in fields:
+            field_mgr.free_field(region, field_id, ordered=True)
+        # Freed fields are reused before new ones are allocated
+        reused = field_mgr.allocate_fields(5)
+        assert set(fields) < set(reused)
+        assert len(set(reused)) == 5
+
+    def test_consensus_match_charged_once(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        runtime = get_legate_runtime()
+        match_manager = runtime.field_match_manager
+        credits: list[int] = []
+        issue_field_match = match_manager.issue_field_match
+
+        def record(credit: int) -> None:
+            credits.append(credit)
+            issue_field_match(credit)
+
+        monkeypatch.setattr(match_manager, "issue_field_match", record)
+        field_mgr = ConsensusMatchingFieldManager(runtime, Shape((23,)), 8)
+        fields = field_mgr.allocate_fields(6)
+        assert len(set(fields)) == 6
+        assert len(credits) == 1
+
+
+class FakeFuture:
+    def __init__(self, ready: bool) -> None:
+        self.ready = ready
+        self.waited = False
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+    def wait(self) -> None:
+        self.waited = True
+        self.ready = True
+
+
+class Test_field_reuse_budget:
+    SHAPE = Shape((29,))
+    NBYTES = 29 * 8
+
+    def make_manager(
+        self, monkeypatch: pytest.MonkeyPatch, budget: int
+    ) -> FieldManager:
+        runtime = get_legate_runtime()
+        monkeypatch.setattr(runtime, "_field_reuse_budget", budget)
+        monkeypatch.setattr(runtime, "_field_reuse_fallback_bytes", 0)
+        field_mgr = FieldManager(runtime, self.SHAPE, 8)
+        # An active field keeps the region alive while the others are free
+        field_mgr.allocate_field(borrow=False)
+        return field_mgr
+
+    def free(self, field_mgr: FieldManager, field: Any, future: Any) -> None:
+        field_mgr.free_field(field[0], field[1], future, ordered=True)
+
+    def fallback_bytes(self) -> int:
+        return get_legate_runtime().get_field_reuse_stats().fallback_bytes
+
+    def test_no_budget_takes_oldest(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        field_mgr = self.make_manager(monkeypatch, 0)
+        pending, done = field_mgr.allocate_fields(2)
+        future = FakeFuture(False)
+        self.free(field_mgr, pending, future)
+        self.free(field_mgr, done, None)
+        assert field_mgr.allocate_field(borrow=False)[:2] == pending
+        assert future.waited
+        assert self.fallback_bytes() == 0
+
+    def test_prefer_done(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        field_mgr = self.make_manager(monkeypatch, self.NBYTES)
+        pending, done = field_mgr.allocate_fields(2)
+        future = FakeFuture(False)
+        self.free(field_mgr, pending, future)
+        self.free(field_mgr, done, None)
+        assert field_mgr.allocate_field(borrow=False)[:2] == done
+        assert not future.waited
+        assert self.fallback_bytes() == 0
+
+    def test_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        field_mgr = self.make_manager(monkeypatch, self.NBYTES)
+        (pending,) = field_mgr.allocate_fields(1)
+        future = FakeFuture(False)
+        self.free(field_mgr, pending, future)
+
+        fallback = field_mgr.allocate_field(borrow=False)[:2]
+        assert fallback != pending
+        assert not future.waited
+        assert self.fallback_bytes() == self.NBYTES
+
+        # Freeing the fallback field keeps it allocated, so it stays charged
+        self.free(field_mgr, fallback, None)
+        assert self.fallback_bytes() == self.NBYTES
+
+        # Reusing it refunds the charge
+        assert field_mgr.allocate_field(borrow=False)[:2] == fallback
+        assert self.fallback_bytes() == 0
+        assert not future.waited
+
+    def test_budget_spent(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        field_mgr = self.make_manager(monkeypatch, self.NBYTES)
+        first, second = field_mgr.allocate_fields(2)
+        first_future, second_future = FakeFuture(False), FakeFuture(False)
+        self.free(field_mgr, first, first_future)
+        self.free(field_mgr, second, second_future)
+
+        fallback = field_mgr.allocate_field(borrow=False)[:2]
+        assert fallback not in (first, second)
+        # Without budget left, the oldest free field is reused
+        assert field_mgr.allocate_field(borrow=False)[:2] == first
+        assert first_future.waited
+        assert not second_future.waited
+        assert self.fallback_bytes() == self.NBYTES
+
+    def test_refund_on_destroy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        field_mgr = self.make_manager(monkeypatch, self.NBYTES)
+        (pending,) = field_mgr.allocate_fields(1)
+        self.free(field_mgr, pending, FakeFuture(False))
+        fallback = field_mgr.allocate_field(borrow=False)[:2]
+        assert self.fallback_bytes() == self.NBYTES
+        field_mgr.remove_all_fields(fallback[0])
+        assert self.fallback_bytes() == 0
+
+    def test_refund_on_batch_reuse(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        field_mgr = self.make_manager(monkeypatch, self.NBYTES)
+        (pending,) = field_mgr.allocate_fields(1)
+        self.free(field_mgr, pending, FakeFuture(False))
+        (fallback,) = field_mgr.allocate_fields(1)
+        assert fallback != pending
+        assert self.fallback_bytes() == self.NBYTES
+        self.free(field_mgr, fallback, None)
+        assert field_mgr.allocate_fields(1) == [fallback]
+        assert self.fallback_bytes() == 0
+
+
+class Test_free_field_queue:
+    REGIONS: list[Any] = ["r0", "r1"]
+
+    def make_queue(self, futures: list[Any]) -> tuple[FreeFieldQueue, Any]:
+        # Fields alternate between two regions
+        queue = FreeFieldQueue()
+        fields = [
+            (self.REGIONS[idx % 2], idx, future)
+            for idx, future in enumerate(futures)
+        ]
+        for field in fields:
+            queue.append(field)
+        return queue, fields
+
+    def test_order(self) -> None:
+        queue, fields = self.make_queue([None] * 4)
+        assert len(queue) == 4
+        assert [queue.popleft() for _ in range(4)] == fields
+        assert len(queue) == 0
+
+    def test_remove_region(self) -> None:
+        queue, fields = self.make_queue([None] * 5)
+        queue.remove_region(self.REGIONS[0])
+        assert len(queue) == 2
+        assert [queue.popleft() for _ in range(2)] == [fields[1], fields[3]]
+        # Removing a region without free fields is a no-op
+        queue.remove_region(self.REGIONS[0])
+        assert len(queue) == 0
+
+    def test_pop_ready(self) -> None:
+        queue, fields = self.make_queue(
+            [FakeFuture(False), FakeFuture(False), FakeFuture(True), None]
+        )
+        # Only the given number of the oldest fields are checked
+        assert queue.pop_ready(2) is None
+        assert queue.pop_ready(3) == fields[2][:2]
+        assert queue.pop_ready(3) == fields[3][:2]
+        assert queue.pop_ready(3) is None
+        # The remaining fields stay in order
+        assert [queue.popleft() for _ in range(2)] == fields[:2]
+
+    def test_pop_ready_then_remove_region(self) -> None:
+        queue, fields = self.make_queue([FakeFuture(False), None, None])
+        assert queue.pop_ready(3) == fields[1][:2]
+        queue.remove_region(self.REGIONS[1])
+        assert len(queue) == 2
+        queue.remove_region(self.REGIONS[0])
+        assert len(queue) == 0
+
+
+class FakeFieldManager:
+    def __init__(self) -> None:
+        self.ordered: list[int] = []
+        self.unordered: list[int] = []
+
+    def free_field(
+        self, region: Any, field_id: int, detach_future: Any, ordered: bool
+    ) -> None:
+        (self.ordered if ordered else self.unordered).append(field_id)
+
+
+class FakeMatchResult:
+    def __init__(self, num_fields: int) -> None:
+        self.buffer = struct.pack("N", num_fields)
+
+    def is_ready(self) -> bool:
+        return True
+
+    def get_buffer(self, size: int) -> bytes:
+        assert size == len(self.buffer)
+        return self.buffer
+
+
+class Test_field_match:
+    def make_match(self, manager: Any, field_ids: list[int]) -> FieldMatch:
+        region: Any = SimpleNamespace(handle=SimpleNamespace(tree_id=7))
+        fields = [
+            FreeFieldInfo(manager, region, field_id, None)
+            for field_id in field_ids
+        ]
+        return FieldMatch(fields)
+
+    def reconcile(self, match: FieldMatch, field_ids: list[int]) -> None:
+        # Fills in the result of the match as the runtime would
+        for idx, field_id in enumerate(field_ids):
+            match.output[2 * idx] = 7
+            match.output[2 * idx + 1] = field_id
+        result: Any = FakeMatchResult(len(field_ids))
+        match.future = result
+        match.update_free_fields()
+
+    def test_reorder(self) -> None:
+        manager = FakeFieldManager()
+        match = self.make_match(manager, [1, 2, 3, 4])
+        self.reconcile(match, [3, 1, 4])
+        # Fields found on all shards are freed in the order of the result,
+        # and the others are put back to be matched later
+        assert manager.ordered == [3, 1, 4]
+        assert manager.unordered == [2]
+
+    def test_no_common_fields(self) -> None:
+        manager = FakeFieldManager()
+        match = self.make_match(manager, [1, 2])
+        self.reconcile(match, [])
+        assert manager.ordered == []
+        assert manager.unordered == [1, 2]
+
+    def test_empty(self) -> None:
+        manager = FakeFieldManager()
+        match = self.make_match(manager, [])
+        # Nothing to wait on if there were no fields to offer
+        match.update_free_fields()
+        assert manager.ordered == manager.unordered == []
+
+
+class Test_retained_region_bytes:
+    # Each test uses its own shapes, so it doesn't reuse the regions left
+    # by the others
+    def free_region(self, extent: int) -> Any:
+        field_mgr = FieldManager(get_legate_runtime(), Shape((extent,)), 8)
+        region, field_id, _ = field_mgr.allocate_field(borrow=False)
+        field_mgr.free_field(region, field_id, ordered=True)
+        return field_mgr, get_legate_runtime().find_region_manager(region)
+
+    def test_evict(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        runtime = get_legate_runtime()
+        monkeypatch.setattr(runtime, "_max_lru_bytes", 2 * 43 * 8)
+        _, first = self.free_region(41)
+        _, second = self.free_region(43)
+        assert runtime.retained_region_bytes <= 2 * 43 * 8
+        assert first in runtime.lru_managers
+        assert second in runtime.lru_managers
+
+        # Going over the budget evicts the least recently freed regions
+        _, third = self.free_region(42)
+        assert first not in runtime.lru_managers
+        assert first.region not in runtime.region_managers_by_region
+        assert list(runtime.lru_managers) == [second, third]
+        assert runtime.retained_region_bytes == (43 + 42) * 8
+
+    def test_revive(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        runtime = get_legate_runtime()
+        monkeypatch.setattr(runtime, "_max_lru_bytes", 2 * 53 * 8)
+        _, first = self.free_region(51)
+        field_mgr, second = self.free_region(53)
+        # Reusing a field of a free region takes it out of the LRU
+        field_mgr.allocate_field(borrow=False)
+        assert second not in runtime.lru_managers
+        assert list(runtime.lru_managers)[-1] is first
+        _, third = self.free_region(52)
+        assert list(runtime.lru_managers)[-2:] == [first, third]
+        assert second.region in runtime.region_managers_by_region
+
+    def test_empty_region(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        runtime = get_legate_runtime()
+        monkeypatch.setattr(runtime, "_max_lru_bytes", 61 * 8)
+        _, first = self.free_region(61)
+        _, second = self.free_region(0)
+        # Empty regions don't count against the budget
+        assert list(runtime.lru_managers) == [first, second]
+        assert runtime.retained_region_bytes == 61 * 8
+
+
+class Test_field_pool:
+    def make_donor(self, pool: FieldPool, extents: tuple[int, ...]) -> Any:
+        field_mgr = FieldManager(get_legate_runtime(), Shape(extents), 8)
+        # An active field keeps the region alive while the other is free
+        _, free = field_mgr.allocate_fields(2)
+        field_mgr.free_field(free[0], free[1], ordered=True)
+        pool.register_manager(field_mgr)
+        return field_mgr, free
+
+    def test_borrow_and_release(self) -> None:
+        pool = FieldPool(25)
+        donor, free = self.make_donor(pool, (16,))
+        result = pool.borrow_field(Shape((14,)), 8)
+        assert result is not None
+        assert result[:2] == free
+        assert result[2] == donor.shape
+        assert len(donor.free_fields) == 0
+
+        stats = pool.stats
+        assert (stats.hits, stats.misses, stats.borrowed_fields) == (1, 0, 1)
+        assert stats.requested_bytes == 14 * 8
+        assert stats.backing_bytes == 16 * 8
+        assert stats.fragmentation == pytest.approx(1 - 14 / 16)
+
+        pool.release_field(*free)
+        stats = pool.stats
+        assert stats.borrowed_fields == 0
+        assert stats.requested_bytes == stats.backing_bytes == 0
+        # Releasing a field that wasn't borrowed is a no-op
+        pool.release_field(*free)
+        assert pool.stats.borrowed_fields == 0
+
+    @pytest.mark.parametrize(
+        "donor_extents, extents",
+        [
+            ((16,), (8,)),
+            ((16,), (16,)),
+            ((16,), (17,)),
+            ((4, 8), (5, 6)),
+            ((16,), (4, 3)),
+        ],
+    )
+    def test_miss(
+        self, donor_extents: tuple[int, ...], extents: tuple[int, ...]
+    ) -> None:
+        pool = FieldPool(25)
+        donor, _ = self.make_donor(pool, donor_extents)
+        assert pool.borrow_field(Shape(extents), 8) is None
+        assert pool.borrow_field(Shape(donor_extents), 4) is None
+        assert len(donor.free_fields) == 1
+        assert pool.stats.misses == 2
+
+    def test_smallest_first(self) -> None:
+        pool = FieldPool(100)
+        self.make_donor(pool, (16,))
+        _, free = self.make_donor(pool, (14,))
+        # Donors of smaller size classes are preferred
+        result = pool.borrow_field(Shape((12,)), 8)
+        assert result is not None and result[:2] == free
+
+    def test_disabled(self) -> None:
+        pool = FieldPool(0)
+        donor, _ = self.make_donor(pool, (16,))
+        assert not pool.enabled
+        assert pool.borrow_field(Shape((14,)), 8) is None
+        assert len(donor.free_fields) == 1
+
+
 class Test_store_valid_transform:
     def test_bound(self) -> None:
         runtime = get_legate_runtime()
@@ -67,6 +508,19 @@ class Test_store_valid_transform:
         assert delinearized.shape == (2, 2, 3)
         assert delinearized.transformed
 
+    def test_merged_transforms(self) -> None:
+        runtime = get_legate_runtime()
+        context = runtime.core_context
+        store = context.create_store(ty.int64, shape=(4, 3, 2))
+
+        sliced = store.slice(0, slice(1, 4)).slice(0, slice(1, 3))
+        assert sliced.shape == (2, 3, 2)
+        assert sliced._transform == store.slice(0, slice(2, 4))._transform
+
+        transposed = store.transpose((1, 2, 0)).transpose((2, 0, 1))
+        assert transposed.shape == (4, 3, 2)
+        assert not transposed.transformed
+
 
 class Test_store_invalid_transform:
     def test_bound(self) -> None:
@@ -0,0 +1,74 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import numpy as np
+import pytest
+
+from legate.core import get_legate_runtime, types as ty
+
+from .util import make_value
+
+
+class TestTrace:
+    def test_replay(self) -> None:
+        runtime = get_legate_runtime()
+        store = runtime.create_store(ty.int64, shape=(8,))
+        for run in range(3):
+            with runtime.trace(1001):
+                trace = runtime.current_trace
+                assert trace is not None
+                assert trace.trace_id == 1001
+                # Only the first run is recorded, the later ones replay it
+                assert trace.recording == (run == 0)
+                runtime.issue_fill(store, make_value(run))
+            assert runtime.current_trace is None
+            assert np.all(store.to_numpy(read_only=True) == run)
+
+        # A run that launches different operations can't be replayed
+        with pytest.raises(RuntimeError):
+            with runtime.trace(1001):
+                pass
+
+    def test_context_alias(self) -> None:
+        runtime = get_legate_runtime()
+        context = runtime.core_context
+        store = runtime.create_store(ty.int64, shape=(8,))
+        value = make_value(2)
+        with context.trace(1002):
+            trace = runtime.current_trace
+            assert trace is not None
+            assert trace.trace_id == 1002
+            runtime.issue_fill(store, value)
+        assert not trace.recording
+
+        # Runtime.trace continues the trace started through the context
+        with runtime.trace(1002):
+            assert runtime.current_trace is trace
+            assert not trace.recording
+            runtime.issue_fill(store, value)
+        assert np.all(store.to_numpy(read_only=True) == 2)
+
+    def test_nested(self) -> None:
+        runtime = get_legate_runtime()
+        with runtime.trace(1003):
+            with pytest.raises(RuntimeError):
+                with runtime.trace(1004):
+                    pass
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
@@ -0,0 +1,69 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import annotations
+
+import pytest
+
+from legate.core.utils import CacheStats, LRUCache
+
+
+class TestLRUCache:
+    def test_get(self) -> None:
+        cache: LRUCache[int, str] = LRUCache(2)
+        cache[1] = "a"
+        assert 1 in cache
+        assert cache.get(1) == "a"
+        assert cache.get(2) is None
+        assert cache.get(2, "b") == "b"
+
+    def test_evict_least_recently_used(self) -> None:
+        evicted: list[tuple[int, str]] = []
+        cache: LRUCache[int, str] = LRUCache(
+            2, on_evict=lambda k, v: evicted.append((k, v))
+        )
+        cache[1] = "a"
+        cache[2] = "b"
+        cache.get(1)
+        cache[3] = "c"
+        assert 1 in cache
+        assert 2 not in cache
+        assert 3 in cache
+        assert evicted == [(2, "b")]
+        assert cache.stats == CacheStats(2, 2, 1)
+
+    def test_pop(self) -> None:
+        evicted: list[tuple[int, str]] = []
+        cache: LRUCache[int, str] = LRUCache(
+            2, on_evict=lambda k, v: evicted.append((k, v))
+        )
+        cache[1] = "a"
+        assert cache.pop(1) == "a"
+        assert cache.pop(1) is None
+        assert len(cache) == 0
+        assert evicted == []
+
+    @pytest.mark.parametrize("capacity", (0, -1))
+    def test_unbounded(self, capacity: int) -> None:
+        cache: LRUCache[int, int] = LRUCache(capacity)
+        for i in range(100):
+            cache[i] = i
+        assert len(cache) == 100
+        assert cache.evictions == 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(sys.argv))
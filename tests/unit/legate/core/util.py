@@ -0,0 +1,30 @@
+# Copyright 2023 NVIDIA Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import annotations
+
+import numpy as np
+
+from legate.core import Future, Store, get_legate_runtime, types as ty
+
+
+def make_future(value: int) -> Future:
+    buf = np.array([value], dtype=np.int64).tobytes()
+    return get_legate_runtime().create_future(buf, len(buf))
+
+
+def make_value(value: int) -> Store:
+    return get_legate_runtime().create_store(
+        ty.int64, shape=(1,), data=make_future(value)
+    )
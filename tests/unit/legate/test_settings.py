@@ -26,11 +26,25 @@ _expected_settings = (
     "consensus",
     "cycle_check",
     "future_leak_check",
+    "batch_partitioning",
+    "strategy_cache_size",
+    "launch_space_cache_size",
+    "partition_cache_size",
+    "key_partition_cache_size",
+    "launch_shape_planner",
+    "launcher_template_cache_size",
+    "detachment_prune_limit",
+    "field_pool_slack",
+    "field_reuse_budget",
+    "max_retained_region_bytes",
+    "tree_reduce_max_fanin_bytes",
     "test",
     "min_gpu_chunk",
     "min_cpu_chunk",
     "min_omp_chunk",
     "window_size",
+    "adaptive_window",
+    "max_window_size",
     "max_pending_exceptions",
     "precise_exception_trace",
     "field_reuse_frac",
@@ -60,6 +74,19 @@ class TestSettings:
         assert m.settings.consensus.convert_type == 'bool ("0" or "1")'
         assert m.settings.cycle_check.convert_type == 'bool ("0" or "1")'
         assert m.settings.future_leak_check.convert_type == 'bool ("0" or "1")'
+        assert (
+            m.settings.batch_partitioning.convert_type == 'bool ("0" or "1")'
+        )
+        assert m.settings.adaptive_window.convert_type == 'bool ("0" or "1")'
+        assert m.settings.max_window_size.convert_type == "int"
+        assert m.settings.strategy_cache_size.convert_type == "int"
+        assert m.settings.launch_shape_planner.convert_type == "str"
+        assert m.settings.launcher_template_cache_size.convert_type == "int"
+        assert m.settings.detachment_prune_limit.convert_type == "int"
+        assert m.settings.field_pool_slack.convert_type == "int"
+        assert m.settings.field_reuse_budget.convert_type == "int"
+        assert m.settings.max_retained_region_bytes.convert_type == "int"
+        assert m.settings.tree_reduce_max_fanin_bytes.convert_type == "int"
 
 
 _settings_with_test_defaults = (
@@ -86,6 +113,48 @@ class TestDefaults:
     def test_future_leak_check(self) -> None:
         assert m.settings.future_leak_check.default is False
 
+    def test_batch_partitioning(self) -> None:
+        assert m.settings.batch_partitioning.default is False
+
+    def test_strategy_cache_size(self) -> None:
+        assert m.settings.strategy_cache_size.default == 1024
+
+    def test_launch_space_cache_size(self) -> None:
+        assert m.settings.launch_space_cache_size.default == 1024
+
+    def test_partition_cache_size(self) -> None:
+        assert m.settings.partition_cache_size.default == 8192
+
+    def test_key_partition_cache_size(self) -> None:
+        assert m.settings.key_partition_cache_size.default == 65536
+
+    def test_launch_shape_planner(self) -> None:
+        assert m.settings.launch_shape_planner.default == "cost"
+
+    def test_launcher_template_cache_size(self) -> None:
+        assert m.settings.launcher_template_cache_size.default == 256
+
+    def test_detachment_prune_limit(self) -> None:
+        assert m.settings.detachment_prune_limit.default == 4
+
+    def test_field_pool_slack(self) -> None:
+        assert m.settings.field_pool_slack.default == 0
+
+    def test_field_reuse_budget(self) -> None:
+        assert m.settings.field_reuse_budget.default == 0
+
+    def test_max_retained_region_bytes(self) -> None:
+        assert m.settings.max_retained_region_bytes.default == 0
+
+    def test_tree_reduce_max_fanin_bytes(self) -> None:
+        assert m.settings.tree_reduce_max_fanin_bytes.default == 268435456
+
+    def test_adaptive_window(self) -> None:
+        assert m.settings.adaptive_window.default is False
+
+    def test_max_window_size(self) -> None:
+        assert m.settings.max_window_size.default == 256
+
     def test_test(self) -> None:
         assert m.settings.test.default is False
         assert m.settings.test.test_default is _Unset
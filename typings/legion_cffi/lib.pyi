@@ -319,6 +319,7 @@ def legion_phase_barrier_advance(*args: Any) -> Any: ...
 def legion_phase_barrier_destroy(*args: Any) -> Any: ...
 def legion_physical_region_destroy(*args: Any) -> Any: ...
 def legion_physical_region_is_mapped(*args: Any) -> Any: ...
+def legion_physical_region_is_valid(*args: Any) -> Any: ...
 def legion_physical_region_wait_until_valid(*args: Any) -> Any: ...
 def legion_predicate_true(*args: Any) -> Any: ...
 def legion_region_requirement_add_flags(*args: Any) -> Any: ...
@@ -332,6 +333,8 @@ def legion_release_launcher_add_field(*args: Any) -> Any: ...
 def legion_release_launcher_create(*args: Any) -> Any: ...
 def legion_release_launcher_destroy(*args: Any) -> Any: ...
 def legion_release_launcher_execute(*args: Any) -> Any: ...
+def legion_runtime_begin_trace(*args: Any) -> Any: ...
+def legion_runtime_end_trace(*args: Any) -> Any: ...
 def legion_runtime_issue_execution_fence(*args: Any) -> Any: ...
 def legion_runtime_issue_mapping_fence(*args: Any) -> Any: ...
 def legion_runtime_remap_region(*args: Any) -> Any: ...
@@ -566,6 +569,7 @@ __all__ = (
     "legion_output_requirement_get_partition",
     "legion_physical_region_destroy",
     "legion_physical_region_is_mapped",
+    "legion_physical_region_is_valid",
     "legion_physical_region_wait_until_valid",
     "legion_predicate_true",
     "legion_region_requirement_add_flags",
@@ -577,6 +581,8 @@ __all__ = (
     "legion_release_launcher_create",
     "legion_release_launcher_destroy",
     "legion_release_launcher_execute",
+    "legion_runtime_begin_trace",
+    "legion_runtime_end_trace",
     "legion_runtime_issue_execution_fence",
     "legion_runtime_issue_mapping_fence",
     "legion_runtime_remap_region",